@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+FAIR Farmland Benchmark Suite
+
+Runs the pipeline benchmarks on a fixed synthetic corpus with the local LLM stand-in
+and optionally compares the results against a saved baseline.
+
+Usage:
+    python run_benchmarks.py [--output results.json] [--baseline baseline.json] [--save-baseline baseline.json]
+
+Examples:
+    python run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root / "src"))
+
+from fair_farmland.benchmarks.suite import main
+
+if __name__ == "__main__":
+    sys.exit(main())
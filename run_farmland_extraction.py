@@ -18,12 +18,23 @@ import os
 import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 # Add the src directory to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "src"))
 
 from fair_farmland.core.simple_processor import SimpleFileProcessor
+from fair_farmland.core.deadlines import TimeoutPolicy
+from fair_farmland.core.hedging import HedgingPolicy
+from fair_farmland.core.cascade import CascadePolicy
+from fair_farmland.core.credential_pool import DEFAULT_KEYS_VARIABLE, CredentialPool, PooledBackend
+from fair_farmland.core.gap_filling import GapFillPolicy
+from fair_farmland.core.bibliographic import BibliographicPolicy
+from fair_farmland.core.reference_index import ReferenceIndex
+from fair_farmland.core.standardization import StandardizationPolicy
+from fair_farmland.core.llm_backends import LocalBackend, OpenAIResponsesBackend
+from fair_farmland.core.cassette import RecordingBackend, ReplayBackend
 
 def setup_argparse():
     """Set up command line argument parsing"""
@@ -35,13 +46,17 @@ Examples:
   %(prog)s data/input/papers/
   %(prog)s /path/to/papers/ /path/to/output/
   %(prog)s ./documents/ --output ./results/
+  %(prog)s papers/ --file-timeout 300 --run-timeout 3600
 
 Notes:
   - Supports PDF and markdown (.md, .markdown) files
   - PDFs are automatically converted to markdown first
   - Existing markdown files are processed directly
   - Outputs Schema.org-compliant JSON-LD metadata
-  - Requires OpenAI API key (set OPENAI_API_KEY or openaikey env variable)
+  - Requires OpenAI API key (set OPENAI_API_KEY or openaikey env variable),
+    unless --backend local is used for offline testing
+  - Several keys (--api-keys-file, --api-keys-env) spread requests over the rate
+    limits of several projects
         """
     )
     
@@ -65,10 +80,248 @@ Notes:
         help="Enable verbose logging"
     )
     
+    backend = parser.add_argument_group("LLM backend")
+    backend.add_argument(
+        "--backend",
+        choices=["openai", "local"],
+        default="openai",
+        help="openai: OpenAI Responses API; local: deterministic offline stand-in (default: openai)"
+    )
+    backend.add_argument(
+        "--local-latency",
+        type=float,
+        default=0.0,
+        help="Latency per request of the local backend in seconds (default: 0)"
+    )
+    backend.add_argument(
+        "--local-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of local backend requests that fail (default: 0)"
+    )
+    backend.add_argument(
+        "--local-seed",
+        type=int,
+        default=0,
+        help="Seed of the local backend (default: 0)"
+    )
+    cassette = backend.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record-cassette",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Append every LLM request fingerprint and raw response to this JSONL cassette"
+    )
+    cassette.add_argument(
+        "--replay-cassette",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Serve LLM responses from this cassette instead of calling a backend"
+    )
+    backend.add_argument(
+        "--replay-latency-scale",
+        type=float,
+        default=1.0,
+        help="Factor for recorded latencies during replay; 0 responds immediately (default: 1.0)"
+    )
+    backend.add_argument(
+        "--compact-schema",
+        action="store_true",
+        help="Request the compact response format with short keys (fewer output tokens)"
+    )
+    backend.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses and write the article and each dataset to <name>_progress.jsonl as they arrive"
+    )
+    
+    timeouts = parser.add_argument_group("timeouts (seconds, default: unlimited)")
+    timeouts.add_argument(
+        "--conversion-timeout",
+        type=float,
+        default=None,
+        help="Maximum time for converting one PDF to markdown"
+    )
+    timeouts.add_argument(
+        "--api-timeout",
+        type=float,
+        default=None,
+        help="Maximum time for one extraction API call"
+    )
+    timeouts.add_argument(
+        "--file-timeout",
+        type=float,
+        default=None,
+        help="Maximum time for all stages of one file"
+    )
+    timeouts.add_argument(
+        "--run-timeout",
+        type=float,
+        default=None,
+        help="Maximum time for the whole run; remaining files are recorded as timed out"
+    )
+    timeouts.add_argument(
+        "--timeout-retries",
+        type=int,
+        default=1,
+        help="How often a timed-out file is requeued (default: 1)"
+    )
+    
+    hedging = parser.add_argument_group("hedged requests")
+    hedging.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Issue a duplicate API request when one runs longer than the hedge percentile"
+    )
+    hedging.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=0.95,
+        help="Latency percentile (0-1) after which a request is hedged (default: 0.95)"
+    )
+    hedging.add_argument(
+        "--hedge-max-extra",
+        type=float,
+        default=0.1,
+        help="Maximum fraction of duplicate requests (default: 0.1)"
+    )
+    hedging.add_argument(
+        "--hedge-initial-delay",
+        type=float,
+        default=None,
+        help="Hedge delay in seconds until enough latencies have been observed (default: no hedging until then)"
+    )
+    hedging.add_argument(
+        "--hedge-workers",
+        type=int,
+        default=4,
+        help="Threads for primary and duplicate requests in flight (default: 4)"
+    )
+    hedging.add_argument(
+        "--hedge-request-timeout",
+        type=float,
+        default=None,
+        help="Seconds each hedged request may take, also bounding the losing request (default: no limit)"
+    )
+    
+    cascade = parser.add_argument_group("model cascade")
+    cascade.add_argument(
+        "--cascade",
+        type=str,
+        default=None,
+        metavar="MODELS",
+        help="Comma-separated models, cheapest first (e.g. gpt-4o-mini,gpt-4o); "
+             "escalates only untrustworthy results"
+    )
+    cascade.add_argument(
+        "--cascade-min-confidence",
+        type=float,
+        default=0.7,
+        help="Escalate results with a lower extraction confidence (default: 0.7)"
+    )
+    
+    gap_filling = parser.add_argument_group("gap filling")
+    gap_filling.add_argument(
+        "--fill-gaps",
+        action="store_true",
+        help="Re-query only missing DOIs, temporal coverages and variable units with the relevant passages"
+    )
+    gap_filling.add_argument(
+        "--gap-fill-model",
+        type=str,
+        default=None,
+        help="Model for the follow-up requests (default: the extraction model)"
+    )
+    gap_filling.add_argument(
+        "--gap-fill-max-passages",
+        type=int,
+        default=6,
+        help="Passages of the paper sent per follow-up request (default: 6)"
+    )
+    
+    bibliographic = parser.add_argument_group("local bibliographic parsing")
+    bibliographic.add_argument(
+        "--parse-bibliographic",
+        action="store_true",
+        help="Parse DOI, ISSN, year, volume/issue/pages, title and authors from the first page "
+             "and request only the remaining fields from the model"
+    )
+    bibliographic.add_argument(
+        "--bibliographic-min-confidence",
+        type=float,
+        default=0.9,
+        help="Fix locally parsed values with at least this confidence (default: 0.9)"
+    )
+    bibliographic.add_argument(
+        "--reference-index",
+        type=str,
+        default=None,
+        metavar="INDEX",
+        help="Offline index of bibliographic records (python -m fair_farmland.core.reference_index build); "
+             "matched papers get journal, ISSN, volume, pages, year and authors from it"
+    )
+    
+    standardization = parser.add_argument_group("standardization")
+    standardization.add_argument(
+        "--standardize",
+        action="store_true",
+        help="Write standardized access, format and country categories next to the raw values of every dataset"
+    )
+    standardization.add_argument(
+        "--standardize-fuzzy",
+        action="store_true",
+        help="Also resolve values without a mapping entry by token similarity (implies --standardize)"
+    )
+    standardization.add_argument(
+        "--standardize-min-confidence",
+        type=float,
+        default=0.6,
+        help="Lowest fuzzy match confidence accepted (default: 0.6)"
+    )
+    
+    credentials = parser.add_argument_group("API credentials")
+    keys = credentials.add_mutually_exclusive_group()
+    keys.add_argument(
+        "--api-keys-file",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="File with several OpenAI API keys (one per line as key or name=key, or a JSON list); "
+             "requests go to the least-loaded key and rejected keys are quarantined"
+    )
+    keys.add_argument(
+        "--api-keys-env",
+        type=str,
+        nargs="?",
+        const=DEFAULT_KEYS_VARIABLE,
+        default=None,
+        metavar="VARIABLE",
+        help=f"Environment variable with comma-separated OpenAI API keys (default: {DEFAULT_KEYS_VARIABLE})"
+    )
+    
     return parser
 
-def check_api_key():
-    """Check if OpenAI API key is available"""
+def load_credential_pool(args) -> Optional[CredentialPool]:
+    """Credential pool configured on the command line, None for a single API key"""
+    if args.api_keys_file:
+        return CredentialPool.from_file(args.api_keys_file)
+    if args.api_keys_env:
+        return CredentialPool.from_env(args.api_keys_env)
+    return None
+
+def check_api_key(credential_pool: Optional[CredentialPool] = None):
+    """Check if an OpenAI API key or a pool of keys is available"""
+    if credential_pool is not None:
+        if len(credential_pool) == 0:
+            print("❌ ERROR: The credential pool contains no API keys!")
+            print()
+            print("Put one key per line into the --api-keys-file, or list the keys comma-separated:")
+            print(f"  export {DEFAULT_KEYS_VARIABLE}='first_key,second_key'")
+            print()
+            return False
+        return True
     api_key = os.getenv('OPENAI_API_KEY') or os.getenv('openaikey')
     if not api_key:
         print("❌ ERROR: OpenAI API key not found!")
@@ -87,7 +340,6 @@ def print_banner():
     """Print application banner"""
     print("🌾 FAIR Farmland Metadata Extraction Tool")
     print("=" * 50)
-    print("🤖 Using OpenAI Responses API with structured outputs")
     print("🌐 Generating Schema.org-compliant JSON-LD metadata")
     print("⭐ FAIR principles assessment included")
     print()
@@ -97,13 +349,25 @@ def main():
     # Parse arguments
     parser = setup_argparse()
     args = parser.parse_args()
+    cascade_models = None
+    if args.cascade is not None:
+        cascade_models = [model.strip() for model in args.cascade.split(",") if model.strip()]
+        if not cascade_models:
+            parser.error("--cascade needs at least one model")
     
     # Print banner
     print_banner()
     
     # Check API key
-    if not check_api_key():
-        sys.exit(1)
+    credential_pool = None
+    if args.backend == "openai" and not args.replay_cassette:
+        try:
+            credential_pool = load_credential_pool(args)
+        except (OSError, ValueError) as e:
+            print(f"❌ ERROR: Cannot load API keys: {e}")
+            sys.exit(1)
+        if not check_api_key(credential_pool):
+            sys.exit(1)
     
     # Validate input directory
     input_dir = Path(args.input_directory)
@@ -149,7 +413,74 @@ def main():
     try:
         # Initialize processor
         print("🔧 Initializing processor...")
-        processor = SimpleFileProcessor(output_directory=output_dir)
+        timeout_policy = TimeoutPolicy(
+            conversion=args.conversion_timeout,
+            extraction=args.api_timeout,
+            per_file=args.file_timeout,
+            run=args.run_timeout,
+            retries=args.timeout_retries
+        )
+        hedging_policy = None
+        if args.hedge:
+            hedging_policy = HedgingPolicy(
+                percentile=args.hedge_percentile,
+                max_extra_fraction=args.hedge_max_extra,
+                initial_delay=args.hedge_initial_delay,
+                max_workers=args.hedge_workers,
+                request_timeout=args.hedge_request_timeout
+            )
+        cascade_policy = None
+        if cascade_models:
+            cascade_policy = CascadePolicy(
+                models=cascade_models,
+                min_confidence=args.cascade_min_confidence
+            )
+        gap_fill_policy = None
+        if args.fill_gaps:
+            gap_fill_policy = GapFillPolicy(
+                max_passages=args.gap_fill_max_passages,
+                model=args.gap_fill_model
+            )
+        bibliographic_policy = None
+        if args.parse_bibliographic:
+            bibliographic_policy = BibliographicPolicy(min_confidence=args.bibliographic_min_confidence)
+        reference_index = ReferenceIndex(args.reference_index) if args.reference_index else None
+        standardization_policy = None
+        if args.standardize or args.standardize_fuzzy:
+            standardization_policy = StandardizationPolicy(
+                fuzzy=args.standardize_fuzzy,
+                min_confidence=args.standardize_min_confidence
+            )
+        if args.replay_cassette:
+            llm_backend = ReplayBackend(args.replay_cassette, latency_scale=args.replay_latency_scale)
+        elif args.backend == "local":
+            llm_backend = LocalBackend(
+                latency=args.local_latency,
+                error_rate=args.local_error_rate,
+                seed=args.local_seed
+            )
+        elif credential_pool is not None:
+            llm_backend = PooledBackend(credential_pool)
+        else:
+            llm_backend = OpenAIResponsesBackend()
+        if args.record_cassette:
+            llm_backend = RecordingBackend(llm_backend, args.record_cassette)
+        processor = SimpleFileProcessor(
+            output_directory=output_dir,
+            timeouts=timeout_policy,
+            hedging=hedging_policy,
+            cascade=cascade_policy,
+            backend=llm_backend,
+            compact_schema=args.compact_schema,
+            streaming=args.stream,
+            gap_filling=gap_fill_policy,
+            bibliographic=bibliographic_policy,
+            reference_index=reference_index,
+            credential_pool=credential_pool,
+            standardization=standardization_policy
+        )
+        
+        print(f"🤖 Using {processor.ai_extractor.backend.description}")
         
         # Process files
         print("🚀 Starting processing...")
@@ -170,8 +501,8 @@ def main():
             print(f"   4. Index in search engines for discoverability")
         
         # Exit with appropriate code
-        if proc_summary['failed_files'] > 0:
-            print(f"\n⚠️  Some files failed processing. Check logs for details.")
+        if proc_summary['failed_files'] > 0 or proc_summary['timed_out_files'] > 0:
+            print(f"\n⚠️  Some files failed or timed out. Check logs for details.")
             sys.exit(1)
         else:
             print(f"\n🎉 All files processed successfully!")
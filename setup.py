@@ -52,7 +52,11 @@ setup(
             "fair-farmland-batch=fair_farmland.core.batch_processor:main",
             "fair-farmland-consolidate=fair_farmland.core.consolidator:main",
             "fair-farmland-analyze=fair_farmland.analysis.analyzer:main",
+            "fair-farmland-resolve-datasets=fair_farmland.analysis.entity_resolution:main",
+            "fair-farmland-search=fair_farmland.index.search_index:main",
             "fair-farmland-webapp=fair_farmland.web_app.main:main",
+            "fair-farmland-synthetic-corpus=fair_farmland.benchmarks.synthetic_corpus:main",
+            "fair-farmland-benchmark=fair_farmland.benchmarks.suite:main",
         ],
     },
     include_package_data=True,
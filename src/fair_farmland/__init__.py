@@ -9,6 +9,13 @@ __version__ = "1.0.0"
 __author__ = "FAIR Farmland Research Team"
 __description__ = "Toolkit for FAIR farmland data analysis and metadata extraction"
 
-from .core import ai_metadata_extractor, simple_processor
+import importlib
 
-__all__ = ["ai_metadata_extractor", "simple_processor"] 
\ No newline at end of file
+__all__ = ["ai_metadata_extractor", "simple_processor"]
+
+
+def __getattr__(name):
+    # Imported on first access (see fair_farmland.core)
+    if name in __all__:
+        return importlib.import_module(f".core.{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""Corpus-level analysis of consolidated extraction outputs."""
+
+__all__ = ["analyzer", "entity_resolution"]
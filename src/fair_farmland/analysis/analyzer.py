@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Corpus Analyzer: FAIR Statistics over a Consolidated Store
+
+Computes corpus statistics from the Parquet tables written by
+`fair_farmland.core.consolidator` (articles, datasets, places) with column-wise
+pandas/NumPy operations only, so a store with hundreds of thousands of datasets is
+analyzed in seconds:
+
+    fair           FAIR completeness rates per field and principle, score distribution
+    categories     accessibility, format and country distributions
+    temporal       publication years, coverage start years, spans and datasets per covered year
+    spatial        datasets per place, bounding-box centroid grid
+    journals       per-journal articles, datasets, FAIR score and open-access share
+
+Usage:
+    python -m fair_farmland.analysis.analyzer farmland_store --output corpus_report.json
+"""
+
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core.consolidator import load_table
+from ..index.spatial_index import parse_boxes
+from ..utils.data_standardization import NORMALIZED_MAPPINGS
+from ..utils.temporal_coverage import days_to_years, parse_temporal_coverages
+
+logger = logging.getLogger(__name__)
+
+# Values the model writes instead of leaving a field empty
+PLACEHOLDER_VALUES = ("", "not specified", "not available", "unknown", "n/a", "na", "none", "null", "-")
+
+# Dataset fields counted for completeness, by FAIR principle
+FAIR_FIELDS = {
+    "findable": ("identifier", "url"),
+    "accessible": ("accessibility_category", "conditions_of_access"),
+    "interoperable": ("format_category", "encoding_format"),
+    "reusable": ("license",)
+}
+DOCUMENTATION_FIELDS = ("description", "temporal_coverage", "place_key", "variables")
+
+_DATASET_COLUMNS = [
+    "dataset_key", "article_key", "source_file", "description", "place_key", "temporal_coverage", "identifier", "license",
+    "conditions_of_access", "is_accessible_for_free", "encoding_format", "url", "variable_count",
+    "accessibility_category", "format_category", "country_category"
+]
+_ARTICLE_COLUMNS = ["article_key", "source_file", "journal", "publication_year", "is_accessible_for_free", "extraction_confidence"]
+
+
+def _per_distinct(values: pd.Series, transform) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Apply a column transform to the distinct values only and broadcast the result to the rows
+
+    Metadata columns repeat few distinct strings, so string operations on the distinct
+    values and a positional take are much faster than string operations on every row.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # Missing values (code -1) pick the trailing None
+    distinct = np.append(np.asarray(uniques, dtype=object), None)
+    result = transform(pd.Series(distinct, dtype=object)).iloc[codes]
+    result.index = values.index
+    return result
+
+
+def _present_values(values: pd.Series) -> pd.Series:
+    text = values.astype("string").str.strip().str.lower()
+    return (values.notna() & ~text.isin(PLACEHOLDER_VALUES).fillna(False)).astype(bool)
+
+
+def present(values: pd.Series) -> pd.Series:
+    """
+    Vectorized check for real values (not missing, empty or a placeholder such as "Not specified")
+
+    Args:
+        values: Column of any dtype
+
+    Returns:
+        pd.Series: Boolean mask
+    """
+    if values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+        return _per_distinct(values, _present_values)
+    return values.notna().astype(bool)
+
+
+def categories(values: pd.Series, kind: str) -> pd.Series:
+    """
+    Standardized categories of a column; raw values without a mapping become "(unmapped)"
+
+    Args:
+        values: accessibility_category or format_category column
+        kind: Mapping kind (accessibility, data_format)
+
+    Returns:
+        pd.Series: Category, "(unmapped)" or None for missing values
+    """
+    mapping, missing_value = NORMALIZED_MAPPINGS[kind]
+    known = values.isin(set(mapping.values())) & (values != missing_value)
+    return values.where(known, pd.Series(np.where(present(values), "(unmapped)", None), index=values.index))
+
+
+def _counts(values: pd.Series, top: Optional[int] = None) -> Dict[str, int]:
+    counts = values.fillna("(missing)").value_counts()
+    if top is not None and len(counts) > top:
+        counts = pd.concat([counts.iloc[:top], pd.Series({"(other)": counts.iloc[top:].sum()})])
+    return {str(key): int(count) for key, count in counts.items()}
+
+
+def _histogram(values: pd.Series) -> Dict[str, int]:
+    values = values.dropna().astype(int)
+    counts = values.value_counts().sort_index()
+    return {str(key): int(count) for key, count in counts.items()}
+
+
+def fair_flags(datasets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-dataset presence flags of the completeness fields and the four FAIR principles
+
+    Args:
+        datasets: datasets table
+
+    Returns:
+        pd.DataFrame: One boolean column per field and principle, plus fair_score (0 to 1)
+    """
+    flags = pd.DataFrame(index=datasets.index)
+    for column in ("identifier", "url", "conditions_of_access", "encoding_format", "license",
+                   "description", "temporal_coverage", "place_key"):
+        flags[column] = present(datasets[column])
+    flags["accessibility_category"] = categories(datasets["accessibility_category"], "accessibility").notna()
+    flags["format_category"] = categories(datasets["format_category"], "data_format").notna()
+    flags["conditions_of_access"] |= datasets["is_accessible_for_free"].notna().to_numpy()
+    flags["variables"] = datasets["variable_count"].fillna(0).to_numpy() > 0
+    for principle, fields in FAIR_FIELDS.items():
+        flags[principle] = flags[list(fields)].any(axis=1)
+    flags["fair_score"] = flags[list(FAIR_FIELDS)].mean(axis=1)
+    return flags
+
+
+def fair_statistics(flags: pd.DataFrame) -> Dict[str, Any]:
+    """Completeness rates per field and principle and the distribution of FAIR scores"""
+    fields = [field for fields in FAIR_FIELDS.values() for field in fields] + list(DOCUMENTATION_FIELDS)
+    scores = flags["fair_score"]
+    return {
+        "field_completeness": {field: float(flags[field].mean()) for field in fields} if len(flags) else {},
+        "principle_rates": {principle: float(flags[principle].mean()) for principle in FAIR_FIELDS} if len(flags) else {},
+        "mean_score": float(scores.mean()) if len(scores) else 0.0,
+        "score_distribution": {f"{score:.2f}": int(count) for score, count in scores.value_counts().sort_index().items()},
+        "fully_fair": int((scores == 1.0).sum())
+    }
+
+
+def temporal_coverage_years(coverage: pd.Series) -> pd.DataFrame:
+    """
+    First and last year of temporal coverage strings such as "2005/2019", "2007-04/2010-03",
+    "since 2005" or "1990s" (parsed by fair_farmland.utils.temporal_coverage)
+
+    Args:
+        coverage: temporal_coverage column
+
+    Returns:
+        pd.DataFrame: start and end (nullable integers); a single year gives start == end,
+            open ends are missing
+    """
+    starts, ends, _ = parse_temporal_coverages(coverage.tolist())
+    return pd.DataFrame({"start": days_to_years(starts), "end": days_to_years(ends)},
+                        index=coverage.index).astype("Int64")
+
+
+def datasets_per_year(years: pd.DataFrame) -> Dict[str, int]:
+    """
+    Number of datasets covering each calendar year (difference array over the spans)
+
+    Args:
+        years: Output of temporal_coverage_years
+
+    Returns:
+        Dict: Year -> datasets whose coverage includes it
+    """
+    spans = years.dropna()
+    if spans.empty:
+        return {}
+    start = spans["start"].to_numpy(dtype=np.int64)
+    end = spans["end"].to_numpy(dtype=np.int64)
+    first = start.min()
+    difference = np.zeros(end.max() - first + 2, dtype=np.int64)
+    np.add.at(difference, start - first, 1)
+    np.add.at(difference, end - first + 1, -1)
+    covering = np.cumsum(difference)[:-1]
+    return {str(first + offset): int(count) for offset, count in enumerate(covering)}
+
+
+def temporal_statistics(articles: pd.DataFrame, datasets: pd.DataFrame) -> Dict[str, Any]:
+    """Publication years, coverage start years and spans, and datasets per covered year"""
+    years = temporal_coverage_years(datasets["temporal_coverage"])
+    spans = (years["end"] - years["start"] + 1).dropna()
+    return {
+        "publication_years": _histogram(articles["publication_year"]),
+        "datasets_with_coverage": int(years["start"].notna().sum()),
+        "coverage_start_years": _histogram(years["start"]),
+        "coverage_span_years": {
+            "mean": float(spans.mean()) if len(spans) else 0.0,
+            "median": float(spans.median()) if len(spans) else 0.0,
+            "max": int(spans.max()) if len(spans) else 0
+        },
+        "datasets_per_covered_year": datasets_per_year(years)
+    }
+
+
+def box_centroids(boxes: pd.Series) -> pd.DataFrame:
+    """
+    Centroids of schema.org GeoShape boxes ("lat lon lat lon"); a single point is its own centroid
+
+    Args:
+        boxes: box column of the places table
+
+    Returns:
+        pd.DataFrame: latitude and longitude (NaN for missing or malformed boxes)
+    """
+    parsed, _ = parse_boxes(boxes.tolist())
+    return pd.DataFrame({"latitude": (parsed[:, 0] + parsed[:, 2]) / 2,
+                         "longitude": (parsed[:, 1] + parsed[:, 3]) / 2}, index=boxes.index)
+
+
+def spatial_statistics(datasets: pd.DataFrame, places: pd.DataFrame, grid_degrees: float = 1.0,
+                       top: int = 25) -> Dict[str, Any]:
+    """Datasets per place and a grid histogram of the place centroids"""
+    places = pd.concat([places[["place_key", "name"]], box_centroids(places["box"])], axis=1)
+    located = datasets[["place_key"]].merge(places, on="place_key", how="left")
+    centroids = located[["latitude", "longitude"]].dropna()
+    cells = np.floor(centroids.to_numpy() / grid_degrees) * grid_degrees
+    grid = pd.Series(1, index=pd.MultiIndex.from_arrays(cells.T)).groupby(level=[0, 1]).size() if len(cells) else pd.Series(dtype=int)
+    return {
+        "datasets_with_place": int(datasets["place_key"].notna().sum()),
+        "datasets_with_box": int(len(centroids)),
+        "places": _counts(located["name"].where(datasets["place_key"].notna().to_numpy()).dropna(), top),
+        "grid_degrees": grid_degrees,
+        "centroid_grid": {f"{latitude:g},{longitude:g}": int(count) for (latitude, longitude), count in grid.items()}
+    }
+
+
+def journal_statistics(articles: pd.DataFrame, datasets: pd.DataFrame, flags: pd.DataFrame,
+                       top: int = 25) -> Dict[str, Any]:
+    """Articles, datasets, mean FAIR score and open-access share per journal"""
+    articles = articles.drop_duplicates("article_key")
+    per_dataset = pd.DataFrame({
+        "article_key": datasets["article_key"].to_numpy(),
+        "fair_score": flags["fair_score"].to_numpy(),
+        "public": (datasets["accessibility_category"] == "Public").to_numpy()
+    }).merge(articles[["article_key", "journal"]], on="article_key", how="left")
+    per_dataset["journal"] = per_dataset["journal"].fillna("(unknown)")
+    by_journal = per_dataset.groupby("journal", sort=False).agg(
+        datasets=("fair_score", "size"), mean_fair_score=("fair_score", "mean"), public_share=("public", "mean")
+    )
+    by_journal["articles"] = articles["journal"].fillna("(unknown)").value_counts()
+    by_journal = by_journal.fillna({"articles": 0}).sort_values(["datasets", "articles"], ascending=False).head(top)
+    return {
+        journal: {
+            "articles": int(row.articles),
+            "datasets": int(row.datasets),
+            "mean_fair_score": round(float(row.mean_fair_score), 4),
+            "public_share": round(float(row.public_share), 4)
+        }
+        for journal, row in by_journal.iterrows()
+    }
+
+
+def analyze_tables(articles: pd.DataFrame, datasets: pd.DataFrame, places: pd.DataFrame,
+                   top: int = 25, grid_degrees: float = 1.0) -> Dict[str, Any]:
+    """
+    Corpus report from consolidated tables
+
+    Args:
+        articles: articles table (rows of the same article_key are counted once)
+        datasets: datasets table (only the datasets of the counted article rows are used)
+        places: places table
+        top: Entries kept in the place, country and journal breakdowns
+        grid_degrees: Cell size of the centroid grid
+
+    Returns:
+        Dict: Report with corpus, fair, categories, temporal, spatial and journals sections
+    """
+    # The same paper consolidated from several output directories has rows per source file;
+    # one source file is kept per article, with its datasets
+    articles = articles.drop_duplicates("article_key")
+    if "source_file" in articles and "source_file" in datasets:
+        datasets = datasets[datasets["source_file"].isin(articles["source_file"])]
+    datasets = datasets.reset_index(drop=True)
+    flags = fair_flags(datasets)
+    return {
+        "corpus": {
+            "articles": int(len(articles)),
+            "datasets": int(len(datasets)),
+            "articles_with_datasets": int(datasets["article_key"].nunique()),
+            "mean_datasets_per_article": float(len(datasets) / len(articles)) if len(articles) else 0.0,
+            "mean_extraction_confidence": (float(articles["extraction_confidence"].mean())
+                                           if articles["extraction_confidence"].notna().any() else None)
+        },
+        "fair": fair_statistics(flags),
+        "categories": {
+            "accessibility": _counts(categories(datasets["accessibility_category"], "accessibility")),
+            "data_format": _counts(categories(datasets["format_category"], "data_format")),
+            "country": _counts(datasets["country_category"], top)
+        },
+        "temporal": temporal_statistics(articles, datasets),
+        "spatial": spatial_statistics(datasets, places, grid_degrees, top),
+        "journals": journal_statistics(articles, datasets, flags, top)
+    }
+
+
+def analyze_store(store: Union[str, Path], top: int = 25, grid_degrees: float = 1.0) -> Dict[str, Any]:
+    """
+    Corpus report for a consolidated store (reads only the columns the report needs)
+
+    Args:
+        store: Store directory written by the consolidator
+        top: Entries kept in the place, country and journal breakdowns
+        grid_degrees: Cell size of the centroid grid
+
+    Returns:
+        Dict: See analyze_tables
+    """
+    articles = load_table(store, "articles", columns=_ARTICLE_COLUMNS)
+    datasets = load_table(store, "datasets", columns=_DATASET_COLUMNS)
+    places = load_table(store, "places", columns=["place_key", "name", "box"])
+    return analyze_tables(articles, datasets, places, top, grid_degrees)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compute FAIR corpus statistics over a consolidated store")
+    parser.add_argument("store", type=str, help="Store directory written by fair-farmland-consolidate")
+    parser.add_argument("--output", "-o", type=str, default="corpus_report.json",
+                        help="Report file (default: corpus_report.json)")
+    parser.add_argument("--top", type=int, default=25, help="Entries per place, country and journal breakdown (default: 25)")
+    parser.add_argument("--grid-degrees", type=float, default=1.0,
+                        help="Cell size in degrees of the spatial centroid grid (default: 1.0)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+
+    started = time.perf_counter()
+    report = analyze_store(args.store, top=args.top, grid_degrees=args.grid_degrees)
+    report["generated_at"] = datetime.now().isoformat()
+    report["store"] = str(Path(args.store).absolute())
+    report["analysis_seconds"] = round(time.perf_counter() - started, 3)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    corpus, fair = report["corpus"], report["fair"]
+    print(f"📊 Corpus: {corpus['articles']} articles, {corpus['datasets']} datasets")
+    print(f"   ✅ Mean FAIR score: {fair['mean_score']:.2f} ({fair['fully_fair']} datasets fully FAIR)")
+    print("   " + ", ".join(f"{principle} {rate:.0%}" for principle, rate in fair["principle_rates"].items()))
+    print(f"   📅 With temporal coverage: {report['temporal']['datasets_with_coverage']}   "
+          f"🗺️  With bounding box: {report['spatial']['datasets_with_box']}")
+    print(f"   ⏱️  {report['analysis_seconds']}s")
+    print(f"📄 Report: {Path(args.output).absolute()}")
+
+
+if __name__ == "__main__":
+    main()
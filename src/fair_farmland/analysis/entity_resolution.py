@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Dataset Entity Resolution: Canonical Datasets across Papers
+
+The same underlying dataset (BVVG auction records, the transaction collections of the
+Gutachterausschüsse, IACS parcels, ...) is extracted separately from every paper that
+uses it, each time under a slightly different name. This stage groups the dataset
+mentions of a consolidated store into canonical datasets and writes a catalog that
+links every canonical dataset back to the articles citing it.
+
+Resolution never compares all pairs of mentions:
+
+    profiles    mentions with identical features (name tokens, identifier, publisher,
+                place box, coverage) are resolved once
+    identifier  profiles sharing a persistent identifier are merged directly
+    blocking    candidate pairs are only generated within blocks of profiles sharing a
+                name token or a publisher; tokens shared by more than max_block_size
+                profiles carry no evidence and are dropped (as stop words), which bounds
+                the work per block
+    matching    a candidate pair matches if the name token overlap (Jaccard, counted
+                from the shared blocks) is high enough — lower when both name the same
+                publisher — and the places and coverage periods overlap
+    clusters    matches are merged with union-find
+
+Usage:
+    python -m fair_farmland.analysis.entity_resolution farmland_store --output dataset_catalog.json
+"""
+
+import re
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .analyzer import present
+from ..core.consolidator import load_table, stable_key
+from ..core.reference_index import normalize_doi, normalize_title
+from ..index.spatial_index import place_boxes
+from ..utils.temporal_coverage import day_to_date, normalize_temporal_coverage, parse_temporal_coverages
+
+logger = logging.getLogger(__name__)
+
+# Data providers recognized in dataset names, descriptions and access conditions
+DATA_PROVIDERS = {
+    "BVVG": (r"\bBVVG\b", r"Bodenverwertungs", r"land privati[sz]\w* agency"),
+    "Gutachterausschuss für Grundstückswerte": (
+        r"Gutachteraussch(?:u|ü|ue)", r"\bOGA\b", r"land valuation experts?", r"valuation expert committee"
+    ),
+    "Statistisches Bundesamt": (
+        r"Statistisches Bundesamt", r"Destatis", r"Federal Statistical Office", r"Statistical Office of Germany",
+        r"\bGENESIS\b"
+    ),
+    "IACS (InVeKoS)": (r"\bIACS\b", r"InVeKoS", r"Integrated Administrati\w*(?: and)? Control System"),
+    "FADN": (r"\bFADN\b", r"Farm Accountancy Data Network", r"Testbetriebsnetz"),
+    "Eurostat": (r"Eurostat",),
+    "Thünen Institute": (r"Th(?:ü|ue|u)nen",),
+    "Copernicus": (r"Copernicus", r"CORINE")
+}
+_PROVIDER_NAMES = tuple(DATA_PROVIDERS)
+_PROVIDER_PATTERN = re.compile(
+    "|".join(f"(?P<p{index}>{'|'.join(patterns)})" for index, patterns in enumerate(DATA_PROVIDERS.values())),
+    re.IGNORECASE
+)
+
+# Name words that say nothing about which dataset is meant
+GENERIC_TOKENS = frozenset((
+    "a", "an", "and", "the", "of", "in", "on", "for", "from", "with", "by", "to", "at",
+    "data", "dataset", "database", "datum", "record", "information", "set", "agricultural"
+))
+TOKEN_SYNONYMS = {"farmland": "land", "privatisation": "privatization", "administrative": "administration"}
+
+_MENTION_COLUMNS = [
+    "dataset_key", "article_key", "name", "description", "conditions_of_access", "identifier", "place_key",
+    "temporal_coverage"
+]
+_ARTICLE_COLUMNS = ["article_key", "doi", "name", "publication_year", "journal"]
+
+
+def name_tokens(name: Optional[str]) -> Tuple[str, ...]:
+    """
+    Distinct normalized words of a dataset name ("BVVG Land Auctions Dataset" -> bvvg, land, auction)
+
+    Args:
+        name: Dataset name
+
+    Returns:
+        Tuple: Sorted tokens without generic words, plurals reduced to the singular
+    """
+    tokens = set()
+    for word in normalize_title(name).split():
+        if word in ("series", "species"):
+            pass
+        elif word.endswith("ies") and len(word) > 4:
+            word = word[:-3] + "y"
+        elif word.endswith("s") and not word.endswith(("ss", "us", "is", "cs")) and len(word) > 3:
+            word = word[:-1]
+        word = TOKEN_SYNONYMS.get(word, word)
+        if word not in GENERIC_TOKENS:
+            tokens.add(word)
+    return tuple(sorted(tokens))
+
+
+def find_providers(text: Optional[str]) -> int:
+    """
+    Data providers mentioned in a text
+
+    Args:
+        text: Dataset name, description and access conditions
+
+    Returns:
+        int: Bit mask over DATA_PROVIDERS (bit i set if the i-th provider is mentioned);
+            e.g. "Gutachterausschuss", "Gutachterausschüsse" and "Gutachterausschuesse"
+            all give the Gutachterausschuss bit
+    """
+    mask = 0
+    for match in _PROVIDER_PATTERN.finditer(text or ""):
+        mask |= 1 << int(match.lastgroup[1:])
+    return mask
+
+
+def provider_names(mask: int) -> List[str]:
+    """Names of the providers in a bit mask of find_providers"""
+    return [name for index, name in enumerate(_PROVIDER_NAMES) if mask >> index & 1]
+
+
+def mention_features(datasets: pd.DataFrame, places: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resolution features of dataset mentions (string work once per distinct value)
+
+    Args:
+        datasets: datasets table with the columns of _MENTION_COLUMNS
+        places: places table (place_key, name, box)
+
+    Returns:
+        pd.DataFrame: identifier_key, tokens, providers, place, south/west/north/east
+            (NaN if unknown or a bare point) and first_day/last_day (NaN if unknown)
+    """
+    features = pd.DataFrame(index=datasets.index)
+    identifiers = datasets["identifier"].where(present(datasets["identifier"]))
+    codes, uniques = pd.factorize(identifiers)
+    normalized = np.append(np.array([normalize_doi(value) or None for value in uniques], dtype=object), None)
+    features["identifier_key"] = normalized[codes]
+
+    codes, uniques = pd.factorize(datasets["name"])
+    tokens = [name_tokens(value) for value in uniques] + [()]
+    features["tokens"] = pd.Series([tokens[code] for code in codes], index=datasets.index, dtype=object)
+
+    text = (datasets["name"].fillna("") + " " + datasets["description"].fillna("") + " "
+            + datasets["conditions_of_access"].fillna(""))
+    codes, uniques = pd.factorize(text)
+    features["providers"] = np.array([find_providers(value) for value in uniques], dtype=np.int64)[codes]
+
+    located = datasets[["place_key"]].merge(
+        places.drop_duplicates("place_key").rename(columns={"name": "place"}), on="place_key", how="left"
+    )
+    boxes, _ = place_boxes(located["place"], located["box"])
+    # A bare point (not located by the gazetteer) says nothing about the extent
+    boxes[(boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]) <= 0] = np.nan
+    features["place"] = located["place"].to_numpy()
+    features[["south", "west", "north", "east"]] = boxes
+
+    first_days, last_days, _ = parse_temporal_coverages(datasets["temporal_coverage"].tolist())
+    features["first_day"], features["last_day"] = first_days, last_days
+    return features
+
+
+class _UnionFind:
+    """Disjoint sets over 0..n-1 (the smaller index becomes the root; path halving)"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> bool:
+        left, right = self.find(left), self.find(right)
+        if left == right:
+            return False
+        if left < right:
+            self.parent[right] = left
+        else:
+            self.parent[left] = right
+        return True
+
+    def roots(self) -> np.ndarray:
+        return np.array([self.find(item) for item in range(len(self.parent))], dtype=np.int64)
+
+
+def _block_pairs(profiles: np.ndarray, tokens: np.ndarray, count: int,
+                 max_block_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int], np.ndarray]:
+    """
+    Candidate pairs of profiles sharing a block token, with the number of shared tokens
+
+    Args:
+        profiles: Profile of each (profile, token) incidence (unique pairs)
+        tokens: Token of each incidence
+        count: Number of profiles
+        max_block_size: Tokens of more profiles are dropped
+
+    Returns:
+        Tuple: (left, right, shared tokens, block statistics, evidence tokens per profile);
+            left < right
+    """
+    frequency = np.bincount(tokens)
+    evidence = frequency[tokens] <= max_block_size
+    sizes = np.bincount(profiles[evidence], minlength=count)
+    blocked = evidence & (frequency[tokens] >= 2)
+    order = np.lexsort((profiles[blocked], tokens[blocked]))
+    members, block_tokens = profiles[blocked][order], tokens[blocked][order]
+
+    starts = np.flatnonzero(np.r_[True, block_tokens[1:] != block_tokens[:-1]])[:len(block_tokens)]
+    lengths = np.diff(np.r_[starts, len(block_tokens)])
+    left, right = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    # Blocks of equal size are expanded together: one (blocks, size) member matrix each
+    for size in np.unique(lengths):
+        block = members[starts[lengths == size][:, None] + np.arange(size)]
+        first, second = np.triu_indices(size, 1)
+        left.append(block[:, first].ravel())
+        right.append(block[:, second].ravel())
+    left, right = np.concatenate(left), np.concatenate(right)
+
+    pairs, shared = np.unique(left * count + right, return_counts=True)
+    stats = {
+        "blocks": int(len(starts)),
+        "dropped_tokens": int((frequency > max_block_size).sum()),
+        "largest_block": int(lengths.max()) if len(lengths) else 0,
+        "block_pairs": int(len(left)),
+        "candidate_pairs": int(len(pairs))
+    }
+    return pairs // count, pairs % count, shared, stats, sizes
+
+
+def resolve_mentions(features: pd.DataFrame, name_threshold: float = 0.6, publisher_threshold: float = 0.4,
+                     min_place_overlap: float = 0.5, max_block_size: int = 500) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Cluster dataset mentions into canonical datasets
+
+    Args:
+        features: Output of mention_features
+        name_threshold: Name token Jaccard similarity for a match
+        publisher_threshold: Similarity for a match when both mentions name the same provider
+        min_place_overlap: Bounding-box intersection over union for places to be compatible
+        max_block_size: Blocking tokens shared by more profiles are dropped
+
+    Returns:
+        Tuple: (cluster number per mention, resolution statistics)
+    """
+    started = time.perf_counter()
+    boxes = features[["south", "west", "north", "east"]].round(4)
+    signature = pd.DataFrame({
+        "tokens": features["tokens"].map(" ".join),
+        "identifier": features["identifier_key"],
+        "providers": features["providers"],
+        "south": boxes["south"], "west": boxes["west"], "north": boxes["north"], "east": boxes["east"],
+        "first_day": features["first_day"], "last_day": features["last_day"]
+    })
+    profile_of = signature.groupby(list(signature.columns), dropna=False, sort=False).ngroup().to_numpy()
+    first_rows = pd.Series(np.arange(len(profile_of))).groupby(profile_of).first().to_numpy()
+    profiles = features.iloc[first_rows]
+    count = len(profiles)
+    clusters = _UnionFind(count)
+
+    # Same persistent identifier: merged without further evidence
+    identifiers = profiles["identifier_key"].to_numpy()
+    with_identifier = np.flatnonzero(pd.notna(identifiers))
+    codes = pd.factorize(identifiers[with_identifier])[0]
+    order = np.argsort(codes, kind="stable")
+    same = np.flatnonzero(codes[order][1:] == codes[order][:-1])
+    identifier_merges = sum(clusters.union(int(with_identifier[order[i]]), int(with_identifier[order[i + 1]]))
+                            for i in same)
+
+    # Blocking tokens: name tokens plus one token per provider
+    provider_masks = profiles["providers"].to_numpy()
+    incidence = [(profile, token) for profile, tokens in enumerate(profiles["tokens"]) for token in tokens]
+    incidence += [(profile, f"publisher:{bit}") for profile, mask in enumerate(provider_masks)
+                  for bit in range(len(_PROVIDER_NAMES)) if mask >> bit & 1]
+    incidence_profiles = np.array([profile for profile, _ in incidence], dtype=np.int64)
+    incidence_tokens = pd.factorize(pd.Series([token for _, token in incidence], dtype=object))[0].astype(np.int64)
+    left, right, shared, stats, sizes = _block_pairs(incidence_profiles, incidence_tokens, count, max_block_size)
+
+    similarity = shared / np.maximum(sizes[left] + sizes[right] - shared, 1)
+    common_provider = (provider_masks[left] & provider_masks[right]) != 0
+    provider_conflict = (provider_masks[left] != 0) & (provider_masks[right] != 0) & ~common_provider
+
+    south, west, north, east = (profiles[column].to_numpy() for column in ("south", "west", "north", "east"))
+    height = np.minimum(north[left], north[right]) - np.maximum(south[left], south[right])
+    width = np.minimum(east[left], east[right]) - np.maximum(west[left], west[right])
+    intersection = np.clip(height, 0, None) * np.clip(width, 0, None)
+    areas = (north - south) * (east - west)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overlap = intersection / (areas[left] + areas[right] - intersection)
+    # Unknown places and periods do not rule a match out
+    place_compatible = np.isnan(overlap) | (overlap >= min_place_overlap)
+    first_day, last_day = profiles["first_day"].to_numpy(), profiles["last_day"].to_numpy()
+    period_compatible = ~((first_day[left] > last_day[right]) | (first_day[right] > last_day[left]))
+
+    matches = (place_compatible & period_compatible & ~provider_conflict
+               & ((similarity >= name_threshold) | (common_provider & (similarity >= publisher_threshold))))
+    match_merges = sum(clusters.union(int(a), int(b)) for a, b in zip(left[matches], right[matches]))
+
+    roots = clusters.roots()
+    labels = pd.factorize(roots)[0][profile_of]
+    stats.update({
+        "mentions": int(len(features)),
+        "profiles": int(count),
+        "identifier_merges": int(identifier_merges),
+        "matched_pairs": int(matches.sum()),
+        "match_merges": int(match_merges),
+        "canonical_datasets": int(labels.max() + 1) if len(labels) else 0,
+        "seconds": round(time.perf_counter() - started, 3)
+    })
+    return labels, stats
+
+
+def _most_frequent(groups: np.ndarray, values: pd.Series) -> pd.Series:
+    """Most frequent non-missing value per group (ties: first seen)"""
+    frame = pd.DataFrame({"group": groups, "value": values.to_numpy()}).dropna()
+    counts = frame.groupby(["group", "value"], sort=False).size().rename("count").reset_index()
+    counts = counts.sort_values(["group", "count"], ascending=[True, False], kind="stable")
+    return counts.drop_duplicates("group").set_index("group")["value"]
+
+
+def canonical_catalog(datasets: pd.DataFrame, features: pd.DataFrame, labels: np.ndarray,
+                      articles: pd.DataFrame) -> Tuple[List[Dict[str, Any]], pd.DataFrame]:
+    """
+    Canonical dataset entries with the articles citing them
+
+    Args:
+        datasets: Dataset mentions (dataset_key, article_key, name)
+        features: Output of mention_features for the same mentions
+        labels: Cluster number per mention (resolve_mentions)
+        articles: articles table (article_key, doi, name, publication_year, journal)
+
+    Returns:
+        Tuple: (catalog entries, most cited first; links frame mapping every mention
+            (dataset_key, article_key) to its canonical_key)
+    """
+    frame = datasets[["dataset_key", "article_key", "name"]].reset_index(drop=True)
+    frame["cluster"] = labels
+    canonical_keys = frame.groupby("cluster")["dataset_key"].min().map(lambda key: stable_key("canonical", key))
+    frame["canonical_key"] = canonical_keys.to_numpy()[labels]
+
+    names = _most_frequent(labels, frame["name"])
+    identifiers = _most_frequent(labels, features["identifier_key"].reset_index(drop=True))
+    places = _most_frequent(labels, features["place"].reset_index(drop=True))
+    days = pd.DataFrame({"cluster": labels, "first": features["first_day"].to_numpy(),
+                         "last": features["last_day"].to_numpy()}).groupby("cluster")
+    first_days, last_days = days["first"].min(), days["last"].max()
+    order = np.argsort(labels, kind="stable")
+    starts = np.flatnonzero(np.r_[True, labels[order][1:] != labels[order][:-1]])[:len(labels)]
+    provider_masks = np.bitwise_or.reduceat(features["providers"].to_numpy()[order], starts) if len(labels) else []
+
+    cited = frame.merge(
+        articles.drop_duplicates("article_key").rename(columns={"name": "article_name"}), on="article_key", how="left"
+    ).sort_values(["cluster", "article_key"], kind="stable")
+    cited["publication_year"] = cited["publication_year"].astype("Int64").astype(object)
+    cited = cited.astype(object).where(cited.notna(), None)
+
+    names, identifiers, places = names.to_dict(), identifiers.to_dict(), places.to_dict()
+    first_days, last_days = first_days.to_numpy(), last_days.to_numpy()
+    entries, variants = {}, {}
+    columns = ("cluster", "canonical_key", "name", "article_key", "article_name", "doi", "publication_year", "journal")
+    for cluster, canonical_key, name, article_key, article_name, doi, year, journal in zip(
+            *(cited[column].tolist() for column in columns)):
+        entry = entries.get(cluster)
+        if entry is None:
+            coverage = None
+            if not (np.isnan(first_days[cluster]) or np.isnan(last_days[cluster])):
+                coverage = normalize_temporal_coverage(
+                    f"{day_to_date(first_days[cluster]) or '..'}/{day_to_date(last_days[cluster]) or '..'}"
+                )
+            entry = entries[cluster] = {
+                "type": "Dataset",
+                "id": canonical_key,
+                "name": names.get(cluster, name),
+                "alternate_name": [],
+                "identifier": identifiers.get(cluster),
+                "publisher": provider_names(int(provider_masks[cluster])),
+                "spatial_coverage": places.get(cluster),
+                "temporal_coverage": coverage,
+                "mention_count": 0,
+                "article_count": 0,
+                "citation": []
+            }
+            variants[cluster] = {entry["name"]}
+        entry["mention_count"] += 1
+        if name and name not in variants[cluster]:
+            variants[cluster].add(name)
+            entry["alternate_name"].append(name)
+        if not entry["citation"] or entry["citation"][-1]["article_key"] != article_key:
+            entry["article_count"] += 1
+            entry["citation"].append({
+                "type": "ScholarlyArticle",
+                "article_key": article_key,
+                "name": article_name,
+                "doi": doi,
+                "publication_year": year,
+                "journal": journal,
+                "mentioned_as": []
+            })
+        entry["citation"][-1]["mentioned_as"].append(name)
+
+    catalog = sorted(entries.values(), key=lambda entry: (-entry["article_count"], entry["name"] or ""))
+    return catalog, frame[["dataset_key", "article_key", "canonical_key"]]
+
+
+def resolve_store(store: Union[str, Path], **kwargs) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Canonical dataset catalog of a consolidated store
+
+    Args:
+        store: Store directory written by the consolidator
+        **kwargs: Thresholds of resolve_mentions
+
+    Returns:
+        Tuple: (schema.org DataCatalog document, mention-to-canonical links frame)
+    """
+    datasets = load_table(store, "datasets", columns=_MENTION_COLUMNS)
+    places = load_table(store, "places", columns=["place_key", "name", "box"])
+    articles = load_table(store, "articles", columns=_ARTICLE_COLUMNS)
+
+    features = mention_features(datasets, places)
+    labels, stats = resolve_mentions(features, **kwargs)
+    catalog, links = canonical_catalog(datasets, features, labels, articles)
+    logger.info(f"Resolved {stats['mentions']} mentions ({stats['profiles']} profiles, "
+                f"{stats['candidate_pairs']} candidate pairs) into {stats['canonical_datasets']} datasets")
+    document = {
+        "@context": "https://schema.org/",
+        "@type": "DataCatalog",
+        "name": "Canonical farmland datasets",
+        "dataset_count": len(catalog),
+        "cited_in_several_articles": sum(1 for entry in catalog if entry["article_count"] > 1),
+        "resolution": stats,
+        "dataset": catalog
+    }
+    return document, links
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Group dataset mentions across papers into canonical datasets")
+    parser.add_argument("store", type=str, help="Store directory written by fair-farmland-consolidate")
+    parser.add_argument("--output", "-o", type=str, default="dataset_catalog.json",
+                        help="Catalog file (default: dataset_catalog.json)")
+    parser.add_argument("--links", type=str, default=None,
+                        help="Also write a Parquet file mapping each mention to its canonical dataset")
+    parser.add_argument("--name-threshold", type=float, default=0.6,
+                        help="Name token similarity for a match (default: 0.6)")
+    parser.add_argument("--publisher-threshold", type=float, default=0.4,
+                        help="Name token similarity for a match between mentions of the same provider (default: 0.4)")
+    parser.add_argument("--min-place-overlap", type=float, default=0.5,
+                        help="Bounding-box intersection over union for compatible places (default: 0.5)")
+    parser.add_argument("--max-block-size", type=int, default=500,
+                        help="Blocking tokens shared by more distinct mentions are dropped (default: 500)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+
+    started = time.perf_counter()
+    document, links = resolve_store(args.store, name_threshold=args.name_threshold,
+                                    publisher_threshold=args.publisher_threshold,
+                                    min_place_overlap=args.min_place_overlap, max_block_size=args.max_block_size)
+    document["generated_at"] = datetime.now().isoformat()
+    document["store"] = str(Path(args.store).absolute())
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+    if args.links:
+        links.to_parquet(args.links, index=False)
+
+    stats = document["resolution"]
+    print(f"🔗 {stats['mentions']} dataset mentions → {document['dataset_count']} canonical datasets "
+          f"({document['cited_in_several_articles']} cited in several articles)")
+    print(f"   {stats['profiles']} profiles, {stats['blocks']} blocks, {stats['candidate_pairs']} candidate pairs, "
+          f"{stats['matched_pairs']} matches")
+    for entry in document["dataset"][:5]:
+        if entry["article_count"] > 1:
+            print(f"   📚 {entry['name']} — {entry['article_count']} articles, {len(entry['alternate_name'])} other names")
+    print(f"   ⏱️  {time.perf_counter() - started:.3f}s")
+    print(f"📄 Catalog: {Path(args.output).absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Benchmarking tools and synthetic test corpora for the FAIR Farmland toolkit."""
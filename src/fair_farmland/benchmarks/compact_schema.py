@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Output-Token Measurement for the Compact Response Format
+
+Reconstructs the model response behind every JSON-LD document of a corpus (by default
+example_application_output/), renders it in the full and in the compact response format
+and compares output tokens and the resulting decode latency. Every document is also
+checked for a lossless round trip: the expanded compact response must map to exactly the
+same extraction result as the full one.
+
+Usage:
+    python -m fair_farmland.benchmarks.compact_schema [example_application_output] --tokens-per-second 80
+"""
+
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+from ..core.ai_metadata_extractor import AIMetadataExtractor
+from ..core.schema_registry import (
+    AuthorEntry, CompactExtractionResponse, DatasetEntry, ExtractionResponse, VariableEntry
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _token_counter() -> Tuple[Callable[[str], int], str]:
+    """Exact tokenizer if tiktoken and its encoding are available, otherwise the common 4-characters-per-token estimate"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text)), "tiktoken o200k_base"
+    except Exception as e:
+        logger.debug(f"tiktoken unavailable ({e}), estimating tokens from characters")
+        return lambda text: max(1, round(len(text) / 4)), "estimate (4 characters per token)"
+
+
+def response_from_jsonld(document: Dict[str, Any]) -> ExtractionResponse:
+    """
+    Reconstruct the full-format model response a JSON-LD document was generated from
+
+    Args:
+        document: JSON-LD document as written by the pipeline
+
+    Returns:
+        ExtractionResponse: Response in the full format (absent values as empty strings)
+    """
+    journal = document.get("is_part_of") or {}
+    metadata = document.get("extraction_metadata", {})
+
+    datasets = []
+    for dataset in document.get("dataset", []):
+        place = dataset.get("spatial_coverage") or {}
+        datasets.append(DatasetEntry(
+            name=dataset.get("name", ""),
+            description=dataset.get("description", ""),
+            location=place.get("name", ""),
+            coordinates=(place.get("geo") or {}).get("box", ""),
+            time_period=dataset.get("temporal_coverage", ""),
+            variables=[
+                VariableEntry(
+                    name=variable.get("name", ""),
+                    description=variable.get("description", ""),
+                    unit=variable.get("unit_text", "")
+                )
+                for variable in dataset.get("variable_measured", [])
+            ],
+            is_farmland_related="farmland" in dataset.get("keywords", []),
+            access_info=dataset.get("conditions_of_access", ""),
+            license=dataset.get("license", ""),
+            format=dataset.get("encoding_format", ""),
+            size=dataset.get("content_size", ""),
+            doi=dataset.get("identifier", "")
+        ))
+
+    return ExtractionResponse(
+        reasoning=metadata.get("reasoning", ""),
+        extraction_confidence=metadata.get("confidence", 0.0),
+        article_title=document.get("name", ""),
+        authors=[
+            AuthorEntry(
+                name=author.get("name", ""),
+                affiliation=author.get("affiliation") or "",
+                orcid=author.get("identifier") or ""
+            )
+            for author in document.get("author", [])
+        ],
+        publication_date=document.get("date_published", ""),
+        publication_year=document.get("publication_year", ""),
+        journal_name=journal.get("name", ""),
+        journal_issn=journal.get("issn") or "",
+        volume=document.get("publication_volume", ""),
+        issue=document.get("publication_issue", ""),
+        page_start=document.get("page_start", ""),
+        page_end=document.get("page_end", ""),
+        pagination=document.get("pagination", ""),
+        doi=document.get("doi", ""),
+        pmid=document.get("pmid", ""),
+        url=document.get("url", ""),
+        abstract=document.get("abstract", ""),
+        keywords=document.get("keywords", []),
+        subject_categories=document.get("subject", []),
+        language=document.get("in_language", ""),
+        publisher=(document.get("publisher") or {}).get("name", ""),
+        license=document.get("license", ""),
+        is_open_access=bool(document.get("is_accessible_for_free")),
+        funding=document.get("funding", ""),
+        citation=document.get("citation", ""),
+        datasets_found=datasets
+    )
+
+
+def measure_corpus(corpus_directory: Union[str, Path], tokens_per_second: float = 80.0) -> Dict[str, Any]:
+    """
+    Compare output tokens of the full and the compact response format on a JSON-LD corpus
+
+    Args:
+        corpus_directory: Directory with *_schema.json documents
+        tokens_per_second: Decode rate used to translate output tokens into latency
+
+    Returns:
+        Dict: Per-document and total token counts, estimated latencies and round-trip results
+    """
+    count_tokens, tokenizer = _token_counter()
+    documents = []
+    totals = {"full_tokens": 0, "compact_tokens": 0}
+
+    for path in sorted(Path(corpus_directory).glob("*_schema.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            full = response_from_jsonld(json.load(f))
+        compact = CompactExtractionResponse.from_full(full)
+
+        full_tokens = count_tokens(full.model_dump_json())
+        compact_tokens = count_tokens(compact.model_dump_json())
+        lossless = (AIMetadataExtractor._response_to_result_data(compact.expand())
+                    == AIMetadataExtractor._response_to_result_data(full))
+
+        totals["full_tokens"] += full_tokens
+        totals["compact_tokens"] += compact_tokens
+        documents.append({
+            "document": path.name,
+            "datasets": len(full.datasets_found),
+            "full_tokens": full_tokens,
+            "compact_tokens": compact_tokens,
+            "reduction": 1 - compact_tokens / full_tokens,
+            "lossless": lossless
+        })
+
+    if not documents:
+        raise ValueError(f"No *_schema.json documents found in {corpus_directory}")
+
+    return {
+        "corpus": str(corpus_directory),
+        "tokenizer": tokenizer,
+        "tokens_per_second": tokens_per_second,
+        "documents": documents,
+        "total": {
+            **totals,
+            "reduction": 1 - totals["compact_tokens"] / totals["full_tokens"],
+            "estimated_full_decode_seconds": totals["full_tokens"] / tokens_per_second,
+            "estimated_compact_decode_seconds": totals["compact_tokens"] / tokens_per_second,
+            "all_lossless": all(document["lossless"] for document in documents)
+        }
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure output tokens of the compact response format")
+    parser.add_argument("corpus_directory", type=str, nargs="?", default="example_application_output",
+                        help="Directory with JSON-LD documents (default: example_application_output)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0,
+                        help="Output decode rate for the latency estimate (default: 80)")
+    parser.add_argument("--output", type=str, default=None, help="Also store the measurement as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    report = measure_corpus(args.corpus_directory, args.tokens_per_second)
+    total = report["total"]
+
+    print(f"\n{'Document':<60} {'full':>8} {'compact':>8} {'saved':>7}")
+    for document in report["documents"]:
+        flag = "" if document["lossless"] else "  ⚠️ not lossless"
+        print(f"{document['document'][:60]:<60} {document['full_tokens']:>8} {document['compact_tokens']:>8} "
+              f"{document['reduction']:>6.0%}{flag}")
+    print(f"\n📉 Output tokens: {total['full_tokens']} -> {total['compact_tokens']} "
+          f"({total['reduction']:.0%} fewer, {report['tokenizer']})")
+    print(f"⏱️  Estimated decode time at {args.tokens_per_second:g} tokens/s: "
+          f"{total['estimated_full_decode_seconds']:.1f}s -> {total['estimated_compact_decode_seconds']:.1f}s")
+    print(f"{'✅' if total['all_lossless'] else '⚠️ '} Lossless round trip: "
+          f"{sum(d['lossless'] for d in report['documents'])} of {len(report['documents'])} documents")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Measurement: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
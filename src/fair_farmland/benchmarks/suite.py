@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Extraction Pipeline
+
+Measures every stage of the pipeline on a fixed synthetic corpus with the local LLM
+stand-in: file discovery, PDF conversion, prompt building (input pruning), extraction,
+response parsing and Pydantic model building, JSON-LD rendering, output writing,
+standardization (per record, vectorized over a DataFrame and as a streaming report over
+a JSONL bundle) and summary generation.
+The re-ingestion benchmarks compare the hand-written and the compiled response-to-JSON-LD
+conversion on a large set of cached responses; the reference lookup benchmark queries an offline index over a padded
+Crossref-style dump. Results are stored as JSON and can be compared
+against a saved baseline to flag regressions.
+
+Usage:
+    python run_benchmarks.py [--output results.json] [--baseline baseline.json]
+"""
+
+import gc
+import json
+import time
+import random
+import shutil
+import logging
+import platform
+import argparse
+import statistics
+import tempfile
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .synthetic_corpus import CorpusConfig, generate_corpus, write_reference_dump
+from ..core.cassette import RecordingBackend
+from ..core.llm_backends import LocalBackend
+from ..core.reference_index import ReferenceIndex, build_index
+from ..core.simple_processor import SimpleFileProcessor
+from ..utils import data_standardization
+from ..utils.standardization_report import build_report
+
+logger = logging.getLogger(__name__)
+
+# Registered benchmarks in execution order: name -> function(context) -> items processed
+BENCHMARKS: Dict[str, Callable[["BenchmarkContext"], int]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark function under a stage name"""
+    def register(func: Callable[["BenchmarkContext"], int]):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    Parameters of a benchmark run
+
+    Attributes:
+        papers: Markdown papers in the fixed corpus
+        pdf_papers: PDF papers used for the conversion benchmark
+        pdf_median_words: Median length of the PDF papers in words
+        repeat: Timed repetitions per benchmark
+        seed: Seed of the corpus and the local backend
+        median_words: Median paper length in words
+        standardization_rows: Data-source records for the standardization benchmarks
+        cached_responses: Cached model responses for the re-ingestion benchmarks
+        reference_records: Unrelated works padding the reference dump of the lookup benchmark
+    """
+    papers: int = 200
+    pdf_papers: int = 3
+    pdf_median_words: int = 1500
+    repeat: int = 5
+    seed: int = 0
+    median_words: int = 6000
+    standardization_rows: int = 20000
+    cached_responses: int = 10000
+    reference_records: int = 100000
+
+
+class BenchmarkContext:
+    """Fixed inputs shared by all benchmarks, prepared once per run"""
+
+    def __init__(self, config: BenchmarkConfig, work_directory: Path):
+        self.config = config
+        self.work_directory = work_directory
+
+        corpus_config = CorpusConfig(count=config.papers, seed=config.seed, median_words=config.median_words)
+        generate_corpus(work_directory / "corpus", corpus_config)
+        self.md_directory = work_directory / "corpus" / "md"
+        self.md_files = sorted(self.md_directory.glob("*.md"))
+        self.markdowns = [(path.name, path.read_text(encoding='utf-8')) for path in self.md_files]
+
+        pdf_config = CorpusConfig(count=config.pdf_papers, seed=config.seed,
+                                  median_words=config.pdf_median_words, pdf=True)
+        generate_corpus(work_directory / "pdf_corpus", pdf_config)
+        self.pdf_files = sorted((work_directory / "pdf_corpus" / "pdf").glob("*.pdf"))
+
+        # Record one local-backend response per paper so parsing benchmarks replay real payloads
+        cassette_path = work_directory / "responses.cassette.jsonl"
+        self.backend = RecordingBackend(LocalBackend(seed=config.seed), cassette_path)
+        self.processor = SimpleFileProcessor(output_directory=work_directory / "output", backend=self.backend)
+        self.extractor = self.processor.ai_extractor
+        self.results = [self.extractor.extract_metadata(text, name) for name, text in self.markdowns]
+        with open(cassette_path, 'r', encoding='utf-8') as f:
+            self.response_texts = [json.loads(line)["text"] for line in f if line.strip()]
+        self.jsonld_documents = [self.extractor.result_to_jsonld(result) for result in self.results]
+        self.processor.ai_extractor.backend = LocalBackend(seed=config.seed)
+
+        # Distinct cached responses as produced for the extraction schema
+        schema = self.extractor.schema
+        cache_backend = LocalBackend(seed=config.seed)
+        self.cached_responses = [
+            cache_backend.create_structured_response(
+                self.extractor.model, f"cached response {index}", schema.schema, schema.name
+            ).text
+            for index in range(config.cached_responses)
+        ]
+
+        rng = random.Random(config.seed)
+        accessibility = list(data_standardization.ACCESSIBILITY_MAPPING) + ["Available on request", "BVVG internal"]
+        formats = list(data_standardization.FORMAT_MAPPING) + ["Stata .dta", "proprietary"]
+        countries = list(data_standardization.COUNTRY_MAPPING) + ["Germany", "Poland", "DE"]
+        resolutions = list(data_standardization.SPATIAL_RESOLUTION_MAPPING) + ["10 m grid", "NUTS-3 regions"]
+        self.sources = [
+            {
+                "accessibility": rng.choice(accessibility),
+                "data_format": rng.choice(formats),
+                "country": rng.choice(countries),
+                "spatial_resolution": rng.choice(resolutions)
+            }
+            for _ in range(config.standardization_rows)
+        ]
+        self.sources_frame = pd.DataFrame(self.sources)
+        self.sources_bundle = work_directory / "sources.jsonl"
+        with open(self.sources_bundle, 'w', encoding='utf-8') as f:
+            for source in self.sources:
+                f.write(json.dumps(source) + "\n")
+
+        reference_dump = work_directory / "crossref.jsonl"
+        write_reference_dump(work_directory / "corpus", reference_dump, config.reference_records, config.seed)
+        build_index(reference_dump)
+        self.reference_index = ReferenceIndex(reference_dump.with_suffix(".refidx"))
+        with open(work_directory / "corpus" / "ground_truth.jsonl", 'r', encoding='utf-8') as f:
+            self.ground_truth = [json.loads(line) for line in f if line.strip()]
+
+        self.write_directory = work_directory / "write"
+        self.write_directory.mkdir(exist_ok=True)
+
+
+@benchmark("discovery")
+def bench_discovery(ctx: BenchmarkContext) -> int:
+    pdf_files, md_files = ctx.processor.discover_files(ctx.md_directory)
+    return len(pdf_files) + len(md_files)
+
+
+@benchmark("pdf_conversion")
+def bench_pdf_conversion(ctx: BenchmarkContext) -> int:
+    for pdf_path in ctx.pdf_files:
+        ctx.processor.convert_pdf_to_markdown(pdf_path)
+    return len(ctx.pdf_files)
+
+
+@benchmark("prompt_building")
+def bench_prompt_building(ctx: BenchmarkContext) -> int:
+    for name, text in ctx.markdowns:
+        ctx.extractor._build_user_input(text, name)
+    return len(ctx.markdowns)
+
+
+@benchmark("extraction_local_backend")
+def bench_extraction(ctx: BenchmarkContext) -> int:
+    for name, text in ctx.markdowns:
+        ctx.extractor.extract_metadata(text, name)
+    return len(ctx.markdowns)
+
+
+@benchmark("response_parsing_and_model_building")
+def bench_model_building(ctx: BenchmarkContext) -> int:
+    for (name, text), response_text in zip(ctx.markdowns, ctx.response_texts):
+        ctx.extractor._build_result(json.loads(response_text), text, name, ctx.extractor.model)
+    return len(ctx.response_texts)
+
+
+@benchmark("jsonld_rendering")
+def bench_jsonld_rendering(ctx: BenchmarkContext) -> int:
+    for result in ctx.results:
+        ctx.extractor.result_to_jsonld(result)
+    return len(ctx.results)
+
+
+@benchmark("reingest_cached_responses_legacy")
+def bench_reingest_legacy(ctx: BenchmarkContext) -> int:
+    extractor = ctx.extractor
+    for response_text in ctx.cached_responses:
+        result = extractor._build_result(json.loads(response_text), "", "cached.md", extractor.model)
+        json.dumps(extractor.result_to_jsonld(result), indent=2, ensure_ascii=False).encode('utf-8')
+    return len(ctx.cached_responses)
+
+
+@benchmark("reingest_cached_responses_compiled")
+def bench_reingest_compiled(ctx: BenchmarkContext) -> int:
+    extractor = ctx.extractor
+    for response_text in ctx.cached_responses:
+        result = extractor.build_result_from_json(response_text, "", "cached.md", extractor.model)
+        extractor.result_to_jsonld_bytes(result)
+    return len(ctx.cached_responses)
+
+
+@benchmark("reference_lookup")
+def bench_reference_lookup(ctx: BenchmarkContext) -> int:
+    for truth in ctx.ground_truth:
+        ctx.reference_index.lookup(doi=truth["doi"])
+        ctx.reference_index.lookup(title=truth["title"], year=truth["publication_year"])
+    return 2 * len(ctx.ground_truth)
+
+
+@benchmark("output_writing")
+def bench_output_writing(ctx: BenchmarkContext) -> int:
+    for index, document in enumerate(ctx.jsonld_documents):
+        with open(ctx.write_directory / f"{index}_schema.json", 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+    return len(ctx.jsonld_documents)
+
+
+@benchmark("standardize_data_sources")
+def bench_standardize_sources(ctx: BenchmarkContext) -> int:
+    data_standardization.standardize_data_sources(ctx.sources)
+    return len(ctx.sources)
+
+
+@benchmark("standardize_frame")
+def bench_standardize_frame(ctx: BenchmarkContext) -> int:
+    # Same columns as standardize_data_source, so both paths do equal work
+    columns = {column: kind for column, kind in data_standardization.FRAME_COLUMNS.items()
+               if column != "spatial_resolution"}
+    data_standardization.standardize_frame(ctx.sources_frame, columns=columns)
+    return len(ctx.sources_frame)
+
+
+@benchmark("standardize_spatial_resolution")
+def bench_standardize_spatial_resolution(ctx: BenchmarkContext) -> int:
+    for source in ctx.sources:
+        data_standardization.standardize_spatial_resolution(source["spatial_resolution"])
+    return len(ctx.sources)
+
+
+@benchmark("standardize_spatial_resolution_fuzzy")
+def bench_standardize_spatial_resolution_fuzzy(ctx: BenchmarkContext) -> int:
+    for source in ctx.sources:
+        data_standardization.standardize_spatial_resolution(source["spatial_resolution"], fuzzy=True)
+    return len(ctx.sources)
+
+
+@benchmark("standardization_report")
+def bench_standardization_report(ctx: BenchmarkContext) -> int:
+    data_standardization.get_standardization_report(ctx.sources)
+    return len(ctx.sources)
+
+
+@benchmark("standardization_report_streaming")
+def bench_standardization_report_streaming(ctx: BenchmarkContext) -> int:
+    return build_report([ctx.sources_bundle]).sources
+
+
+@benchmark("summary_generation")
+def bench_summary_generation(ctx: BenchmarkContext) -> int:
+    results = [
+        {
+            "status": "success",
+            "input_file": name,
+            "extraction_confidence": result.extraction_confidence,
+            "datasets_found": len(result.scholarly_article.dataset)
+        }
+        for (name, _), result in zip(ctx.markdowns, ctx.results)
+    ]
+    ctx.processor.stats["processing_start_time"] = ctx.processor.stats["processing_end_time"] = datetime.now()
+    summary = ctx.processor.build_summary(results, len(results))
+    json.dumps(summary, default=str)
+    return len(results)
+
+
+@benchmark("pipeline_end_to_end")
+def bench_pipeline(ctx: BenchmarkContext) -> int:
+    summary = ctx.processor.process_directory(ctx.md_directory)
+    return summary["processing_summary"]["total_files"]
+
+
+def _time_benchmark(func: Callable[[BenchmarkContext], int], ctx: BenchmarkContext, repeat: int) -> Dict[str, Any]:
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = func(ctx)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "median_seconds": median,
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "seconds_per_item": median / items if items else None,
+        "items_per_second": items / median if median > 0 else None
+    }
+
+
+def run_suite(config: BenchmarkConfig, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark suite
+
+    Args:
+        config: Benchmark parameters
+        only: Names of benchmarks to run (default: all)
+
+    Returns:
+        Dict: Benchmark results with environment information
+    """
+    unknown = set(only or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    work_directory = Path(tempfile.mkdtemp(prefix="fair_farmland_bench_"))
+    logging.getLogger("fair_farmland").setLevel(logging.WARNING)
+    try:
+        print(f"🔧 Preparing fixed corpus of {config.papers} papers in {work_directory}")
+        ctx = BenchmarkContext(config, work_directory)
+
+        results = {}
+        for name, func in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            results[name] = _time_benchmark(func, ctx, config.repeat)
+            print(f"   ⏱️  {name}: {results[name]['median_seconds'] * 1000:.1f} ms "
+                  f"({results[name]['items']} items)")
+        ctx.reference_index.close()
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor()
+        },
+        "config": asdict(config),
+        "benchmarks": results
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> Dict[str, Any]:
+    """
+    Compare per-item timings against a baseline run
+
+    Args:
+        results: Output of run_suite
+        baseline: Earlier output of run_suite
+        threshold: Relative slowdown that counts as a regression (0.2 = 20% slower)
+
+    Returns:
+        Dict: Per-benchmark ratios and the list of regressions
+    """
+    comparison = {}
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or not previous.get("seconds_per_item") or not current.get("seconds_per_item"):
+            continue
+        ratio = current["seconds_per_item"] / previous["seconds_per_item"]
+        comparison[name] = {
+            "baseline_seconds_per_item": previous["seconds_per_item"],
+            "current_seconds_per_item": current["seconds_per_item"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold
+        }
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return {"threshold": threshold, "benchmarks": comparison, "regressions": regressions}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; returns 1 if regressions were found"""
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the FAIR Farmland extraction pipeline")
+    parser.add_argument("--output", type=str, default="benchmark_results.json", help="Where to store the results")
+    parser.add_argument("--baseline", type=str, default=None, help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", type=str, default=None, metavar="PATH",
+                        help="Also store the results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown flagged as a regression (default: 0.2)")
+    parser.add_argument("--only", type=str, default=None, help="Comma-separated benchmark names to run")
+    parser.add_argument("--list", action="store_true", help="List available benchmarks and exit")
+    parser.add_argument("--papers", type=int, default=200, help="Papers in the fixed corpus (default: 200)")
+    parser.add_argument("--pdf-papers", type=int, default=3, help="PDFs for the conversion benchmark (default: 3)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per benchmark (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--cached-responses", type=int, default=10000,
+                        help="Cached responses for the re-ingestion benchmarks (default: 10000)")
+    parser.add_argument("--standardization-rows", type=int, default=20000,
+                        help="Data-source records for the standardization benchmarks (default: 20000)")
+    parser.add_argument("--reference-records", type=int, default=100000,
+                        help="Unrelated works in the reference dump of the lookup benchmark (default: 100000)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    config = BenchmarkConfig(papers=args.papers, pdf_papers=args.pdf_papers, repeat=args.repeat, seed=args.seed,
+                             cached_responses=args.cached_responses, reference_records=args.reference_records,
+                             standardization_rows=args.standardization_rows)
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_suite(config, only=only)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results["comparison"] = compare_to_baseline(results, json.load(f), args.threshold)
+        exit_code = 1 if results["comparison"]["regressions"] else 0
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    print(f"\n{'Benchmark':<40} {'median ms':>12} {'µs/item':>12} {'vs. baseline':>14}")
+    for name, stats in results["benchmarks"].items():
+        per_item = f"{stats['seconds_per_item'] * 1e6:.1f}" if stats["seconds_per_item"] else "-"
+        ratio = results.get("comparison", {}).get("benchmarks", {}).get(name, {}).get("ratio")
+        flag = ""
+        if ratio is not None:
+            flag = f"{ratio:.2f}x" + (" ⚠️" if ratio > 1 + args.threshold else "")
+        print(f"{name:<40} {stats['median_seconds'] * 1000:>12.1f} {per_item:>12} {flag:>14}")
+
+    if exit_code:
+        print(f"\n⚠️  Regressions: {', '.join(results['comparison']['regressions'])}")
+    print(f"\n📁 Results: {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Synthetic Farmland-Paper Corpus Generator
+
+Generates markdown (and optionally PDF) papers with the structure of real farmland
+research articles: front matter, abstract, sections, data-availability statements,
+reference lists and farmland dataset mentions in varying places and lengths. Every
+paper is described by a ground-truth record so that scaling benchmarks and recall
+checks can run offline.
+
+Usage:
+    python -m fair_farmland.benchmarks.synthetic_corpus <output_directory> --count 10000 --seed 42
+"""
+
+import re
+import json
+import math
+import random
+import logging
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = ["Anna", "Jonas", "Marlene", "Oliver", "Martin", "Matthias", "Xinyue", "Jana", "Lukas",
+               "Silke", "Norbert", "Alfons", "Julia", "Stefan", "Katrin", "Hugo", "Ines", "Tobias"]
+LAST_NAMES = ["Müller", "Schmidt", "Odening", "Ritter", "Mußhoff", "Plogmann", "Seifert", "Appel",
+              "Balmann", "Hüttel", "Kionka", "Uhlemann", "Yang", "Schaak", "Feichtinger", "Croonenbroeck"]
+AFFILIATIONS = [
+    "Humboldt-Universität zu Berlin, Department of Agricultural Economics, Berlin, Germany",
+    "Georg-August-Universität Göttingen, Department of Agricultural Economics and Rural Development, Germany",
+    "Leibniz Institute of Agricultural Development in Transition Economies (IAMO), Halle (Saale), Germany",
+    "Thünen Institute of Farm Economics, Braunschweig, Germany",
+    "University of Kiel, Institute of Agricultural Economics, Kiel, Germany"
+]
+JOURNALS = [
+    ("Land Use Policy", "0264-8377", "Elsevier"),
+    ("Agricultural Finance Review", "0002-1466", "Emerald"),
+    ("Journal of Agricultural Economics", "0021-857X", "Wiley"),
+    ("European Review of Agricultural Economics", "0165-1587", "Oxford University Press"),
+    ("German Journal of Agricultural Economics", "2191-4028", "Deutscher Fachverlag"),
+    ("Land Economics", "0023-7639", "University of Wisconsin Press")
+]
+REGIONS = [
+    ("Saxony-Anhalt, Germany", "50.94 10.56 53.04 13.19"),
+    ("Brandenburg, Germany", "51.36 11.27 53.56 14.77"),
+    ("Lower Saxony, Germany", "51.29 6.65 53.89 11.60"),
+    ("Bavaria, Germany", "47.27 8.98 50.56 13.84"),
+    ("Mecklenburg-Western Pomerania, Germany", "53.11 10.59 54.68 14.41"),
+    ("Germany", "47.27 5.87 55.06 15.04")
+]
+DATASET_TEMPLATES = [
+    ("BVVG farmland auction records", "Bodenverwertungs- und -verwaltungs GmbH (BVVG)", "Restricted", "Database",
+     [("Auction price", "EUR/ha"), ("Plot size", "ha"), ("Soil quality index", "points"), ("Number of bids", "count")]),
+    ("Purchase price collection of the expert committee (Gutachterausschuss)", "Gutachterausschuss für Grundstückswerte",
+     "Confidential", "Database",
+     [("Sale price", "EUR"), ("Parcel area", "ha"), ("Land use type", ""), ("Contract date", "date")]),
+    ("Official land price statistics", "Federal Statistical Office (Destatis)", "Public", "CSV",
+     [("Average price per hectare", "EUR/ha"), ("Number of sales", "count"), ("Area sold", "ha")]),
+    ("Farmland rental contracts survey", "Thünen Institute", "Restricted", "Excel",
+     [("Rental rate", "EUR/ha/year"), ("Contract duration", "years"), ("Tenant type", "")]),
+    ("Land market transaction register", "State Office for Land Management", "Confidential", "Shapefile",
+     [("Transaction price", "EUR/m²"), ("Buyer type", ""), ("Distance to city", "km")])
+]
+SECTION_TITLES = ["Introduction", "Background", "Data", "Methodology", "Results", "Discussion", "Conclusion"]
+FILLER_WORDS = ("farmland market price land agricultural region transaction rental buyer seller policy "
+                "estimate model effect spatial temporal county parcel auction value structural change "
+                "investment tenant owner subsidy productivity soil quality hedonic regression").split()
+AVAILABILITY_STATEMENTS = {
+    "Public": "The data are publicly available from {publisher}.",
+    "Restricted": "The data are available from {publisher} upon reasonable request and subject to a data use agreement.",
+    "Confidential": "Due to confidentiality agreements with {publisher}, the data cannot be shared."
+}
+
+
+@dataclass
+class CorpusConfig:
+    """
+    Parameters of a synthetic corpus
+
+    Attributes:
+        count: Number of papers
+        seed: Seed; paper i depends only on (seed, i)
+        median_words: Median body length in words (log-normal size distribution)
+        size_sigma: Log-normal sigma of the body length
+        max_datasets: Maximum number of farmland datasets per paper
+        no_dataset_fraction: Fraction of papers without any farmland dataset
+        pdf: Also write a PDF rendering of every paper
+    """
+    count: int = 100
+    seed: int = 0
+    median_words: int = 6000
+    size_sigma: float = 0.5
+    max_datasets: int = 3
+    no_dataset_fraction: float = 0.25
+    pdf: bool = False
+
+
+def _sentence(rng: random.Random, min_words: int = 8, max_words: int = 24) -> str:
+    words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        sentence = _sentence(rng)
+        words -= sentence.count(" ") + 1
+        sentences.append(sentence)
+    return " ".join(sentences)
+
+
+def _make_dataset(rng: random.Random, year: int) -> Dict[str, Any]:
+    name, publisher, access, data_format, variables = rng.choice(DATASET_TEMPLATES)
+    region, box = rng.choice(REGIONS)
+    end = rng.randint(max(1995, year - 10), year - 1)
+    start = rng.randint(max(1990, end - 15), end)
+    chosen = rng.sample(variables, rng.randint(2, len(variables)))
+    return {
+        "name": f"{name} – {region.split(',')[0]} ({start}–{end})",
+        "publisher": publisher,
+        "location": region,
+        "coordinates": box,
+        "time_period": f"{start}/{end}",
+        "variables": [{"name": var, "unit": unit} for var, unit in chosen],
+        "access": access,
+        "format": data_format,
+        "observations": rng.randint(500, 250000)
+    }
+
+
+def _dataset_paragraph(dataset: Dict[str, Any], rng: random.Random) -> str:
+    start, end = dataset["time_period"].split("/")
+    variables = ", ".join(
+        f"{v['name'].lower()}" + (f" (in {v['unit']})" if v["unit"] else "") for v in dataset["variables"]
+    )
+    templates = [
+        "We use the {name} provided by {publisher}. The data cover {n} transactions in {loc} between {start} and {end} "
+        "and contain {variables}. The records are delivered as {fmt}.",
+        "Our empirical analysis is based on {n} observations from the {name}, compiled by {publisher} for {loc} "
+        "({start}–{end}). For each observation we observe {variables}; the data come in {fmt} format.",
+        "Data: {name} ({publisher}); region: {loc}; period: {start}–{end}; N = {n}; variables: {variables}; "
+        "format: {fmt}."
+    ]
+    return rng.choice(templates).format(
+        name=dataset["name"], publisher=dataset["publisher"], n=f"{dataset['observations']:,}",
+        loc=dataset["location"], start=start, end=end, variables=variables, fmt=dataset["format"]
+    )
+
+
+def generate_paper(index: int, config: CorpusConfig) -> Tuple[str, Dict[str, Any]]:
+    """
+    Generate one synthetic paper
+
+    Args:
+        index: Position of the paper in the corpus
+        config: Corpus parameters
+
+    Returns:
+        Tuple[str, Dict]: Markdown text and its ground-truth record
+    """
+    rng = random.Random(f"{config.seed}:{index}")
+
+    year = rng.randint(2005, 2024)
+    journal, issn, publisher = rng.choice(JOURNALS)
+    volume, issue = str(rng.randint(10, 130)), str(rng.randint(1, 12))
+    page_start = rng.randint(1, 900)
+    page_end = page_start + rng.randint(8, 35)
+    doi = f"10.{rng.randint(1000, 9999)}/{journal.split()[0].lower()}.{year}.{rng.randint(100000, 999999)}"
+    region = rng.choice(REGIONS)[0].split(",")[0]
+    title = rng.choice([
+        f"Price Dynamics on the Farmland Market in {region}",
+        f"Who Buys Agricultural Land? Evidence from {region}",
+        f"Spatial Spillovers in Land Rental Markets of {region}",
+        f"The Effect of Non-Agricultural Investors on Land Prices in {region}"
+    ])
+    authors = [
+        {"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "affiliation": rng.choice(AFFILIATIONS)}
+        for _ in range(rng.randint(1, 5))
+    ]
+
+    datasets = []
+    if rng.random() >= config.no_dataset_fraction:
+        datasets = [_make_dataset(rng, year) for _ in range(rng.randint(1, config.max_datasets))]
+
+    body_words = max(500, int(rng.lognormvariate(math.log(config.median_words), config.size_sigma)))
+    words_per_section = body_words // len(SECTION_TITLES)
+
+    # Decide where dataset mentions and the data-availability statement appear
+    mention_sections = [rng.choice(["Data", "Methodology", "Appendix", "Footnote"]) for _ in datasets]
+    availability_position = rng.choice(["after_conclusion", "after_data", "front_matter", "absent"]) if datasets else "absent"
+    availability = " ".join(
+        AVAILABILITY_STATEMENTS[d["access"]].format(publisher=d["publisher"]) for d in datasets
+    )
+
+    lines = [f"# {title}", ""]
+    lines.append(", ".join(f"{a['name']}<sup>{i + 1}</sup>" for i, a in enumerate(authors)))
+    lines.append("")
+    for i, a in enumerate(authors):
+        lines.append(f"<sup>{i + 1}</sup> {a['affiliation']}")
+    lines.append("")
+    lines.append(f"*{journal}*, Vol. {volume}, No. {issue}, pp. {page_start}–{page_end}, {year}. ISSN {issn}")
+    lines.append(f"https://doi.org/{doi}")
+    lines.append(f"© {year} {publisher}")
+    lines.append("")
+    if availability_position == "front_matter":
+        lines += [f"**Data availability:** {availability}", ""]
+    lines += ["## Abstract", "", _paragraph(rng, rng.randint(120, 250)), ""]
+    keywords = rng.sample(["farmland prices", "land market", "Germany", "hedonic pricing", "auctions",
+                           "land rental", "spatial econometrics", "investors"], 4)
+    lines += [f"**Keywords:** {', '.join(keywords)}", ""]
+
+    footnotes = []
+    for number, section in enumerate(SECTION_TITLES, start=1):
+        lines += [f"## {number}. {section}", ""]
+        for _ in range(rng.randint(1, 4)):
+            lines += [_paragraph(rng, max(40, words_per_section // 3)), ""]
+        for dataset, where in zip(datasets, mention_sections):
+            if where == section:
+                lines += [_dataset_paragraph(dataset, rng), ""]
+            elif where == "Footnote" and section == "Data":
+                footnotes.append(_dataset_paragraph(dataset, rng))
+                lines[-2] += f"[^{len(footnotes)}]"
+        if section == "Data" and availability_position == "after_data":
+            lines += [f"**Data availability statement.** {availability}", ""]
+
+    if availability_position == "after_conclusion":
+        lines += ["## Data Availability Statement", "", availability, ""]
+
+    appendix = [d for d, where in zip(datasets, mention_sections) if where == "Appendix"]
+    if appendix:
+        lines += ["## Appendix A. Data Sources", ""]
+        lines += [_dataset_paragraph(d, rng) + "\n" for d in appendix]
+
+    lines += ["## References", ""]
+    for _ in range(rng.randint(15, 60)):
+        lines.append(f"- {rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)[0]}. ({rng.randint(1980, year)}). "
+                     f"{_sentence(rng, 5, 12)} *{rng.choice(JOURNALS)[0]}*, {rng.randint(1, 120)}, "
+                     f"{rng.randint(1, 500)}–{rng.randint(501, 999)}.")
+    for number, footnote in enumerate(footnotes, start=1):
+        lines += ["", f"[^{number}]: {footnote}"]
+
+    ground_truth = {
+        "paper_id": f"synthetic_{index:06d}",
+        "title": title,
+        "authors": authors,
+        "doi": doi,
+        "publication_year": str(year),
+        "journal_name": journal,
+        "journal_issn": issn,
+        "publisher": publisher,
+        "volume": volume,
+        "issue": issue,
+        "page_start": str(page_start),
+        "page_end": str(page_end),
+        "keywords": keywords,
+        "datasets": [
+            {key: d[key] for key in ("name", "publisher", "location", "coordinates", "time_period",
+                                     "variables", "access", "format")}
+            for d in datasets
+        ],
+        "dataset_mention_sections": mention_sections,
+        "data_availability_position": availability_position,
+        "body_words": body_words
+    }
+    return "\n".join(lines) + "\n", ground_truth
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_simple_pdf(text: str, pdf_path: Union[str, Path], line_width: int = 95, lines_per_page: int = 60):
+    """
+    Write plain text as a minimal multi-page PDF (Helvetica, WinAnsi encoding)
+
+    Args:
+        text: Text to render; markdown markup is kept as-is
+        pdf_path: Output file
+        line_width: Characters per line before wrapping
+        lines_per_page: Lines per page
+    """
+    wrapped = []
+    for paragraph in text.split("\n"):
+        while len(paragraph) > line_width:
+            cut = paragraph.rfind(" ", 0, line_width)
+            cut = cut if cut > 0 else line_width
+            wrapped.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        wrapped.append(paragraph)
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        stream = content.encode("cp1252", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{i} 0 R" for i in page_ids).encode("ascii"), len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(pdf_path).write_bytes(bytes(output))
+
+
+def iter_corpus(config: CorpusConfig) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (markdown, ground truth) for every paper of the corpus"""
+    for index in range(config.count):
+        yield generate_paper(index, config)
+
+
+def generate_corpus(output_directory: Union[str, Path], config: CorpusConfig) -> Dict[str, Any]:
+    """
+    Write a synthetic corpus and its ground truth to disk
+
+    Args:
+        output_directory: Target directory; papers go to md/ (and pdf/), ground truth to ground_truth.jsonl
+        config: Corpus parameters
+
+    Returns:
+        Dict: Corpus statistics
+    """
+    output_directory = Path(output_directory)
+    md_dir = output_directory / "md"
+    md_dir.mkdir(parents=True, exist_ok=True)
+    pdf_dir = output_directory / "pdf"
+    if config.pdf:
+        pdf_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = {"papers": 0, "datasets": 0, "papers_without_datasets": 0, "total_words": 0, "total_bytes": 0}
+    with open(output_directory / "ground_truth.jsonl", 'w', encoding='utf-8') as gt_file:
+        for markdown, truth in iter_corpus(config):
+            md_path = md_dir / f"{truth['paper_id']}.md"
+            md_path.write_text(markdown, encoding='utf-8')
+            if config.pdf:
+                write_simple_pdf(markdown, pdf_dir / f"{truth['paper_id']}.pdf")
+            gt_file.write(json.dumps(truth, ensure_ascii=False) + "\n")
+
+            stats["papers"] += 1
+            stats["datasets"] += len(truth["datasets"])
+            stats["papers_without_datasets"] += 0 if truth["datasets"] else 1
+            stats["total_words"] += truth["body_words"]
+            stats["total_bytes"] += len(markdown.encode("utf-8"))
+
+    stats["config"] = config.__dict__
+    with open(output_directory / "corpus_info.json", 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2)
+    logger.info(f"Generated {stats['papers']} papers with {stats['datasets']} datasets in {output_directory}")
+    return stats
+
+
+def crossref_work(truth: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Crossref-style work record of a paper's ground truth (as in a Crossref JSONL export)
+
+    Args:
+        truth: Ground-truth record of a paper
+
+    Returns:
+        Dict: Work with DOI, title, container title, ISSN, volume, issue, pages, date and authors
+    """
+    authors = []
+    for author in truth["authors"]:
+        given, _, family = author["name"].rpartition(" ")
+        authors.append({"given": given, "family": family, "affiliation": [{"name": author["affiliation"]}]})
+    return {
+        "DOI": truth["doi"],
+        "type": "journal-article",
+        "title": [truth["title"]],
+        "container-title": [truth["journal_name"]],
+        "ISSN": [truth["journal_issn"]],
+        "issn-type": [{"value": truth["journal_issn"], "type": "print"}],
+        "publisher": truth["publisher"],
+        "volume": truth["volume"],
+        "issue": truth["issue"],
+        "page": f"{truth['page_start']}-{truth['page_end']}",
+        "issued": {"date-parts": [[int(truth["publication_year"])]]},
+        "author": authors
+    }
+
+
+def write_reference_dump(corpus_directory: Union[str, Path], dump_path: Union[str, Path],
+                         extra_records: int = 0, seed: int = 0) -> int:
+    """
+    Write a Crossref-style JSONL dump covering a corpus, padded with unrelated works
+
+    Args:
+        corpus_directory: Corpus written by generate_corpus
+        dump_path: JSONL file to write
+        extra_records: Additional works of unrelated papers (to give the dump a realistic size)
+        seed: Seed of the additional works
+
+    Returns:
+        int: Number of works written
+    """
+    written = 0
+    with open(Path(corpus_directory) / "ground_truth.jsonl", 'r', encoding='utf-8') as gt_file, \
+            open(dump_path, 'w', encoding='utf-8') as dump:
+        for line in gt_file:
+            dump.write(json.dumps(crossref_work(json.loads(line)), ensure_ascii=False) + "\n")
+            written += 1
+        rng = random.Random(f"reference:{seed}")
+        for index in range(extra_records):
+            journal, issn, publisher = rng.choice(JOURNALS)
+            year = rng.randint(1990, 2024)
+            page_start = rng.randint(1, 900)
+            truth = {
+                "doi": f"10.{rng.randint(1000, 9999)}/ref.{year}.{index:08d}",
+                "title": f"{_sentence(rng, 5, 12)[:-1]} in {rng.choice(REGIONS)[0].split(',')[0]}",
+                "journal_name": journal,
+                "journal_issn": issn,
+                "publisher": publisher,
+                "volume": str(rng.randint(1, 130)),
+                "issue": str(rng.randint(1, 12)),
+                "page_start": str(page_start),
+                "page_end": str(page_start + rng.randint(8, 35)),
+                "publication_year": str(year),
+                "authors": [
+                    {"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "affiliation": rng.choice(AFFILIATIONS)}
+                    for _ in range(rng.randint(1, 5))
+                ]
+            }
+            dump.write(json.dumps(crossref_work(truth), ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+def score_outputs(ground_truth_path: Union[str, Path], output_directory: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Score extraction outputs (*_schema.json) against a corpus' ground truth
+
+    Args:
+        ground_truth_path: ground_truth.jsonl written by generate_corpus
+        output_directory: Directory with <paper_id>_schema.json files
+
+    Returns:
+        Dict: Per-field accuracy and dataset recall/precision over the papers that have an output
+    """
+    output_directory = Path(output_directory)
+    fields = {"title": 0, "doi": 0, "publication_year": 0, "journal_name": 0}
+    scored = missing = 0
+    true_datasets = found_datasets = matched_datasets = 0
+
+    with open(ground_truth_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            truth = json.loads(line)
+            output_path = output_directory / f"{truth['paper_id']}_schema.json"
+            if not output_path.exists():
+                missing += 1
+                continue
+            with open(output_path, 'r', encoding='utf-8') as out:
+                output = json.load(out)
+            scored += 1
+
+            extracted = {
+                "title": output.get("name"),
+                "doi": (output.get("doi") or "").replace("https://doi.org/", ""),
+                "publication_year": output.get("publication_year"),
+                "journal_name": (output.get("is_part_of") or {}).get("name")
+            }
+            for field_name in fields:
+                if _normalize(extracted[field_name]) == _normalize(truth[field_name]):
+                    fields[field_name] += 1
+
+            output_names = [set(_normalize(d.get("name")).split()) for d in output.get("dataset", [])]
+            true_datasets += len(truth["datasets"])
+            found_datasets += len(output_names)
+            for dataset in truth["datasets"]:
+                tokens = set(_normalize(dataset["name"]).split())
+                if any(len(tokens & names) / max(1, len(tokens | names)) >= 0.5 for names in output_names):
+                    matched_datasets += 1
+
+    return {
+        "papers_scored": scored,
+        "papers_missing_output": missing,
+        "field_accuracy": {name: hits / scored if scored else 0.0 for name, hits in fields.items()},
+        "dataset_recall": matched_datasets / true_datasets if true_datasets else 1.0,
+        "dataset_precision": matched_datasets / found_datasets if found_datasets else 1.0
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic farmland-paper corpus with ground truth")
+    parser.add_argument("output_directory", type=str, help="Directory for the generated corpus")
+    parser.add_argument("--count", type=int, default=100, help="Number of papers (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--median-words", type=int, default=6000, help="Median body length in words (default: 6000)")
+    parser.add_argument("--size-sigma", type=float, default=0.5, help="Log-normal sigma of paper length (default: 0.5)")
+    parser.add_argument("--max-datasets", type=int, default=3, help="Maximum datasets per paper (default: 3)")
+    parser.add_argument("--no-dataset-fraction", type=float, default=0.25,
+                        help="Fraction of papers without farmland datasets (default: 0.25)")
+    parser.add_argument("--pdf", action="store_true", help="Also write a PDF version of every paper")
+    parser.add_argument("--score", type=str, default=None, metavar="OUTPUT_DIR",
+                        help="Score extraction outputs in OUTPUT_DIR against the ground truth instead of generating")
+    parser.add_argument("--reference-dump", type=str, default=None, metavar="JSONL",
+                        help="Also write a Crossref-style dump of the corpus' bibliographic records")
+    parser.add_argument("--reference-padding", type=int, default=0,
+                        help="Unrelated works added to the reference dump (default: 0)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    if args.score:
+        scores = score_outputs(Path(args.output_directory) / "ground_truth.jsonl", args.score)
+        print(json.dumps(scores, indent=2))
+        return
+
+    config = CorpusConfig(
+        count=args.count,
+        seed=args.seed,
+        median_words=args.median_words,
+        size_sigma=args.size_sigma,
+        max_datasets=args.max_datasets,
+        no_dataset_fraction=args.no_dataset_fraction,
+        pdf=args.pdf
+    )
+    stats = generate_corpus(args.output_directory, config)
+    print(f"🌾 Generated {stats['papers']} papers ({stats['datasets']} datasets, "
+          f"{stats['total_bytes'] / 1e6:.1f} MB) in {args.output_directory}")
+    if args.reference_dump:
+        works = write_reference_dump(args.output_directory, args.reference_dump, args.reference_padding, args.seed)
+        print(f"📚 Wrote {works} reference records to {args.reference_dump}")
+
+
+if __name__ == "__main__":
+    main()
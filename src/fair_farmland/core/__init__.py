@@ -1,6 +1,13 @@
 """Core modules for farmland data processing and analysis."""
 
-from . import ai_metadata_extractor
-from . import simple_processor
+import importlib
 
-__all__ = ["ai_metadata_extractor", "simple_processor"] 
\ No newline at end of file
+__all__ = ["ai_metadata_extractor", "simple_processor"]
+
+
+def __getattr__(name):
+    # Submodules are imported on first access, so `python -m fair_farmland.core.<module>`
+    # does not import the module it is about to run
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
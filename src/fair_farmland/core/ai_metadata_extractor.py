@@ -7,17 +7,36 @@ using OpenAI's Responses API with structured outputs and Pydantic models for rel
 Based on the technical specification in docs/technical_report/02_metadata_schema.md
 """
 
-import os
 import json
+import time
 import logging
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
 from pathlib import Path
 
-from openai import OpenAI
-from pydantic import BaseModel, Field, HttpUrl, validator
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter, ValidationError, validator
 from dotenv import load_dotenv
 
+from .bibliographic import BibliographicPolicy, BibliographicRecord, BibliographicStats, parse_bibliographic
+from .reference_index import ReferenceIndex, apply_reference, describes_paper
+from .cascade import CascadePolicy, CascadeStats, escalation_reason
+from .credential_pool import CredentialPool, PooledBackend
+from .deadlines import Deadline, StageTimeoutError
+from .gap_filling import (
+    GapFillPolicy, GapFillStats, build_gap_prompt, build_gap_schema, find_gaps, merge_answers,
+    select_passages, split_passages
+)
+from .hedging import HedgedCaller, HedgingPolicy
+from .instrumentation import StageTimings
+from .standardization import StandardizationPolicy, StandardizationStats, standardize_dataset
+from .schema_registry import (
+    COMPACT_FIELD_NAMES, CompactExtractionResponse, DatasetEntry, ExtractionResponse, RegisteredSchema,
+    SubsetResponse, get_extraction_schema, registry, to_strict_schema
+)
+from .streaming import IncrementalJSONParser
+from .llm_backends import BackendTimeoutError, LLMBackend, LLMResponse, OpenAIResponsesBackend
+from ..utils.temporal_coverage import normalize_temporal_coverage
+
 # Load environment variables
 load_dotenv()
 
@@ -115,13 +134,15 @@ class Dataset(BaseModel):
     encoding_format: Optional[str] = Field(default=None, description="Data format (CSV, JSON, etc.)")
     content_size: Optional[str] = Field(default=None, description="Dataset size")
     
+    # Precomputed categories (raw and standardized value per field)
+    standardized: Optional[Dict[str, Dict[str, Any]]] = Field(default=None, description="Raw and standardized access, format and country categories")
+    
     @validator('temporal_coverage')
     def validate_temporal_coverage(cls, v):
         """Validate ISO 8601 interval format"""
-        if v and '/' not in v:
-            # Convert single years to interval format
-            if v.isdigit() and len(v) == 4:
-                return f"{v}/{v}"
+        if v:
+            # Normalize years, ranges, open intervals, durations and decades; keep text we cannot parse
+            return normalize_temporal_coverage(v) or v
         return v
 
 class ScholarlyArticle(BaseModel):
@@ -187,18 +208,85 @@ class FarmlandMetadataExtractionResult(BaseModel):
     scholarly_article: ScholarlyArticle = Field(description="The complete scholarly article with datasets")
     extraction_confidence: float = Field(ge=0.0, le=1.0, description="Confidence score for the extraction (0-1)")
     processing_notes: List[str] = Field(default_factory=list, description="Additional notes about processing")
+    response_schema: Optional[Dict[str, str]] = Field(default=None, description="Name, version and content hash of the response schema")
+    field_provenance: Optional[Dict[str, Dict[str, Any]]] = Field(default=None, description="Source of every bibliographic field (local parser or model)")
+
+class ExtractionMetadata(BaseModel):
+    """Provenance block appended to every JSON-LD document"""
+    reasoning: str = Field(description="Explanation of the extraction process and decisions made")
+    confidence: float = Field(description="Confidence score for the extraction (0-1)")
+    processing_notes: List[str] = Field(default_factory=list, description="Additional notes about processing")
+    generated_at: str = Field(description="Time the document was rendered")
+    generator: str = Field(description="Name of the generating tool")
+    response_schema: Optional[Dict[str, str]] = Field(default=None, description="Name, version and content hash of the response schema")
+    field_provenance: Optional[Dict[str, Dict[str, Any]]] = Field(default=None, description="Source of every bibliographic field (local parser or model)")
+
+class ScholarlyArticleDocument(ScholarlyArticle):
+    """JSON-LD document as written to disk: the article followed by its extraction metadata"""
+    extraction_metadata: ExtractionMetadata = Field(description="How the metadata was extracted")
+
+# Compiled validator/serializer pairs used by the fast conversion path
+RESULT_ADAPTER = TypeAdapter(FarmlandMetadataExtractionResult)
+DOCUMENT_ADAPTER = TypeAdapter(ScholarlyArticleDocument)
+ARTICLE_ADAPTER = TypeAdapter(ScholarlyArticle)
+DATASET_ADAPTER = TypeAdapter(Dataset)
+
+GENERATOR_NAME = "FAIR Farmland AI Metadata Extractor"
 
 class AIMetadataExtractor:
     """AI-powered metadata extractor using OpenAI Responses API with Structured Outputs"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o"):
-        """Initialize the extractor with OpenAI client"""
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY') or os.getenv('openaikey')
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable.")
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o",
+                 hedging: Optional[HedgingPolicy] = None,
+                 timings: Optional[StageTimings] = None,
+                 cascade: Optional[CascadePolicy] = None,
+                 backend: Optional[LLMBackend] = None,
+                 compact_schema: bool = False,
+                 gap_filling: Optional[GapFillPolicy] = None,
+                 bibliographic: Optional[BibliographicPolicy] = None,
+                 reference_index: Optional[ReferenceIndex] = None,
+                 credential_pool: Optional[CredentialPool] = None,
+                 standardization: Optional[StandardizationPolicy] = None):
+        """
+        Initialize the extractor with an LLM backend
         
-        self.client = OpenAI(api_key=self.api_key)
+        Args:
+            api_key: OpenAI API key (default: OPENAI_API_KEY or openaikey environment variable);
+                only used when neither a backend nor a credential pool is given
+            model: Model used for extraction
+            hedging: Optional policy for hedging slow requests with a duplicate
+            timings: Stage instrumentation to record API latencies into (default: a new recorder)
+            cascade: Optional model cascade; its top model replaces `model`
+            backend: Backend for structured-output requests (default: OpenAI Responses API)
+            compact_schema: Request the compact response format with short keys to save output tokens
+            gap_filling: Optional policy for re-querying only the fields a result is missing
+            bibliographic: Optional policy for parsing bibliographic fields locally before the request
+            reference_index: Optional offline index of bibliographic records that fills or verifies
+                journal, ISSN, volume, pages, year and authors
+            credential_pool: Optional pool of API keys; requests are spread over its least-loaded
+                keys when no backend is given, and usage is reported per key
+            standardization: Optional policy for attaching standardized access, format and country
+                categories to every dataset
+        """
+        if backend is None:
+            backend = PooledBackend(credential_pool) if credential_pool else OpenAIResponsesBackend(api_key=api_key)
+        self.backend = backend
+        self.credential_pool = credential_pool
+        self.schema = get_extraction_schema(compact=compact_schema)
         self.model = model
+        self.timings = timings or StageTimings()
+        self.hedger = HedgedCaller(hedging, self.timings) if hedging else None
+        self.cascade = cascade
+        self.cascade_stats = CascadeStats(cascade) if cascade else None
+        if cascade:
+            self.model = cascade.top_model
+        self.gap_filling = gap_filling
+        self.gap_fill_stats = GapFillStats() if gap_filling else None
+        self.bibliographic = bibliographic
+        self.reference_index = reference_index
+        self.bibliographic_stats = BibliographicStats() if bibliographic or reference_index else None
+        self.standardization = standardization
+        self.standardization_stats = StandardizationStats() if standardization else None
         
         # System prompt for comprehensive farmland metadata extraction
         self.system_prompt = """You are an expert in agricultural research data management and metadata standards. Your task is to extract comprehensive metadata from farmland research publications following Schema.org standards, with special focus on complete bibliographic information.
@@ -268,258 +356,21 @@ EXTRACTION QUALITY STANDARDS:
         - required array including ALL properties for each object
         - ensuring type field is present
         """
-        def fix_object_schema(obj):
-            if isinstance(obj, dict):
-                # If this is an object type, ensure strict validation
-                if obj.get("type") == "object":
-                    obj["additionalProperties"] = False
-                    
-                    # Ensure all properties are marked as required
-                    if "properties" in obj:
-                        # Get all property names
-                        all_properties = list(obj["properties"].keys())
-                        
-                        # Add all properties to required array
-                        obj["required"] = all_properties
-                        
-                        # Recursively fix nested objects
-                        for prop_name, prop_schema in obj["properties"].items():
-                            fix_object_schema(prop_schema)
-                
-                # Handle arrays with object items
-                if obj.get("type") == "array" and "items" in obj:
-                    fix_object_schema(obj["items"])
-                
-                # Handle oneOf, anyOf, allOf
-                for key in ["oneOf", "anyOf", "allOf"]:
-                    if key in obj:
-                        for item in obj[key]:
-                            fix_object_schema(item)
-                
-                # Recursively process all nested objects
-                for key, value in obj.items():
-                    if isinstance(value, (dict, list)) and key not in ["properties", "items", "oneOf", "anyOf", "allOf"]:
-                        fix_object_schema(value)
-            
-            elif isinstance(obj, list):
-                for item in obj:
-                    fix_object_schema(item)
-        
-        # Create a deep copy to avoid modifying the original
-        import copy
-        fixed_schema = copy.deepcopy(schema)
-        
-        # Fix the root schema
-        fix_object_schema(fixed_schema)
-        
-        return fixed_schema
+        # The registry implements the strict conversion once for all derived schemas
+        return to_strict_schema(schema)
 
-    def extract_metadata(self, markdown_text: str, source_filename: str = "") -> FarmlandMetadataExtractionResult:
+    def _build_user_input(self, markdown_text: str, source_filename: str = "") -> str:
         """
-        Extract farmland metadata from markdown text using OpenAI Responses API with structured outputs
+        Build the extraction prompt, truncating the paper content to the input budget
         
         Args:
             markdown_text: The research paper content in markdown format
             source_filename: Original filename for reference
             
         Returns:
-            FarmlandMetadataExtractionResult: Structured metadata extraction result
+            str: Complete prompt for the model
         """
-        try:
-            # Create comprehensive schema for OpenAI Responses API with enhanced scholarly metadata
-            simplified_schema = {
-                "type": "object",
-                "properties": {
-                    "reasoning": {
-                        "type": "string",
-                        "description": "Explanation of the extraction process and decisions made"
-                    },
-                    "extraction_confidence": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                        "description": "Confidence score for the extraction (0-1)"
-                    },
-                    # Enhanced article metadata
-                    "article_title": {
-                        "type": "string",
-                        "description": "Title of the scholarly article"
-                    },
-                    "authors": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "name": {"type": "string", "description": "Full name of the author"},
-                                "affiliation": {"type": "string", "description": "Institutional affiliation"},
-                                "orcid": {"type": "string", "description": "ORCID identifier if available"}
-                            },
-                            "required": ["name", "affiliation", "orcid"],
-                            "additionalProperties": False
-                        },
-                        "description": "List of authors with affiliations"
-                    },
-                    "publication_date": {
-                        "type": "string",
-                        "description": "Publication date in YYYY-MM-DD format"
-                    },
-                    "publication_year": {
-                        "type": "string",
-                        "description": "Publication year (YYYY)"
-                    },
-                    # Journal and publication details
-                    "journal_name": {
-                        "type": "string",
-                        "description": "Name of the journal or periodical"
-                    },
-                    "journal_issn": {
-                        "type": "string",
-                        "description": "ISSN of the journal"
-                    },
-                    "volume": {
-                        "type": "string",
-                        "description": "Volume number"
-                    },
-                    "issue": {
-                        "type": "string",
-                        "description": "Issue number"
-                    },
-                    "page_start": {
-                        "type": "string",
-                        "description": "Starting page number"
-                    },
-                    "page_end": {
-                        "type": "string",
-                        "description": "Ending page number"
-                    },
-                    "pagination": {
-                        "type": "string",
-                        "description": "Complete page range (e.g., '123-145')"
-                    },
-                    # Identifiers
-                    "doi": {
-                        "type": "string",
-                        "description": "Digital Object Identifier (DOI) of the article"
-                    },
-                    "pmid": {
-                        "type": "string",
-                        "description": "PubMed ID if available"
-                    },
-                    "url": {
-                        "type": "string",
-                        "description": "URL of the article"
-                    },
-                    # Content metadata
-                    "abstract": {
-                        "type": "string",
-                        "description": "Abstract or summary of the article"
-                    },
-                    "keywords": {
-                        "type": "array", 
-                        "items": {"type": "string"},
-                        "description": "Article keywords and key terms"
-                    },
-                    "subject_categories": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Subject classifications or categories"
-                    },
-                    "language": {
-                        "type": "string",
-                        "description": "Language of the article (ISO code)"
-                    },
-                    # Publisher and access
-                    "publisher": {
-                        "type": "string",
-                        "description": "Publisher name"
-                    },
-                    "license": {
-                        "type": "string",
-                        "description": "License information"
-                    },
-                    "is_open_access": {
-                        "type": "boolean",
-                        "description": "Whether the article is open access"
-                    },
-                    "funding": {
-                        "type": "string",
-                        "description": "Funding information"
-                    },
-                    # Citation
-                    "citation": {
-                        "type": "string",
-                        "description": "Formatted citation string"
-                    },
-                    # Dataset information (enhanced)
-                    "datasets_found": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "name": {"type": "string", "description": "Dataset name/title"},
-                                "description": {"type": "string", "description": "Detailed dataset description"},
-                                "location": {"type": "string", "description": "Geographic location/coverage"},
-                                "coordinates": {"type": "string", "description": "Geographic coordinates if available (lat1 lon1 lat2 lon2)"},
-                                "time_period": {"type": "string", "description": "Temporal coverage (ISO 8601 interval format)"},
-                                "variables": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {"type": "string", "description": "Variable name"},
-                                            "description": {"type": "string", "description": "Variable description"},
-                                            "unit": {"type": "string", "description": "Unit of measurement"}
-                                        },
-                                        "required": ["name", "description", "unit"],
-                                        "additionalProperties": False
-                                    },
-                                    "description": "Detailed list of variables/columns in dataset"
-                                },
-                                "is_farmland_related": {"type": "boolean", "description": "Whether this is farmland transaction/market data"},
-                                "access_info": {"type": "string", "description": "Data access information"},
-                                "license": {"type": "string", "description": "Data license"},
-                                "format": {"type": "string", "description": "Data format (CSV, JSON, etc.)"},
-                                "size": {"type": "string", "description": "Dataset size if mentioned"},
-                                "doi": {"type": "string", "description": "Dataset DOI if available"}
-                            },
-                            "required": ["name", "description", "location", "coordinates", "time_period", "variables", "is_farmland_related", "access_info", "license", "format", "size", "doi"],
-                            "additionalProperties": False
-                        },
-                        "description": "List of datasets found in the paper with comprehensive metadata"
-                    }
-                },
-                "required": [
-                    "reasoning", 
-                    "extraction_confidence", 
-                    "article_title", 
-                    "authors", 
-                    "publication_date",
-                    "publication_year",
-                    "journal_name",
-                    "journal_issn",
-                    "volume",
-                    "issue", 
-                    "page_start",
-                    "page_end",
-                    "pagination",
-                    "doi",
-                    "pmid",
-                    "url",
-                    "abstract",
-                    "keywords",
-                    "subject_categories",
-                    "language",
-                    "publisher",
-                    "license",
-                    "is_open_access", 
-                    "funding",
-                    "citation",
-                    "datasets_found"
-                ],
-                "additionalProperties": False
-            }
-
-            user_input = f"""Extract comprehensive farmland research metadata from this scientific publication:
+        return f"""Extract comprehensive farmland research metadata from this scientific publication:
 
 SOURCE: {source_filename}
 
@@ -538,184 +389,782 @@ Focus on creating high-quality, Schema.org-compliant JSON-LD metadata that can b
 
 {self.system_prompt}"""
 
-            # Use Responses API with structured outputs
-            response = self.client.responses.create(
-                model=self.model,
-                input=user_input,
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": "farmland_metadata_extraction",
-                        "schema": simplified_schema
-                    }
-                },
-                temperature=0.1,  # Low temperature for consistent results
-                max_output_tokens=16000   # Increased for comprehensive extraction
-            )
+    def _prefill(self, markdown_text: str) -> Tuple[RegisteredSchema, Optional[BibliographicRecord]]:
+        """
+        Parse bibliographic fields locally, look the paper up in the reference index and
+        derive the schema for the remaining fields
+        
+        Args:
+            markdown_text: The research paper content in markdown format
             
-            # Parse the JSON response and convert to Pydantic model structure
-            response_text = response.output[0].content[0].text
-            simplified_data = json.loads(response_text)
+        Returns:
+            Tuple: Schema to request (without the fixed fields) and the bibliographic record
+                (None if neither local parsing nor a reference index is configured)
+        """
+        if self.bibliographic is None and self.reference_index is None:
+            return self.schema, None
+        with self.timings.time("bibliographic_parse"):
+            record = parse_bibliographic(markdown_text, self.bibliographic)
+        if self.reference_index is not None:
+            keys = record
+            if self.bibliographic is None:
+                # Without local parsing the parsed values only serve as lookup keys
+                record = BibliographicRecord()
+            with self.timings.time("reference_lookup"):
+                # Only a DOI from the header is the paper's own; others may be of cited works
+                reference, matched_by = self.reference_index.lookup(
+                    doi=keys.header_doi(), title=keys.candidate("article_title"),
+                    year=keys.candidate("publication_year")
+                )
+                first_page = markdown_text[:(self.bibliographic or BibliographicPolicy()).first_page_chars]
+                if matched_by == "doi" and not describes_paper(reference, first_page):
+                    logger.info(f"Reference {reference.doi} does not match the paper's title, not applied")
+                    reference = None
+            if reference is not None:
+                apply_reference(record, reference, matched_by)
+        omit = list(record.fixed_values())
+        if self.schema.model is CompactExtractionResponse:
+            omit = [COMPACT_FIELD_NAMES[name] for name in omit]
+        return registry.subset(self.schema.name, omit), record
+
+    def _record_prefill(self, result: FarmlandMetadataExtractionResult, record: Optional[BibliographicRecord]):
+        """Count the locally fixed fields of a finished result"""
+        if record is not None and result.field_provenance is not None:
+            self.bibliographic_stats.record(record, result.field_provenance)
+
+    def _create_response(self, user_input: str, schema: RegisteredSchema, timeout: Optional[float] = None,
+                         model: Optional[str] = None) -> LLMResponse:
+        """
+        Send one structured-output request through the backend
+        
+        Args:
+            user_input: Complete prompt for the model
+            schema: Registered strict schema for the structured output
+            timeout: Seconds before the request is cancelled (None = backend default)
+            model: Model to use (default: the extractor's model)
             
-            # Convert simplified response to comprehensive Pydantic model structure
-            datasets = []
-            for dataset_data in simplified_data.get('datasets_found', []):
-                # Create variable measurements from enhanced variables list
-                variables = []
-                for var_data in dataset_data.get('variables', []):
-                    if isinstance(var_data, dict):
-                        variables.append(PropertyValue(
-                            property_id=var_data.get('name', '').lower().replace(' ', '_'),
-                            name=var_data.get('name', ''),
-                            description=var_data.get('description', ''),
-                            unit_text=var_data.get('unit', '')
-                        ))
-                    else:
-                        # Handle string format (fallback)
-                        variables.append(PropertyValue(
-                            property_id=str(var_data).lower().replace(' ', '_'),
-                            name=str(var_data),
-                            description=f"Variable: {var_data}"
-                        ))
-                
-                # Create enhanced spatial coverage with coordinates
-                spatial_coverage = None
-                if dataset_data.get('location'):
-                    geo_shape = None
-                    if dataset_data.get('coordinates'):
-                        geo_shape = GeoShape(box=dataset_data['coordinates'])
-                    
-                    spatial_coverage = Place(
-                        name=dataset_data['location'],
-                        geo=geo_shape,
-                        address_country="DE"  # Assume Germany for farmland data
+        Returns:
+            LLMResponse: Response returned by the backend
+        """
+        return self.backend.create_structured_response(
+            model=model or self.model,
+            input_text=user_input,
+            schema=schema.schema,
+            schema_name=schema.name,
+            temperature=0.1,  # Low temperature for consistent results
+            max_output_tokens=16000,   # Increased for comprehensive extraction
+            timeout=timeout
+        )
+
+    @staticmethod
+    def _is_valid_response(response: LLMResponse) -> bool:
+        """Check that a response carries parseable structured output"""
+        try:
+            json.loads(response.text)
+            return True
+        except Exception:
+            return False
+
+    def _request_response(self, user_input: str, schema: RegisteredSchema, timeout: Optional[float] = None,
+                          model: Optional[str] = None) -> LLMResponse:
+        """
+        Issue the extraction request, hedged if a hedging policy is configured
+        
+        Args:
+            user_input: Complete prompt for the model
+            schema: Registered strict schema for the structured output
+            timeout: Seconds before the request is cancelled (None = backend default)
+            model: Model to use (default: the extractor's model)
+            
+        Returns:
+            LLMResponse: Response of the first valid request
+        """
+        with self.timings.time("api_call"):
+            if self.hedger is None:
+                return self._create_response(user_input, schema, timeout=timeout, model=model)
+            return self.hedger.call(
+                lambda remaining: self._create_response(user_input, schema, timeout=remaining, model=model),
+                timeout=timeout,
+                is_valid=self._is_valid_response,
+                model=model or self.model
+            )
+
+    def _processing_notes(self, markdown_text: str, model_used: str) -> List[str]:
+        """Processing notes attached to every successful extraction result"""
+        return [
+            f"Processed at {datetime.now().isoformat()}",
+            f"Model: {model_used}",
+            f"Content length: {len(markdown_text)} characters",
+            f"API: {self.backend.description}"
+        ]
+
+    @staticmethod
+    def _dataset_entry_to_data(dataset: DatasetEntry) -> Dict[str, Any]:
+        """Map a validated dataset entry onto the field layout of Dataset"""
+        spatial_coverage = None
+        if dataset.location:
+            spatial_coverage = {
+                "name": dataset.location,
+                "geo": {"box": dataset.coordinates} if dataset.coordinates else None,
+                "address_country": "DE"  # Assume Germany for farmland data
+            }
+        return {
+            "name": dataset.name,
+            "description": dataset.description,
+            "spatial_coverage": spatial_coverage,
+            "temporal_coverage": dataset.time_period,
+            "variable_measured": [
+                {
+                    "property_id": variable.name.lower().replace(' ', '_'),
+                    "name": variable.name,
+                    "description": variable.description,
+                    "unit_text": variable.unit
+                }
+                for variable in dataset.variables
+            ],
+            "license": dataset.license,
+            "conditions_of_access": dataset.access_info,
+            "keywords": ['farmland'] if dataset.is_farmland_related else [],
+            "encoding_format": dataset.format,
+            "content_size": dataset.size,
+            "identifier": dataset.doi
+        }
+
+    @classmethod
+    def _response_to_result_data(cls, response: ExtractionResponse) -> Dict[str, Any]:
+        """
+        Map a validated response onto the field layout of FarmlandMetadataExtractionResult
+        
+        Mirrors _build_result field for field, but produces plain dicts that are validated
+        in a single compiled call instead of constructing every nested model separately.
+        """
+        datasets = [cls._dataset_entry_to_data(dataset) for dataset in response.datasets_found]
+        
+        publisher = {"name": response.publisher} if response.publisher else None
+        journal = None
+        if response.journal_name:
+            journal = {"name": response.journal_name, "issn": response.journal_issn, "publisher": publisher}
+        
+        scholarly_article = {
+            "name": response.article_title,
+            "author": [
+                {"name": author.name, "affiliation": author.affiliation, "identifier": author.orcid}
+                for author in response.authors
+            ],
+            "date_published": response.publication_date,
+            "publication_year": response.publication_year,
+            "is_part_of": journal,
+            "publication_volume": response.volume,
+            "publication_issue": response.issue,
+            "page_start": response.page_start,
+            "page_end": response.page_end,
+            "pagination": response.pagination,
+            "doi": response.doi,
+            "identifier": response.doi,
+            "pmid": response.pmid,
+            "url": response.url,
+            "abstract": response.abstract,
+            "keywords": response.keywords,
+            "subject": response.subject_categories,
+            "in_language": response.language,
+            "publisher": publisher,
+            "license": response.license,
+            "is_accessible_for_free": response.is_open_access,
+            "funding": response.funding,
+            "citation": response.citation,
+            "dataset": datasets
+        }
+        return {
+            "reasoning": response.reasoning,
+            "scholarly_article": scholarly_article,
+            "extraction_confidence": response.extraction_confidence
+        }
+
+    def _complete_response(self, response: Any, record: Optional[BibliographicRecord] = None) -> ExtractionResponse:
+        """
+        Bring a validated response of any format into the full format, applying locally fixed fields
+        
+        Papers not found in the reference index before the request are looked up again with
+        the DOI and title the model returned; a match then verifies (and overrides) the
+        model's bibliographic values.
+        """
+        if isinstance(response, SubsetResponse):
+            response = response.restore()
+        if isinstance(response, CompactExtractionResponse):
+            response = response.expand()
+        if record is not None:
+            if self.reference_index is not None and record.reference_matched_by is None:
+                with self.timings.time("reference_lookup"):
+                    reference, matched_by = self.reference_index.lookup(
+                        doi=response.doi, title=response.article_title, year=response.publication_year
                     )
-                
-                # Create enhanced dataset
-                dataset = Dataset(
-                    name=dataset_data['name'],
-                    description=dataset_data['description'],
-                    spatial_coverage=spatial_coverage,
-                    temporal_coverage=dataset_data.get('time_period'),
-                    variable_measured=variables,
-                    license=dataset_data.get('license'),
-                    conditions_of_access=dataset_data.get('access_info'),
-                    keywords=['farmland'] if dataset_data.get('is_farmland_related') else [],
-                    encoding_format=dataset_data.get('format'),
-                    content_size=dataset_data.get('size'),
-                    identifier=dataset_data.get('doi')
-                )
-                datasets.append(dataset)
+                if reference is not None:
+                    apply_reference(record, reference, matched_by, response=response)
+            response = response.model_copy(update=record.fixed_values())
+        return response
+
+    def _validate_response(self, response_text: Union[str, bytes], schema: RegisteredSchema,
+                           record: Optional[BibliographicRecord] = None) -> Optional[ExtractionResponse]:
+        """
+        Parse and validate raw response JSON against the response model in one compiled step
+        
+        Args:
+            response_text: Raw JSON returned by the model
+            schema: Schema the response was produced with
+            record: Locally parsed bibliographic fields left out of the schema
+            
+        Returns:
+            Optional[ExtractionResponse]: Response in the full format, or None if a full-format
+                payload does not conform (e.g. cached responses of older formats)
+        """
+        try:
+            response = schema.adapter.validate_json(response_text)
+        except ValidationError:
+            if schema.model is not ExtractionResponse:
+                raise
+            return None
+        return self._complete_response(response, record)
+
+    def _result_from_response(self, response: ExtractionResponse, markdown_text: str,
+                              model_used: str, schema: RegisteredSchema,
+                              record: Optional[BibliographicRecord] = None) -> FarmlandMetadataExtractionResult:
+        """Build the result from a validated response with a single compiled validation"""
+        result_data = self._response_to_result_data(response)
+        result_data["processing_notes"] = self._processing_notes(markdown_text, model_used)
+        result_data["response_schema"] = schema.stamp()
+        if record is not None:
+            result_data["field_provenance"] = record.provenance(response)
+        return RESULT_ADAPTER.validate_python(result_data)
+
+    def build_result_from_json(self, response_text: Union[str, bytes], markdown_text: str,
+                               source_filename: str, model_used: str,
+                               schema: Optional[RegisteredSchema] = None,
+                               record: Optional[BibliographicRecord] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Convert raw response JSON into the result models using compiled validation
+        
+        The response is parsed and validated against the response model in one step and the
+        mapped result is validated in a second one. Compact responses are expanded to the full
+        format first. Full-format payloads that do not conform to the response model take the
+        tolerant _build_result path instead.
+        
+        Args:
+            response_text: Raw JSON returned by the model
+            markdown_text: The research paper content the response was produced from
+            source_filename: Original filename for reference
+            model_used: Model that produced the response
+            schema: Schema the response was produced with (default: the extractor's schema)
+            record: Locally parsed bibliographic fields left out of the schema
+            
+        Returns:
+            FarmlandMetadataExtractionResult: Structured metadata extraction result
+        """
+        schema = schema or self.schema
+        response = self._validate_response(response_text, schema, record)
+        if response is None:
+            return self._build_result(json.loads(response_text), markdown_text, source_filename, model_used, schema)
+        return self._result_from_response(response, markdown_text, model_used, schema, record)
+
+    def _build_result(self, simplified_data: Dict[str, Any], markdown_text: str,
+                      source_filename: str, model_used: str,
+                      schema: Optional[RegisteredSchema] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Convert the parsed structured output into the Pydantic result models
+        
+        Args:
+            simplified_data: Parsed JSON returned by the model
+            markdown_text: The research paper content the response was produced from
+            source_filename: Original filename for reference
+            model_used: Model that produced the response
+            schema: Schema the response was produced with (default: the extractor's schema)
             
-            # Create enhanced authors list with affiliations
-            authors = []
-            for author_data in simplified_data.get('authors', []):
-                if isinstance(author_data, dict):
-                    authors.append(Person(
-                        name=author_data.get('name', ''),
-                        affiliation=author_data.get('affiliation', ''),
-                        identifier=author_data.get('orcid', '')
+        Returns:
+            FarmlandMetadataExtractionResult: Structured metadata extraction result
+        """
+        # Convert simplified response to comprehensive Pydantic model structure
+        datasets = []
+        for dataset_data in simplified_data.get('datasets_found', []):
+            # Create variable measurements from enhanced variables list
+            variables = []
+            for var_data in dataset_data.get('variables', []):
+                if isinstance(var_data, dict):
+                    variables.append(PropertyValue(
+                        property_id=var_data.get('name', '').lower().replace(' ', '_'),
+                        name=var_data.get('name', ''),
+                        description=var_data.get('description', ''),
+                        unit_text=var_data.get('unit', '')
                     ))
                 else:
                     # Handle string format (fallback)
-                    authors.append(Person(name=str(author_data)))
+                    variables.append(PropertyValue(
+                        property_id=str(var_data).lower().replace(' ', '_'),
+                        name=str(var_data),
+                        description=f"Variable: {var_data}"
+                    ))
             
-            # Create journal/periodical information
-            journal = None
-            if simplified_data.get('journal_name'):
-                publisher_org = None
-                if simplified_data.get('publisher'):
-                    publisher_org = Organization(name=simplified_data['publisher'])
+            # Create enhanced spatial coverage with coordinates
+            spatial_coverage = None
+            if dataset_data.get('location'):
+                geo_shape = None
+                if dataset_data.get('coordinates'):
+                    geo_shape = GeoShape(box=dataset_data['coordinates'])
                 
-                journal = Periodical(
-                    name=simplified_data['journal_name'],
-                    issn=simplified_data.get('journal_issn'),
-                    publisher=publisher_org
+                spatial_coverage = Place(
+                    name=dataset_data['location'],
+                    geo=geo_shape,
+                    address_country="DE"  # Assume Germany for farmland data
                 )
             
-            # Create comprehensive scholarly article
-            scholarly_article = ScholarlyArticle(
-                name=simplified_data.get('article_title', 'Unknown Title'),
-                author=authors,
-                date_published=simplified_data.get('publication_date'),
-                publication_year=simplified_data.get('publication_year'),
-                is_part_of=journal,
-                publication_volume=simplified_data.get('volume'),
-                publication_issue=simplified_data.get('issue'),
-                page_start=simplified_data.get('page_start'),
-                page_end=simplified_data.get('page_end'),
-                pagination=simplified_data.get('pagination'),
-                doi=simplified_data.get('doi'),
-                identifier=simplified_data.get('doi'),  # Use DOI as main identifier
-                pmid=simplified_data.get('pmid'),
-                url=simplified_data.get('url'),
-                abstract=simplified_data.get('abstract'),
-                keywords=simplified_data.get('keywords', []),
-                subject=simplified_data.get('subject_categories', []),
-                in_language=simplified_data.get('language', 'en'),
-                publisher=Organization(name=simplified_data['publisher']) if simplified_data.get('publisher') else None,
-                license=simplified_data.get('license'),
-                is_accessible_for_free=simplified_data.get('is_open_access'),
-                funding=simplified_data.get('funding'),
-                citation=simplified_data.get('citation'),
-                dataset=datasets
+            # Create enhanced dataset
+            dataset = Dataset(
+                name=dataset_data['name'],
+                description=dataset_data['description'],
+                spatial_coverage=spatial_coverage,
+                temporal_coverage=dataset_data.get('time_period'),
+                variable_measured=variables,
+                license=dataset_data.get('license'),
+                conditions_of_access=dataset_data.get('access_info'),
+                keywords=['farmland'] if dataset_data.get('is_farmland_related') else [],
+                encoding_format=dataset_data.get('format'),
+                content_size=dataset_data.get('size'),
+                identifier=dataset_data.get('doi')
             )
+            datasets.append(dataset)
+        
+        # Create enhanced authors list with affiliations
+        authors = []
+        for author_data in simplified_data.get('authors', []):
+            if isinstance(author_data, dict):
+                authors.append(Person(
+                    name=author_data.get('name', ''),
+                    affiliation=author_data.get('affiliation', ''),
+                    identifier=author_data.get('orcid', '')
+                ))
+            else:
+                # Handle string format (fallback)
+                authors.append(Person(name=str(author_data)))
+        
+        # Create journal/periodical information
+        journal = None
+        if simplified_data.get('journal_name'):
+            publisher_org = None
+            if simplified_data.get('publisher'):
+                publisher_org = Organization(name=simplified_data['publisher'])
             
-            # Create result
-            result = FarmlandMetadataExtractionResult(
-                reasoning=simplified_data.get('reasoning', 'Extraction completed'),
-                scholarly_article=scholarly_article,
-                extraction_confidence=simplified_data.get('extraction_confidence', 0.0),
-                processing_notes=[]
+            journal = Periodical(
+                name=simplified_data['journal_name'],
+                issn=simplified_data.get('journal_issn'),
+                publisher=publisher_org
             )
+        
+        # Create comprehensive scholarly article
+        scholarly_article = ScholarlyArticle(
+            name=simplified_data.get('article_title', 'Unknown Title'),
+            author=authors,
+            date_published=simplified_data.get('publication_date'),
+            publication_year=simplified_data.get('publication_year'),
+            is_part_of=journal,
+            publication_volume=simplified_data.get('volume'),
+            publication_issue=simplified_data.get('issue'),
+            page_start=simplified_data.get('page_start'),
+            page_end=simplified_data.get('page_end'),
+            pagination=simplified_data.get('pagination'),
+            doi=simplified_data.get('doi'),
+            identifier=simplified_data.get('doi'),  # Use DOI as main identifier
+            pmid=simplified_data.get('pmid'),
+            url=simplified_data.get('url'),
+            abstract=simplified_data.get('abstract'),
+            keywords=simplified_data.get('keywords', []),
+            subject=simplified_data.get('subject_categories', []),
+            in_language=simplified_data.get('language', 'en'),
+            publisher=Organization(name=simplified_data['publisher']) if simplified_data.get('publisher') else None,
+            license=simplified_data.get('license'),
+            is_accessible_for_free=simplified_data.get('is_open_access'),
+            funding=simplified_data.get('funding'),
+            citation=simplified_data.get('citation'),
+            dataset=datasets
+        )
+        
+        # Create result
+        result = FarmlandMetadataExtractionResult(
+            reasoning=simplified_data.get('reasoning', 'Extraction completed'),
+            scholarly_article=scholarly_article,
+            extraction_confidence=simplified_data.get('extraction_confidence', 0.0),
+            processing_notes=[],
+            response_schema=(schema or self.schema).stamp()
+        )
+        
+        # Add processing info to notes
+        result.processing_notes.extend(self._processing_notes(markdown_text, model_used))
+        
+        return result
+
+    def _extract_with_cascade(self, user_input: str, schema: RegisteredSchema, markdown_text: str,
+                              source_filename: str, timeout: Optional[float] = None,
+                              record: Optional[BibliographicRecord] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Run the extraction through the model cascade, escalating untrustworthy results
+        
+        Args:
+            user_input: Prepared prompt, reused unchanged for every model
+            schema: Registered strict schema for the structured output
+            markdown_text: The research paper content
+            source_filename: Original filename for reference
+            timeout: Seconds available for all cascade steps together (None = no limit)
+            record: Locally parsed bibliographic fields left out of the schema
             
-            # Add processing metadata
-            processing_info = {
-                "processed_at": datetime.now().isoformat(),
-                "source_filename": source_filename,
-                "model_used": self.model,
-                "content_length": len(markdown_text),
-                "extraction_method": "OpenAI Responses API with Structured Outputs"
+        Returns:
+            FarmlandMetadataExtractionResult: Result of the first acceptable model (or the top model)
+        """
+        deadline = Deadline(timeout)
+        attempts = []
+        
+        for index, model in enumerate(self.cascade.models):
+            is_top_model = index == len(self.cascade.models) - 1
+            deadline.check("extraction")
+            
+            start = time.perf_counter()
+            try:
+                response = self._request_response(user_input, schema, timeout=deadline.budget(), model=model)
+            except TimeoutError:
+                raise
+            except Exception as e:
+                # API errors and refusals of a cheaper model escalate like an untrustworthy result
+                attempts.append({
+                    "model": model,
+                    "latency_seconds": time.perf_counter() - start,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "escalation_reason": None if is_top_model else "backend_error"
+                })
+                if is_top_model:
+                    self.cascade_stats.record(attempts)
+                    raise
+                logger.info(f"Escalating {source_filename} from {model} (backend_error: {str(e)})")
+                continue
+            attempt = {
+                "model": model,
+                "latency_seconds": time.perf_counter() - start,
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+                "escalation_reason": None
             }
+            attempts.append(attempt)
             
-            # Add processing info to notes
-            result.processing_notes.append(f"Processed at {processing_info['processed_at']}")
-            result.processing_notes.append(f"Model: {processing_info['model_used']}")
-            result.processing_notes.append(f"Content length: {processing_info['content_length']} characters")
-            result.processing_notes.append(f"API: OpenAI Responses API with structured outputs")
+            try:
+                response_data = self._validate_response(response.text, schema, record)
+                if response_data is None:
+                    response_data = json.loads(response.text)
+                    result = self._build_result(response_data, markdown_text, source_filename, model, schema)
+                else:
+                    result = self._result_from_response(response_data, markdown_text, model, schema, record)
+                    response_data = response_data.__dict__
+                reason = escalation_reason(response_data, self.cascade)
+            except (json.JSONDecodeError, ValidationError, KeyError, TypeError) as e:
+                if is_top_model:
+                    self.cascade_stats.record(attempts)
+                    raise
+                result = None
+                reason = "schema_validation_failed"
+                logger.info(f"Response of {model} failed validation for {source_filename}: {str(e)}")
+            
+            # Only a built result ends the cascade; failures of the top model have raised above
+            if result is not None and (reason is None or is_top_model):
+                self.cascade_stats.record(attempts)
+                result.processing_notes.append(f"Cascade: {' -> '.join(a['model'] for a in attempts)}")
+                return result
+            
+            attempt["escalation_reason"] = reason
+            logger.info(f"Escalating {source_filename} from {model} ({reason})")
+
+    def extract_metadata(self, markdown_text: str, source_filename: str = "",
+                         timeout: Optional[float] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Extract farmland metadata from markdown text using OpenAI Responses API with structured outputs
+        
+        Args:
+            markdown_text: The research paper content in markdown format
+            source_filename: Original filename for reference
+            timeout: Seconds the API call may take before it is cancelled (None = no limit)
+            
+        Returns:
+            FarmlandMetadataExtractionResult: Structured metadata extraction result
+            
+        Raises:
+            StageTimeoutError: If the API call exceeded the timeout
+        """
+        try:
+            user_input = self._build_user_input(markdown_text, source_filename)
+            deadline = Deadline(timeout)
+
+            # Use Responses API with structured outputs
+            if timeout is not None and timeout <= 0:
+                raise StageTimeoutError("extraction", timeout)
+            schema, record = self._prefill(markdown_text)
+            reference_tokens = None
+            if self.cascade is None:
+                response = self._request_response(user_input, schema, timeout=timeout)
+                reference_tokens = response.usage.total_tokens
+                
+                # Parse the JSON response straight into the Pydantic model structure
+                result = self.build_result_from_json(response.text, markdown_text, source_filename, self.model,
+                                                     schema, record)
+            else:
+                result = self._extract_with_cascade(user_input, schema, markdown_text,
+                                                    source_filename, timeout=timeout, record=record)
+            self._record_prefill(result, record)
+            
+            if self.gap_filling is not None:
+                result = self.fill_gaps(result, markdown_text, source_filename,
+                                        timeout=deadline.budget(), reference_tokens=reference_tokens)
+            if self.standardization is not None:
+                self.standardize_datasets(result)
             
             logger.info(f"Successfully extracted metadata from {source_filename}")
             return result
             
+        except StageTimeoutError:
+            raise
+        except BackendTimeoutError as e:
+            logger.error(f"Extraction timed out for {source_filename} after {timeout}s")
+            raise StageTimeoutError("extraction", timeout) from e
         except Exception as e:
             logger.error(f"Error extracting metadata from {source_filename}: {str(e)}")
+            return self._error_result(source_filename, e)
+
+    @staticmethod
+    def _error_result(source_filename: str, error: Exception) -> FarmlandMetadataExtractionResult:
+        """Error result with minimal valid structure"""
+        return FarmlandMetadataExtractionResult(
+            reasoning=f"Extraction failed due to error: {str(error)}",
+            scholarly_article=ScholarlyArticle(
+                name=f"Error processing {source_filename}",
+                author=[Person(name="Processing Error")],
+                date_published=datetime.now().strftime("%Y-%m-%d")
+            ),
+            extraction_confidence=0.0,
+            processing_notes=[f"Error: {str(error)}"]
+        )
+
+    def _streamed_article(self, members: Dict[str, Any], schema: Optional[RegisteredSchema] = None,
+                          record: Optional[BibliographicRecord] = None) -> Dict[str, Any]:
+        """
+        Render the article-level members received so far as JSON-LD (without datasets)
+        
+        Args:
+            members: Completed top-level members of the streamed response
+            schema: Schema the response is produced with (default: the extractor's schema)
+            record: Locally parsed bibliographic fields left out of the schema
             
-            # Return error result with minimal valid structure
-            error_result = FarmlandMetadataExtractionResult(
-                reasoning=f"Extraction failed due to error: {str(e)}",
-                scholarly_article=ScholarlyArticle(
-                    name=f"Error processing {source_filename}",
-                    author=[Person(name="Processing Error")],
-                    date_published=datetime.now().strftime("%Y-%m-%d")
-                ),
-                extraction_confidence=0.0,
-                processing_notes=[f"Error: {str(e)}"]
-            )
-            return error_result
+        Returns:
+            Dict: Article JSON-LD with the extraction confidence and reasoning
+        """
+        schema = schema or self.schema
+        response = schema.adapter.validate_python({**members, schema.model.dataset_field: []})
+        response = self._complete_response(response, record)
+        result_data = self._response_to_result_data(response)
+        article = ARTICLE_ADAPTER.validate_python(result_data["scholarly_article"])
+        jsonld_data = ARTICLE_ADAPTER.dump_python(article, by_alias=True, exclude_none=True)
+        jsonld_data.pop("dataset", None)
+        return {
+            "scholarly_article": jsonld_data,
+            "extraction_confidence": result_data["extraction_confidence"],
+            "reasoning": result_data["reasoning"]
+        }
 
-    def extract_to_jsonld(self, markdown_text: str, source_filename: str = "") -> Dict[str, Any]:
+    def _streamed_dataset(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Render one streamed dataset element as Dataset JSON-LD"""
+        entry = self.schema.dataset_adapter.validate_python(item)
+        if not isinstance(entry, DatasetEntry):
+            entry = entry.expand()
+        dataset = DATASET_ADAPTER.validate_python(self._dataset_entry_to_data(entry))
+        dataset_data = DATASET_ADAPTER.dump_python(dataset, exclude_none=True)
+        if self.standardization is not None:
+            dataset_data["standardized"] = standardize_dataset(dataset_data, self.standardization)
+        return dataset_data
+
+    def extract_metadata_streaming(self, markdown_text: str, source_filename: str = "",
+                                   on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                                   timeout: Optional[float] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Extract metadata from a streamed response, emitting partial results as they arrive
+        
+        The response is parsed incrementally. As soon as all article-level fields are in,
+        on_event("article", ...) receives the article JSON-LD; every completed dataset is
+        passed to on_event("dataset", ...) immediately. The whole document is validated once
+        the stream ends, followed by on_event("complete", ...) or on_event("failed", ...).
+        Streamed requests use the extractor's model and are neither hedged nor cascaded.
+        
+        Args:
+            markdown_text: The research paper content in markdown format
+            source_filename: Original filename for reference
+            on_event: Callback receiving (event name, payload) for partial results
+            timeout: Seconds the streamed API call may take before it is cancelled (None = no limit)
+            
+        Returns:
+            FarmlandMetadataExtractionResult: Result built from the fully validated document
+            
+        Raises:
+            StageTimeoutError: If the API call exceeded the timeout
+        """
+        emit = on_event or (lambda event, data: None)
+        schema, record = self._prefill(markdown_text)
+        dataset_field = schema.model.dataset_field
+        parser = IncrementalJSONParser(array_keys=[dataset_field])
+        members: Dict[str, Any] = {}
+        
+        def handle_delta(delta: str):
+            for event in parser.feed(delta):
+                try:
+                    if event.kind == "member":
+                        members[event.key] = event.value
+                    elif event.kind == "array_start":
+                        emit("article", self._streamed_article(members, schema, record))
+                    elif event.kind == "item":
+                        emit("dataset", {"index": event.index, "dataset": self._streamed_dataset(event.value)})
+                except (ValidationError, KeyError, TypeError) as e:
+                    # Partial results are best effort; the final validation decides
+                    logger.warning(f"Skipping partial {event.kind} of {source_filename}: {str(e)}")
+        
+        try:
+            if timeout is not None and timeout <= 0:
+                raise StageTimeoutError("extraction", timeout)
+            user_input = self._build_user_input(markdown_text, source_filename)
+            deadline = Deadline(timeout)
+            with self.timings.time("api_call"):
+                response = self.backend.stream_structured_response(
+                    self.model, user_input, schema.schema, schema.name, handle_delta,
+                    temperature=0.1, max_output_tokens=16000, timeout=timeout
+                )
+            result = self.build_result_from_json(response.text, markdown_text, source_filename, self.model,
+                                                 schema, record)
+            self._record_prefill(result, record)
+            if self.gap_filling is not None:
+                result = self.fill_gaps(result, markdown_text, source_filename,
+                                        timeout=deadline.budget(), reference_tokens=response.usage.total_tokens)
+            if self.standardization is not None:
+                self.standardize_datasets(result)
+            
+            logger.info(f"Successfully extracted metadata from {source_filename} (streamed)")
+            emit("complete", {
+                "extraction_confidence": result.extraction_confidence,
+                "datasets_found": len(result.scholarly_article.dataset)
+            })
+            return result
+            
+        except StageTimeoutError:
+            emit("failed", {"error": "timeout"})
+            raise
+        except BackendTimeoutError as e:
+            logger.error(f"Extraction timed out for {source_filename} after {timeout}s")
+            emit("failed", {"error": "timeout"})
+            raise StageTimeoutError("extraction", timeout) from e
+        except Exception as e:
+            logger.error(f"Error extracting metadata from {source_filename}: {str(e)}")
+            emit("failed", {"error": str(e)})
+            return self._error_result(source_filename, e)
+
+    def fill_gaps(self, result: FarmlandMetadataExtractionResult, markdown_text: str, source_filename: str = "",
+                  timeout: Optional[float] = None,
+                  reference_tokens: Optional[int] = None) -> FarmlandMetadataExtractionResult:
+        """
+        Re-query only the fields an extraction result is missing and merge the answers back
+        
+        The follow-up request uses a schema with just the missing fields (article DOI,
+        dataset temporal coverage, variable units) and sends only the passages of the paper
+        most likely to state them. Failures leave the result unchanged.
+        
+        Args:
+            result: Result of a full extraction (updated in place)
+            markdown_text: The research paper content
+            source_filename: Original filename for reference
+            timeout: Seconds the follow-up request may take (None = no limit)
+            reference_tokens: Tokens of the full extraction, for the token comparison in the stats
+            
+        Returns:
+            FarmlandMetadataExtractionResult: The result with the filled fields
+        """
+        policy = self.gap_filling or GapFillPolicy()
+        gaps = find_gaps(result.scholarly_article, policy)
+        if not gaps:
+            return result
+        if timeout is not None and timeout <= 0:
+            logger.info(f"No time left to fill {len(gaps)} missing fields of {source_filename}")
+            return result
+        
+        passages = select_passages(split_passages(markdown_text, policy.passage_chars), gaps, policy.max_passages)
+        schema = build_gap_schema(gaps)
+        prompt = build_gap_prompt(gaps, passages, source_filename)
+        
+        try:
+            # Sent directly: the short follow-up must not be hedged or mixed into the api_call
+            # latencies the hedge delay is learned from
+            with self.timings.time("gap_filling"):
+                response = self._create_response(prompt, schema, timeout=timeout, model=policy.model or self.model)
+            answers = schema.adapter.validate_json(response.text).model_dump()
+        except Exception as e:
+            logger.warning(f"Gap filling failed for {source_filename}: {str(e)}")
+            result.processing_notes.append(f"Gap filling failed: {str(e)}")
+            return result
+        
+        article_data = result.scholarly_article.model_dump(by_alias=True)
+        filled = merge_answers(article_data, gaps, answers)
+        if filled:
+            result.scholarly_article = ARTICLE_ADAPTER.validate_python(article_data)
+        
+        if self.gap_fill_stats is not None:
+            self.gap_fill_stats.record(gaps, filled, response.usage.input_tokens, response.usage.output_tokens,
+                                       reference_tokens=reference_tokens)
+        result.processing_notes.append(
+            f"Gap filling: {len(filled)} of {len(gaps)} missing fields filled from {len(passages)} passages "
+            f"({response.usage.total_tokens} tokens)"
+        )
+        logger.info(f"Filled {len(filled)} of {len(gaps)} missing fields of {source_filename}")
+        return result
+
+    def standardize_datasets(self, result: FarmlandMetadataExtractionResult) -> FarmlandMetadataExtractionResult:
+        """
+        Attach raw and standardized access, format and country categories to every dataset
+        
+        Args:
+            result: Extraction result (updated in place)
+            
+        Returns:
+            FarmlandMetadataExtractionResult: The result with `standardized` set on its datasets
+        """
+        policy = self.standardization or StandardizationPolicy()
+        for dataset in result.scholarly_article.dataset:
+            dataset.standardized = standardize_dataset(dataset.model_dump(exclude_none=True), policy)
+            if self.standardization_stats is not None:
+                self.standardization_stats.record(dataset.standardized)
+        return result
+
+    def extract_to_jsonld(self, markdown_text: str, source_filename: str = "",
+                          timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Extract metadata and return as JSON-LD dictionary
         
         Args:
             markdown_text: The research paper content
             source_filename: Original filename for reference
+            timeout: Seconds the API call may take before it is cancelled (None = no limit)
             
         Returns:
             Dict: JSON-LD formatted metadata
         """
-        result = self.extract_metadata(markdown_text, source_filename)
+        result = self.extract_metadata(markdown_text, source_filename, timeout=timeout)
+        return self.result_to_jsonld(result)
+
+    def result_to_jsonld(self, result: FarmlandMetadataExtractionResult) -> Dict[str, Any]:
+        """
+        Convert an existing extraction result to a JSON-LD dictionary without calling the API again
         
+        Args:
+            result: Result returned by extract_metadata
+            
+        Returns:
+            Dict: JSON-LD formatted metadata
+        """
         # Convert Pydantic model to JSON-LD compatible dictionary
         jsonld_data = result.scholarly_article.model_dump(by_alias=True, exclude_none=True)
         
@@ -725,11 +1174,44 @@ Focus on creating high-quality, Schema.org-compliant JSON-LD metadata that can b
             "confidence": result.extraction_confidence,
             "processing_notes": result.processing_notes,
             "generated_at": datetime.now().isoformat(),
-            "generator": "FAIR Farmland AI Metadata Extractor"
+            "generator": GENERATOR_NAME
         }
+        if result.response_schema:
+            jsonld_data["extraction_metadata"]["response_schema"] = result.response_schema
+        if result.field_provenance:
+            jsonld_data["extraction_metadata"]["field_provenance"] = result.field_provenance
         
         return jsonld_data
 
+    def result_to_jsonld_bytes(self, result: FarmlandMetadataExtractionResult) -> bytes:
+        """
+        Render an extraction result directly to indented JSON-LD bytes
+        
+        Produces the same document as json.dumps(result_to_jsonld(result), indent=2,
+        ensure_ascii=False), serialized by the compiled Pydantic serializer.
+        
+        Args:
+            result: Result returned by extract_metadata
+            
+        Returns:
+            bytes: UTF-8 encoded JSON-LD document
+        """
+        article = result.scholarly_article
+        document = ScholarlyArticleDocument.model_construct(
+            _fields_set=article.model_fields_set | {"extraction_metadata"},
+            **article.__dict__,
+            extraction_metadata=ExtractionMetadata(
+                reasoning=result.reasoning,
+                confidence=result.extraction_confidence,
+                processing_notes=result.processing_notes,
+                generated_at=datetime.now().isoformat(),
+                generator=GENERATOR_NAME,
+                response_schema=result.response_schema,
+                field_provenance=result.field_provenance
+            )
+        )
+        return DOCUMENT_ADAPTER.dump_json(document, indent=2, by_alias=True, exclude_none=True)
+
     def batch_extract_from_directory(self, 
                                    markdown_dir: Union[str, Path], 
                                    output_dir: Union[str, Path],
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Model Cascade for Cost-Efficient Extraction
+
+Papers are first sent to a cheap model; the request is escalated to the next model in
+the cascade only when the result is not trustworthy (low extraction confidence, empty
+required fields, or a response that fails schema validation) or the request failed with
+a backend error other than a timeout. Every escalated call reuses
+the same prepared input. Statistics compare the realized cost and latency against
+always using the top model.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Approximate list prices in USD per 1M tokens as (input, output)
+DEFAULT_MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40)
+}
+
+
+@dataclass
+class CascadePolicy:
+    """
+    Configuration for the model cascade
+
+    Attributes:
+        models: Models in escalation order, cheapest first; the last one is the top model
+        min_confidence: Results with a lower extraction_confidence are escalated
+        required_fields: Response fields that must be non-empty to accept a result
+        pricing: USD per 1M tokens as (input, output) per model
+    """
+    models: List[str] = field(default_factory=lambda: ["gpt-4o-mini", "gpt-4o"])
+    min_confidence: float = 0.7
+    required_fields: List[str] = field(default_factory=lambda: ["article_title", "authors"])
+    pricing: Dict[str, Tuple[float, float]] = field(default_factory=lambda: dict(DEFAULT_MODEL_PRICING))
+
+    def __post_init__(self):
+        if not self.models:
+            raise ValueError("A model cascade needs at least one model")
+
+    @property
+    def top_model(self) -> str:
+        """The most capable model, used as the baseline for savings"""
+        return self.models[-1]
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+        """Cost of a request in USD, None if the model has no price"""
+        if model not in self.pricing:
+            return None
+        input_price, output_price = self.pricing[model]
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def escalation_reason(response_data: Dict[str, Any], policy: CascadePolicy) -> Optional[str]:
+    """
+    Decide whether a parsed response should be escalated to the next model
+
+    Args:
+        response_data: Parsed structured output of the model
+        policy: Cascade configuration
+
+    Returns:
+        Optional[str]: Reason for escalation, None if the result is acceptable
+    """
+    for field_name in policy.required_fields:
+        if not response_data.get(field_name):
+            return f"empty_{field_name}"
+
+    confidence = response_data.get("extraction_confidence") or 0.0
+    if confidence < policy.min_confidence:
+        return "low_confidence"
+
+    return None
+
+
+class CascadeStats:
+    """Collects per-file cascade attempts and summarizes escalation, cost and latency"""
+
+    def __init__(self, policy: CascadePolicy):
+        self.policy = policy
+        self.files: List[List[Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def record(self, attempts: List[Dict[str, Any]]):
+        """
+        Record the attempts made for one file
+
+        Args:
+            attempts: One dict per model call with model, latency_seconds, input_tokens,
+                output_tokens and escalation_reason
+        """
+        with self._lock:
+            self.files.append(attempts)
+
+    def summary(self) -> Dict[str, Any]:
+        """Escalation fraction and cost/latency compared with always using the top model"""
+        with self._lock:
+            files = list(self.files)
+
+        policy = self.policy
+        top = policy.top_model
+        top_latencies = [a["latency_seconds"] for attempts in files for a in attempts if a["model"] == top]
+        mean_top_latency = sum(top_latencies) / len(top_latencies) if top_latencies else None
+
+        escalated = 0
+        reasons: Dict[str, int] = {}
+        final_models: Dict[str, int] = {}
+        actual_cost = baseline_cost = 0.0
+        actual_latency = baseline_latency = 0.0
+        cost_known = True
+
+        for attempts in files:
+            final = attempts[-1]
+            final_models[final["model"]] = final_models.get(final["model"], 0) + 1
+            if len(attempts) > 1:
+                escalated += 1
+            for attempt in attempts:
+                if attempt["escalation_reason"]:
+                    reasons[attempt["escalation_reason"]] = reasons.get(attempt["escalation_reason"], 0) + 1
+
+                cost = policy.cost(attempt["model"], attempt["input_tokens"], attempt["output_tokens"])
+                if cost is None:
+                    cost_known = False
+                else:
+                    actual_cost += cost
+                actual_latency += attempt["latency_seconds"]
+
+            # Baseline: the top-model attempt if one was made, otherwise the accepted
+            # attempt re-priced at top-model rates with the mean observed top-model latency
+            top_attempt = next((a for a in attempts if a["model"] == top), None)
+            reference = top_attempt or final
+            cost = policy.cost(top, reference["input_tokens"], reference["output_tokens"])
+            if cost is None:
+                cost_known = False
+            else:
+                baseline_cost += cost
+            if top_attempt is not None:
+                baseline_latency += top_attempt["latency_seconds"]
+            else:
+                baseline_latency += mean_top_latency if mean_top_latency is not None else final["latency_seconds"]
+
+        total = len(files)
+        return {
+            "models": list(policy.models),
+            "files": total,
+            "escalated_files": escalated,
+            "escalation_fraction": escalated / total if total else 0.0,
+            "escalation_reasons": reasons,
+            "final_model_distribution": final_models,
+            "cost_usd": actual_cost if cost_known else None,
+            "top_model_cost_usd_estimate": baseline_cost if cost_known else None,
+            "cost_saved_usd": baseline_cost - actual_cost if cost_known else None,
+            "api_latency_seconds": actual_latency,
+            "top_model_latency_seconds_estimate": baseline_latency,
+            "latency_saved_seconds": baseline_latency - actual_latency
+        }
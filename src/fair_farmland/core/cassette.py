@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Record/Replay Cassettes for LLM Requests
+
+A cassette is a JSONL file holding one recorded request per line: the request
+fingerprint, the raw response text, token usage and the observed latency.
+RecordingBackend wraps any backend and appends every response to a cassette;
+ReplayBackend serves recorded responses deterministically, optionally sleeping for the
+original (or scaled) latency, so the pipeline can be benchmarked end-to-end without
+API calls.
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .llm_backends import (
+    BackendError, BackendTimeoutError, LLMBackend, LLMResponse, LLMUsage, deliver_in_chunks
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteMissError(BackendError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+def request_fingerprint(model: str, input_text: str, schema: Dict[str, Any], schema_name: str) -> str:
+    """
+    Stable fingerprint identifying a structured-output request
+
+    Args:
+        model: Model name
+        input_text: Complete prompt
+        schema: JSON schema of the structured output
+        schema_name: Name of the output format
+
+    Returns:
+        str: Hex SHA-256 digest over the canonicalized request
+    """
+    canonical = json.dumps(
+        {"model": model, "input": input_text, "schema": schema, "schema_name": schema_name},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RecordingBackend(LLMBackend):
+    """Backend wrapper that appends every successful response to a cassette file"""
+
+    def __init__(self, backend: LLMBackend, cassette_path: Union[str, Path]):
+        """
+        Initialize the recorder
+
+        Args:
+            backend: Backend that actually serves the requests
+            cassette_path: JSONL file to append recordings to (created if missing)
+        """
+        self.backend = backend
+        self.cassette_path = Path(cassette_path)
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        self.description = f"{backend.description} (recording)"
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        response = self.backend.create_structured_response(
+            model, input_text, schema, schema_name,
+            temperature=temperature, max_output_tokens=max_output_tokens, timeout=timeout
+        )
+        self._record(model, input_text, schema, schema_name, response)
+        return response
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        response = self.backend.stream_structured_response(
+            model, input_text, schema, schema_name, on_delta,
+            temperature=temperature, max_output_tokens=max_output_tokens, timeout=timeout
+        )
+        self._record(model, input_text, schema, schema_name, response)
+        return response
+
+    def _record(self, model: str, input_text: str, schema: Dict[str, Any], schema_name: str,
+                response: LLMResponse):
+        """Append one response to the cassette"""
+        entry = {
+            "fingerprint": request_fingerprint(model, input_text, schema, schema_name),
+            "model": model,
+            "schema_name": schema_name,
+            "text": response.text,
+            "usage": {"input_tokens": response.usage.input_tokens, "output_tokens": response.usage.output_tokens},
+            "latency_seconds": response.latency_seconds,
+            "recorded_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            with open(self.cassette_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.recorded += 1
+
+
+class ReplayBackend(LLMBackend):
+    """Backend serving responses from a cassette instead of calling a model"""
+
+    def __init__(self, cassette_path: Union[str, Path], latency_scale: float = 1.0):
+        """
+        Load a cassette for replay
+
+        Args:
+            cassette_path: JSONL cassette written by RecordingBackend
+            latency_scale: Factor applied to the recorded latencies (0 = respond immediately)
+        """
+        self.cassette_path = Path(cassette_path)
+        self.latency_scale = latency_scale
+        self.description = f"Cassette replay ({self.cassette_path.name})"
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._next_index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+        with open(self.cassette_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["fingerprint"], []).append(entry)
+
+        logger.info(f"Loaded {sum(len(e) for e in self._entries.values())} recorded responses "
+                    f"from {self.cassette_path}")
+
+    def _lookup(self, model: str, input_text: str, schema: Dict[str, Any], schema_name: str) -> Dict[str, Any]:
+        """Next recorded entry for a request"""
+        fingerprint = request_fingerprint(model, input_text, schema, schema_name)
+        with self._lock:
+            entries = self._entries.get(fingerprint)
+            if not entries:
+                self.stats["misses"] += 1
+                raise CassetteMissError(f"No recorded response for request {fingerprint[:12]} ({model})")
+            # Repeated identical requests cycle through their recordings in order
+            index = self._next_index.get(fingerprint, 0)
+            self._next_index[fingerprint] = index + 1
+            entry = entries[index % len(entries)]
+            self.stats["hits"] += 1
+        return entry
+
+    @staticmethod
+    def _response(model: str, entry: Dict[str, Any], latency: float) -> LLMResponse:
+        usage = entry.get("usage", {})
+        return LLMResponse(
+            text=entry["text"],
+            model=model,
+            usage=LLMUsage(
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0)
+            ),
+            latency_seconds=latency
+        )
+
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        entry = self._lookup(model, input_text, schema, schema_name)
+        latency = entry.get("latency_seconds", 0.0) * self.latency_scale
+        if timeout is not None and latency > timeout:
+            time.sleep(max(0.0, timeout))
+            raise BackendTimeoutError(f"Replayed request exceeded timeout of {timeout}s")
+        if latency > 0:
+            time.sleep(latency)
+        return self._response(model, entry, latency)
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        entry = self._lookup(model, input_text, schema, schema_name)
+        latency = entry.get("latency_seconds", 0.0) * self.latency_scale
+        deliver_in_chunks(entry["text"], latency, on_delta, timeout=timeout)
+        return self._response(model, entry, latency)
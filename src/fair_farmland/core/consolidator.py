@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Corpus Consolidator: JSON-LD Outputs to a Columnar Parquet Store
+
+Streams every `*_schema.json` document of one or more output directories into five
+normalized Parquet tables:
+
+    articles   one row per document (article_key)
+    authors    one row per author of an article (article_key, position, author_key)
+    datasets   one row per dataset (dataset_key, article_key, place_key)
+    variables  one row per measured variable (variable_key, dataset_key)
+    places     one row per distinct place (place_key)
+
+Keys are content-derived hashes and therefore stable across runs and machines: articles
+by DOI (or title and year), authors by ORCID (or name), datasets by article and
+identifier (or name), variables by dataset and property, places by name and bounding box.
+A dataset key identifies one mention; the same dataset in several articles is linked
+through its identifier (see fair_farmland.analysis.entity_resolution).
+
+Each table is a directory of part files that pandas and pyarrow read as one table. A
+manifest records every consolidated document with its size, modification time and
+content hash, so later runs append only new documents; documents whose content changed
+replace their earlier rows.
+
+Usage:
+    python -m fair_farmland.core.consolidator output/ more_output/ --store farmland_store
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .reference_index import normalize_doi, normalize_title
+from ..utils.data_standardization import dataset_to_source, match_category
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_LIST = pa.list_(pa.string())
+
+TABLE_SCHEMAS = {
+    "articles": pa.schema([
+        ("article_key", pa.string()),
+        ("source_file", pa.string()),
+        ("doi", pa.string()),
+        ("name", pa.string()),
+        ("date_published", pa.string()),
+        ("publication_year", pa.int32()),
+        ("journal", pa.string()),
+        ("issn", pa.string()),
+        ("publisher", pa.string()),
+        ("volume", pa.string()),
+        ("issue", pa.string()),
+        ("page_start", pa.string()),
+        ("page_end", pa.string()),
+        ("in_language", pa.string()),
+        ("license", pa.string()),
+        ("is_accessible_for_free", pa.bool_()),
+        ("keywords", _LIST),
+        ("subject", _LIST),
+        ("author_count", pa.int32()),
+        ("dataset_count", pa.int32()),
+        ("extraction_confidence", pa.float64()),
+        ("generated_at", pa.string()),
+        ("response_schema", pa.string())
+    ]),
+    "authors": pa.schema([
+        ("article_key", pa.string()),
+        ("source_file", pa.string()),
+        ("position", pa.int32()),
+        ("author_key", pa.string()),
+        ("name", pa.string()),
+        ("affiliation", pa.string()),
+        ("identifier", pa.string())
+    ]),
+    "datasets": pa.schema([
+        ("dataset_key", pa.string()),
+        ("article_key", pa.string()),
+        ("source_file", pa.string()),
+        ("position", pa.int32()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("place_key", pa.string()),
+        ("temporal_coverage", pa.string()),
+        ("identifier", pa.string()),
+        ("license", pa.string()),
+        ("conditions_of_access", pa.string()),
+        ("is_accessible_for_free", pa.bool_()),
+        ("encoding_format", pa.string()),
+        ("content_size", pa.string()),
+        ("url", pa.string()),
+        ("keywords", _LIST),
+        ("variable_count", pa.int32()),
+        ("accessibility_category", pa.string()),
+        ("format_category", pa.string()),
+        ("country_category", pa.string())
+    ]),
+    "variables": pa.schema([
+        ("variable_key", pa.string()),
+        ("dataset_key", pa.string()),
+        ("article_key", pa.string()),
+        ("source_file", pa.string()),
+        ("position", pa.int32()),
+        ("property_id", pa.string()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("unit_text", pa.string())
+    ]),
+    "places": pa.schema([
+        ("place_key", pa.string()),
+        ("name", pa.string()),
+        ("box", pa.string()),
+        ("address_country", pa.string())
+    ])
+}
+
+TABLES = tuple(TABLE_SCHEMAS)
+
+
+def stable_key(*parts: Any) -> str:
+    """Content-derived key: 16 hex characters of a BLAKE2b hash over the parts"""
+    text = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _text(value: Any) -> Optional[str]:
+    """Non-empty string or None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _year(value: Any) -> Optional[int]:
+    text = _text(value)
+    if text and text[:4].isdigit():
+        return int(text[:4])
+    return None
+
+
+def article_key(document: Dict[str, Any]) -> str:
+    """Key of an article: its DOI, otherwise its normalized title and year"""
+    doi = normalize_doi(document.get("doi") or "")
+    if doi:
+        return stable_key("doi", doi)
+    return stable_key("title", normalize_title(document.get("name")), _year(document.get("publication_year")))
+
+
+def _category(dataset: Dict[str, Any], source: Dict[str, Any], name: str) -> Optional[str]:
+    """Standardized category, from the precomputed block if the document has one (None if missing)"""
+    precomputed = (dataset.get("standardized") or {}).get(name)
+    if precomputed:
+        # The block stores the "Not Specified" value for missing fields; the tables use None
+        return precomputed.get("value") if _text(precomputed.get("raw")) else None
+    raw = _text(source.get(name))
+    return match_category(raw, name)[0] if raw else None
+
+
+def document_rows(document: Dict[str, Any], source_file: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Normalize one JSON-LD document into rows of the five tables
+
+    Args:
+        document: JSON-LD document as written by the pipeline
+        source_file: Path of the document (stored with every row)
+
+    Returns:
+        Dict: Table name -> rows
+    """
+    rows: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+    key = article_key(document)
+    journal = document.get("is_part_of") or {}
+    metadata = document.get("extraction_metadata") or {}
+    authors = document.get("author") or []
+    datasets = document.get("dataset") or []
+
+    rows["articles"].append({
+        "article_key": key,
+        "source_file": source_file,
+        "doi": _text(document.get("doi")),
+        "name": _text(document.get("name")),
+        "date_published": _text(document.get("date_published")),
+        "publication_year": _year(document.get("publication_year") or document.get("date_published")),
+        "journal": _text(journal.get("name")),
+        "issn": _text(journal.get("issn")),
+        "publisher": _text((document.get("publisher") or journal.get("publisher") or {}).get("name")),
+        "volume": _text(document.get("publication_volume")),
+        "issue": _text(document.get("publication_issue")),
+        "page_start": _text(document.get("page_start")),
+        "page_end": _text(document.get("page_end")),
+        "in_language": _text(document.get("in_language")),
+        "license": _text(document.get("license")),
+        "is_accessible_for_free": document.get("is_accessible_for_free"),
+        "keywords": [str(keyword) for keyword in document.get("keywords") or []],
+        "subject": [str(subject) for subject in document.get("subject") or []],
+        "author_count": len(authors),
+        "dataset_count": len(datasets),
+        "extraction_confidence": metadata.get("confidence"),
+        "generated_at": _text(metadata.get("generated_at")),
+        "response_schema": _text((metadata.get("response_schema") or {}).get("name"))
+    })
+
+    for position, author in enumerate(authors):
+        orcid = _text(author.get("identifier"))
+        rows["authors"].append({
+            "article_key": key,
+            "source_file": source_file,
+            "position": position,
+            "author_key": stable_key("orcid", orcid.lower()) if orcid else stable_key("name", normalize_title(author.get("name"))),
+            "name": _text(author.get("name")),
+            "affiliation": _text(author.get("affiliation")),
+            "identifier": orcid
+        })
+
+    for position, dataset in enumerate(datasets):
+        identifier = _text(dataset.get("identifier"))
+        # Keyed per article: rows of a dataset shared by several articles must stay distinct
+        dataset_key = (stable_key("dataset", key, normalize_doi(identifier)) if identifier
+                       else stable_key("dataset", key, normalize_title(dataset.get("name"))))
+
+        place_key = None
+        place = dataset.get("spatial_coverage") or {}
+        if _text(place.get("name")):
+            box = _text((place.get("geo") or {}).get("box"))
+            place_key = stable_key("place", normalize_title(place.get("name")), box)
+            rows["places"].append({
+                "place_key": place_key,
+                "name": _text(place.get("name")),
+                "box": box,
+                "address_country": _text(place.get("address_country"))
+            })
+
+        source = dataset_to_source(dataset)
+        variables = dataset.get("variable_measured") or []
+        rows["datasets"].append({
+            "dataset_key": dataset_key,
+            "article_key": key,
+            "source_file": source_file,
+            "position": position,
+            "name": _text(dataset.get("name")),
+            "description": _text(dataset.get("description")),
+            "place_key": place_key,
+            "temporal_coverage": _text(dataset.get("temporal_coverage")),
+            "identifier": identifier,
+            "license": _text(dataset.get("license")),
+            "conditions_of_access": _text(dataset.get("conditions_of_access")),
+            "is_accessible_for_free": dataset.get("is_accessible_for_free"),
+            "encoding_format": _text(dataset.get("encoding_format")),
+            "content_size": _text(dataset.get("content_size")),
+            "url": _text(dataset.get("url")),
+            "keywords": [str(keyword) for keyword in dataset.get("keywords") or []],
+            "variable_count": len(variables),
+            "accessibility_category": _category(dataset, source, "accessibility"),
+            "format_category": _category(dataset, source, "data_format"),
+            "country_category": _category(dataset, source, "country")
+        })
+
+        for v_position, variable in enumerate(variables):
+            property_id = _text(variable.get("property_id")) or normalize_title(variable.get("name"))
+            rows["variables"].append({
+                "variable_key": stable_key("variable", dataset_key, property_id),
+                "dataset_key": dataset_key,
+                "article_key": key,
+                "source_file": source_file,
+                "position": v_position,
+                "property_id": property_id,
+                "name": _text(variable.get("name")),
+                "description": _text(variable.get("description")),
+                "unit_text": _text(variable.get("unit_text"))
+            })
+
+    return rows
+
+
+def file_hash(path: Path) -> str:
+    """SHA-1 of a file's content, read in 1 MiB blocks"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def discover_documents(inputs: Iterable[Union[str, Path]]) -> List[Path]:
+    """
+    Expand output directories into their *_schema.json documents
+
+    Args:
+        inputs: Directories and individual documents
+
+    Returns:
+        List[Path]: Resolved document paths in stable order
+    """
+    documents = []
+    for item in inputs:
+        item = Path(item)
+        documents.extend(sorted(item.glob("*_schema.json")) if item.is_dir() else [item])
+    return [path.resolve() for path in documents]
+
+
+class Consolidator:
+    """Incrementally consolidates JSON-LD outputs into a Parquet store"""
+
+    def __init__(self, store: Union[str, Path], batch_size: int = 1000):
+        """
+        Open (or create) a store
+
+        Args:
+            store: Store directory
+            batch_size: Documents per part file; bounds the memory of a run
+        """
+        self.store = Path(store)
+        self.batch_size = batch_size
+        self.store.mkdir(parents=True, exist_ok=True)
+        for table in TABLES:
+            (self.store / table).mkdir(exist_ok=True)
+        self.manifest = self._load_manifest()
+        self._place_keys: Optional[Set[str]] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.store / MANIFEST_NAME
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"Unsupported manifest version {manifest.get('version')} in {self.store}")
+            return manifest
+        return {"version": MANIFEST_VERSION, "next_part": 0, "files": {}, "runs": []}
+
+    def _save_manifest(self):
+        temporary = self.manifest_path.with_suffix(".json.tmp")
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(temporary, self.manifest_path)
+
+    def _part_path(self, table: str, part: int) -> Path:
+        return self.store / table / f"part-{part:06d}.parquet"
+
+    def _known_place_keys(self) -> Set[str]:
+        if self._place_keys is None:
+            self._place_keys = set()
+            for path in sorted((self.store / "places").glob("*.parquet")):
+                self._place_keys.update(pq.read_table(path, columns=["place_key"]).column(0).to_pylist())
+        return self._place_keys
+
+    def plan(self, documents: List[Path]) -> Tuple[List[Tuple[Path, str]], List[Path]]:
+        """
+        Split documents into new/changed ones and unchanged ones
+
+        Size and modification time short-cut the check; the content hash decides.
+
+        Args:
+            documents: Resolved document paths
+
+        Returns:
+            Tuple: ([(path, content hash)] to consolidate, unchanged paths)
+        """
+        pending, unchanged = [], []
+        for path in documents:
+            entry = self.manifest["files"].get(str(path))
+            stat = path.stat()
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                unchanged.append(path)
+                continue
+            content_hash = file_hash(path)
+            if entry and entry["sha1"] == content_hash:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                unchanged.append(path)
+                continue
+            pending.append((path, content_hash))
+        return pending, unchanged
+
+    def remove(self, source_files: Set[str]):
+        """
+        Delete the rows of documents from the store (places are shared and kept)
+
+        Args:
+            source_files: Document paths as recorded in the manifest
+        """
+        parts = {self.manifest["files"][source]["part"] for source in source_files if source in self.manifest["files"]}
+        for part in sorted(parts):
+            for table in TABLES:
+                if table == "places":
+                    continue
+                path = self._part_path(table, part)
+                if not path.exists():
+                    continue
+                data = pq.read_table(path)
+                keep = [source not in source_files for source in data.column("source_file").to_pylist()]
+                if all(keep):
+                    continue
+                data = data.filter(pa.array(keep, type=pa.bool_()))
+                if data.num_rows:
+                    pq.write_table(data, path)
+                else:
+                    path.unlink()
+        for source in source_files:
+            self.manifest["files"].pop(source, None)
+
+    def _write_batch(self, batch: List[Tuple[Path, str, Dict[str, Any]]]) -> Dict[str, int]:
+        part = self.manifest["next_part"]
+        self.manifest["next_part"] = part + 1
+        rows: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+        place_keys = self._known_place_keys()
+        for path, content_hash, document in batch:
+            document_data = document_rows(document, str(path))
+            for table in TABLES:
+                if table == "places":
+                    for place in document_data["places"]:
+                        if place["place_key"] not in place_keys:
+                            place_keys.add(place["place_key"])
+                            rows["places"].append(place)
+                else:
+                    rows[table].extend(document_data[table])
+            stat = path.stat()
+            self.manifest["files"][str(path)] = {
+                "sha1": content_hash,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "part": part,
+                "article_key": document_data["articles"][0]["article_key"]
+            }
+
+        for table in TABLES:
+            if rows[table]:
+                pq.write_table(pa.Table.from_pylist(rows[table], schema=TABLE_SCHEMAS[table]),
+                               self._part_path(table, part))
+        return {table: len(rows[table]) for table in TABLES}
+
+    def consolidate(self, inputs: Iterable[Union[str, Path]], prune: bool = False) -> Dict[str, Any]:
+        """
+        Append new and changed documents to the store
+
+        Args:
+            inputs: Output directories and individual documents
+            prune: Also delete documents that are in the store but no longer among the inputs
+
+        Returns:
+            Dict: Counts of the run (documents added, replaced, unchanged, failed, rows per table)
+        """
+        documents = discover_documents(inputs)
+        pending, unchanged = self.plan(documents)
+        replaced = {str(path) for path, _ in pending if str(path) in self.manifest["files"]}
+        stale = set(replaced)
+        pruned = set()
+        if prune:
+            present = {str(path) for path in documents}
+            pruned = set(self.manifest["files"]) - present
+            stale |= pruned
+        if stale:
+            self.remove(stale)
+
+        rows = {table: 0 for table in TABLES}
+        written, failed = [], []
+        batch: List[Tuple[Path, str, Dict[str, Any]]] = []
+        for index, (path, content_hash) in enumerate(pending):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    batch.append((path, content_hash, json.load(f)))
+                written.append(str(path))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping {path.name}: {e}")
+                failed.append(str(path))
+            if len(batch) >= self.batch_size or (index == len(pending) - 1 and batch):
+                for table, count in self._write_batch(batch).items():
+                    rows[table] += count
+                batch = []
+                self._save_manifest()
+
+        run = {
+            "finished_at": datetime.now().isoformat(),
+            "added": sum(path not in replaced for path in written),
+            "replaced": sum(path in replaced for path in written),
+            "unchanged": len(unchanged),
+            "pruned": len(pruned),
+            "failed": failed,
+            "rows": rows
+        }
+        self.manifest["runs"].append({key: value for key, value in run.items() if key != "failed"})
+        self._save_manifest()
+        return run
+
+
+def load_table(store: Union[str, Path], table: str, columns: Optional[List[str]] = None):
+    """
+    Read one table of a store as a pandas DataFrame
+
+    Args:
+        store: Store directory
+        table: articles, authors, datasets, variables or places
+        columns: Columns to read (default: all)
+
+    Returns:
+        pd.DataFrame: All part files of the table
+    """
+    if table not in TABLE_SCHEMAS:
+        raise ValueError(f"Unknown table: {table}")
+    parts = sorted((Path(store) / table).glob("*.parquet"))
+    if not parts:
+        return TABLE_SCHEMAS[table].empty_table().to_pandas()
+    return pa.concat_tables(
+        [pq.read_table(path, columns=columns, schema=TABLE_SCHEMAS[table]) for path in parts]
+    ).to_pandas()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Consolidate JSON-LD extraction outputs into Parquet tables")
+    parser.add_argument("inputs", nargs="+", help="Output directories or *_schema.json documents")
+    parser.add_argument("--store", type=str, default="farmland_store", help="Store directory (default: farmland_store)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Documents per part file (default: 1000)")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete documents from the store that are no longer among the inputs")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+
+    consolidator = Consolidator(args.store, batch_size=args.batch_size)
+    run = consolidator.consolidate(args.inputs, prune=args.prune)
+
+    print(f"🗄️  Store: {Path(args.store).absolute()}")
+    print(f"   ➕ Added: {run['added']}   🔁 Replaced: {run['replaced']}   "
+          f"⏭️  Unchanged: {run['unchanged']}   🗑️  Pruned: {run['pruned']}")
+    print(f"   Rows written: " + ", ".join(f"{table} {count}" for table, count in run["rows"].items()))
+    if run["failed"]:
+        print(f"   ❌ Failed: {len(run['failed'])} documents (see log)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Credential Pool for Spreading Requests over Several API Keys
+
+Rate limits are enforced per project, so a run with a single API key is capped by one
+project's limits. A CredentialPool holds several keys, tracks in-flight requests, recent
+requests and recent tokens per key over a sliding window and hands out the least-loaded
+key for every request. Keys that are rejected (authentication or permission errors) are
+quarantined for the rest of the run; keys that hit a rate limit are quarantined for a
+short cooldown and keys with an exhausted quota for a long one. PooledBackend routes
+every request through the pool, retries rejected requests on another key and attributes
+requests, tokens and errors to the key that served them.
+
+Keys are configured in a file (one key per line, optionally as name=key, or a JSON list)
+or in an environment variable holding a comma-separated list. Summaries only ever show
+masked keys.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .llm_backends import (
+    BackendAuthError, BackendError, BackendRateLimitError, BackendTimeoutError,
+    LLMBackend, LLMResponse, OpenAIResponsesBackend
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYS_VARIABLE = "OPENAI_API_KEYS"
+
+
+class CredentialsExhaustedError(BackendError):
+    """Raised when no key of the pool can serve a request"""
+
+
+@dataclass
+class Credential:
+    """
+    One API key of the pool
+
+    Attributes:
+        name: Label used in logs and summaries
+        key: Secret API key (never shown in summaries)
+        project: Project the key belongs to, if known
+        requests_per_minute: Request limit of the key's project, if known
+        tokens_per_minute: Token limit of the key's project, if known
+    """
+    name: str
+    key: str = field(repr=False)
+    project: Optional[str] = None
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+    @property
+    def masked_key(self) -> str:
+        """Key reduced to its prefix and last four characters"""
+        if len(self.key) <= 12:
+            return "***"
+        return f"{self.key[:3]}...{self.key[-4:]}"
+
+
+def _credential_from_entry(entry: Union[str, Dict[str, Any]], index: int) -> Credential:
+    if isinstance(entry, str):
+        entry = {"key": entry}
+    if not entry.get("key"):
+        raise ValueError(f"Credential entry {index + 1} has no key")
+    return Credential(
+        name=entry.get("name") or f"key-{index + 1}",
+        key=entry["key"],
+        project=entry.get("project"),
+        requests_per_minute=entry.get("requests_per_minute"),
+        tokens_per_minute=entry.get("tokens_per_minute")
+    )
+
+
+def load_credentials(path: Union[str, Path]) -> List[Credential]:
+    """
+    Read API keys from a file
+
+    Plain text files hold one key per line, optionally as name=key; empty lines and lines
+    starting with # are ignored. JSON files hold a list of keys or of objects with key,
+    name, project, requests_per_minute and tokens_per_minute.
+
+    Args:
+        path: Credentials file
+
+    Returns:
+        List[Credential]: Keys in file order
+    """
+    text = Path(path).read_text(encoding='utf-8')
+    if text.lstrip().startswith(("[", "{")):
+        entries = json.loads(text)
+        if isinstance(entries, dict):
+            entries = entries.get("credentials", [])
+        return [_credential_from_entry(entry, index) for index, entry in enumerate(entries)]
+
+    credentials = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, separator, key = line.partition("=")
+        entry = {"name": name.strip(), "key": key.strip()} if separator else line
+        credentials.append(_credential_from_entry(entry, len(credentials)))
+    return credentials
+
+
+def credentials_from_env(variable: str = DEFAULT_KEYS_VARIABLE) -> List[Credential]:
+    """
+    Read API keys from a comma-separated environment variable
+
+    Args:
+        variable: Name of the environment variable
+
+    Returns:
+        List[Credential]: Keys named key-1, key-2, ...
+    """
+    keys = [key.strip() for key in os.getenv(variable, "").split(",") if key.strip()]
+    return [_credential_from_entry(key, index) for index, key in enumerate(keys)]
+
+
+class _KeyState:
+    """Usage and quarantine state of one key (guarded by the pool lock)"""
+
+    def __init__(self, credential: Credential):
+        self.credential = credential
+        self.in_flight = 0
+        self.recent: Deque[Tuple[float, int]] = deque()
+        self.requests = 0
+        self.succeeded = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_seconds = 0.0
+        self.errors: Dict[str, int] = {}
+        self.quarantined_until = 0.0
+        self.quarantine_reason: Optional[str] = None
+        self.quarantines = 0
+
+    def prune(self, now: float, window: float):
+        while self.recent and self.recent[0][0] < now - window:
+            self.recent.popleft()
+
+    def utilization(self) -> float:
+        """Share of the known per-minute limits in use, 0 if no limits are configured"""
+        shares = [0.0]
+        if self.credential.requests_per_minute:
+            shares.append((len(self.recent) + self.in_flight) / self.credential.requests_per_minute)
+        if self.credential.tokens_per_minute:
+            shares.append(sum(tokens for _, tokens in self.recent) / self.credential.tokens_per_minute)
+        return max(shares)
+
+
+class CredentialPool:
+    """Thread-safe pool of API keys with least-loaded selection and quarantine"""
+
+    def __init__(self, credentials: List[Credential], window_seconds: float = 60.0,
+                 rate_limit_cooldown: float = 20.0, quota_cooldown: float = 3600.0):
+        """
+        Initialize the pool
+
+        Args:
+            credentials: Keys of the pool (names must be unique)
+            window_seconds: Sliding window for recent requests and tokens
+            rate_limit_cooldown: Quarantine after a rate limit when the API gives no retry-after
+            quota_cooldown: Quarantine after an exhausted quota
+        """
+        names = [credential.name for credential in credentials]
+        if len(set(names)) != len(names):
+            raise ValueError("Credential names must be unique")
+        self.window_seconds = window_seconds
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.quota_cooldown = quota_cooldown
+        self._states = {credential.name: _KeyState(credential) for credential in credentials}
+        self.failovers = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "CredentialPool":
+        """Pool of the keys in a credentials file (see load_credentials)"""
+        return cls(load_credentials(path), **kwargs)
+
+    @classmethod
+    def from_env(cls, variable: str = DEFAULT_KEYS_VARIABLE, **kwargs) -> "CredentialPool":
+        """Pool of the keys in a comma-separated environment variable"""
+        return cls(credentials_from_env(variable), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _pick(self, now: float) -> Tuple[Optional[_KeyState], Optional[float]]:
+        """Least-loaded available key, or the time the next quarantined key is released"""
+        available = []
+        next_release = None
+        for order, state in enumerate(self._states.values()):
+            state.prune(now, self.window_seconds)
+            if state.quarantined_until > now:
+                if not math.isinf(state.quarantined_until):
+                    next_release = min(next_release or math.inf, state.quarantined_until)
+                continue
+            available.append(((state.utilization(), state.in_flight, len(state.recent), order), state))
+        if available:
+            return min(available, key=lambda item: item[0])[1], None
+        return None, next_release
+
+    def acquire(self, timeout: Optional[float] = None) -> Credential:
+        """
+        Reserve the least-loaded key for one request
+
+        Keys are ranked by the share of their configured limits in use, then by in-flight
+        and recent requests. When every key is in a temporary quarantine, waits for the
+        first one to be released.
+
+        Args:
+            timeout: Seconds to wait for a quarantined key (None = no limit)
+
+        Returns:
+            Credential: Key to use; hand it back with release()
+
+        Raises:
+            CredentialsExhaustedError: If every key is rejected or none is released in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                state, next_release = self._pick(now)
+                if state is not None:
+                    state.in_flight += 1
+                    state.requests += 1
+                    return state.credential
+            if next_release is None:
+                raise CredentialsExhaustedError("Every API key of the pool was rejected")
+            if deadline is not None and next_release > deadline:
+                raise CredentialsExhaustedError(
+                    f"Every API key of the pool is rate limited for at least {next_release - now:.0f}s"
+                )
+            time.sleep(max(0.0, next_release - time.monotonic()))
+
+    def release(self, credential: Credential, response: Optional[LLMResponse] = None,
+                error: Optional[str] = None):
+        """
+        Hand back a key and attribute the outcome of its request
+
+        Args:
+            credential: Key returned by acquire()
+            response: Response of a successful request
+            error: Kind of failure (auth, rate_limit, quota, timeout, error)
+        """
+        with self._lock:
+            state = self._states[credential.name]
+            state.in_flight -= 1
+            tokens = 0
+            if response is not None:
+                tokens = response.usage.total_tokens
+                state.succeeded += 1
+                state.input_tokens += response.usage.input_tokens
+                state.output_tokens += response.usage.output_tokens
+                state.latency_seconds += response.latency_seconds
+            if error:
+                state.errors[error] = state.errors.get(error, 0) + 1
+            state.recent.append((time.monotonic(), tokens))
+
+    def quarantine(self, credential: Credential, reason: str, duration: Optional[float] = None):
+        """
+        Take a key out of rotation
+
+        Args:
+            credential: Key to quarantine
+            reason: Why the key was taken out (shown in the summary)
+            duration: Seconds until the key is used again (None = rest of the run)
+        """
+        with self._lock:
+            state = self._states[credential.name]
+            until = math.inf if duration is None else time.monotonic() + duration
+            state.quarantined_until = max(state.quarantined_until, until)
+            state.quarantine_reason = reason
+            state.quarantines += 1
+        logger.warning(f"API key {credential.name} ({credential.masked_key}) quarantined "
+                       f"{'for the rest of the run' if duration is None else f'for {duration:g}s'}: {reason}")
+
+    def record_failover(self):
+        """Count a request that was retried on another key"""
+        with self._lock:
+            self.failovers += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-key usage, errors and quarantine state"""
+        with self._lock:
+            now = time.monotonic()
+            per_key = {}
+            for name, state in self._states.items():
+                state.prune(now, self.window_seconds)
+                quarantined = state.quarantined_until > now
+                per_key[name] = {
+                    "key": state.credential.masked_key,
+                    "project": state.credential.project,
+                    "requests": state.requests,
+                    "succeeded": state.succeeded,
+                    "input_tokens": state.input_tokens,
+                    "output_tokens": state.output_tokens,
+                    "mean_latency_seconds": state.latency_seconds / state.succeeded if state.succeeded else None,
+                    "errors": dict(state.errors),
+                    "quarantines": state.quarantines,
+                    "quarantined": quarantined,
+                    "quarantine_reason": state.quarantine_reason if quarantined else None
+                }
+            failovers = self.failovers
+
+        return {
+            "keys": len(per_key),
+            "available_keys": sum(1 for entry in per_key.values() if not entry["quarantined"]),
+            "requests": sum(entry["requests"] for entry in per_key.values()),
+            "failovers": failovers,
+            "per_key": per_key
+        }
+
+
+class PooledBackend(LLMBackend):
+    """Backend that serves every request with the least-loaded key of a credential pool"""
+
+    def __init__(self, pool: CredentialPool,
+                 backend_factory: Optional[Callable[[Credential], LLMBackend]] = None,
+                 max_attempts: Optional[int] = None):
+        """
+        Initialize the pooled backend
+
+        Args:
+            pool: Keys to spread requests over
+            backend_factory: Creates the backend for one key (default: OpenAI Responses API)
+            max_attempts: Keys tried per request before giving up (default: twice the pool size)
+        """
+        if len(pool) == 0:
+            raise ValueError("The credential pool contains no API keys")
+        self.pool = pool
+        self.backend_factory = backend_factory or (lambda credential: OpenAIResponsesBackend(api_key=credential.key))
+        self.max_attempts = max_attempts or 2 * len(pool)
+        self._backends: Dict[str, LLMBackend] = {}
+        self._lock = threading.Lock()
+        base_description = OpenAIResponsesBackend.description if backend_factory is None else "LLM backend"
+        self.description = f"{base_description} over {len(pool)} API keys"
+
+    def _backend(self, credential: Credential) -> LLMBackend:
+        with self._lock:
+            backend = self._backends.get(credential.name)
+            if backend is None:
+                backend = self._backends[credential.name] = self.backend_factory(credential)
+            return backend
+
+    def _call(self, request: Callable[[LLMBackend, Optional[float]], LLMResponse],
+              timeout: Optional[float], retryable: Callable[[], bool]) -> LLMResponse:
+        start = time.perf_counter()
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_attempts):
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+            if remaining is not None and remaining <= 0:
+                raise BackendTimeoutError(f"Request exceeded timeout of {timeout}s while switching API keys")
+            try:
+                credential = self.pool.acquire(timeout=remaining)
+            except CredentialsExhaustedError as e:
+                raise e from last_error
+            if attempt:
+                self.pool.record_failover()
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+
+            try:
+                response = request(self._backend(credential), remaining)
+            except BackendAuthError as e:
+                self.pool.release(credential, error="auth")
+                self.pool.quarantine(credential, str(e))
+                last_error = e
+            except BackendRateLimitError as e:
+                self.pool.release(credential, error="quota" if e.quota_exhausted else "rate_limit")
+                if e.quota_exhausted:
+                    self.pool.quarantine(credential, "quota exhausted", self.pool.quota_cooldown)
+                else:
+                    self.pool.quarantine(credential, "rate limited", e.retry_after or self.pool.rate_limit_cooldown)
+                last_error = e
+            except BackendTimeoutError:
+                self.pool.release(credential, error="timeout")
+                raise
+            except Exception:
+                self.pool.release(credential, error="error")
+                raise
+            else:
+                self.pool.release(credential, response=response)
+                return response
+
+            if not retryable():
+                raise last_error
+
+        raise CredentialsExhaustedError(f"Request failed on {self.max_attempts} API keys") from last_error
+
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        return self._call(
+            lambda backend, remaining: backend.create_structured_response(
+                model, input_text, schema, schema_name,
+                temperature=temperature, max_output_tokens=max_output_tokens, timeout=remaining
+            ),
+            timeout,
+            retryable=lambda: True
+        )
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        delivered = []
+
+        def forward(delta: str):
+            delivered.append(True)
+            on_delta(delta)
+
+        # A stream can only move to another key before its first delta was passed on
+        return self._call(
+            lambda backend, remaining: backend.stream_structured_response(
+                model, input_text, schema, schema_name, forward,
+                temperature=temperature, max_output_tokens=max_output_tokens, timeout=remaining
+            ),
+            timeout,
+            retryable=lambda: not delivered
+        )
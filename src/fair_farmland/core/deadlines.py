@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Deadlines and Timeouts for the Extraction Pipeline
+
+This module provides the building blocks used to bound how long a single stage
+(PDF conversion, API extraction), a single file and a whole run may take.
+Stages that cannot be interrupted in-process (PDF conversion) are executed in a
+child process that is terminated once its budget is spent.
+"""
+
+import time
+import logging
+import multiprocessing
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimeoutError(TimeoutError):
+    """Raised when a pipeline stage exceeds its time budget"""
+
+    def __init__(self, stage: str, timeout: Optional[float] = None):
+        self.stage = stage
+        self.timeout = timeout
+        if timeout is None:
+            message = f"Stage '{stage}' exceeded its deadline"
+        else:
+            message = f"Stage '{stage}' exceeded its deadline of {timeout:.1f}s"
+        super().__init__(message)
+
+
+@dataclass
+class TimeoutPolicy:
+    """
+    Time budgets for a processing run (all values in seconds, None = unlimited)
+
+    Attributes:
+        conversion: Budget for converting one PDF to markdown
+        extraction: Budget for one extraction API call
+        per_file: Budget for all stages of one file together
+        run: Global budget for the whole run
+        retries: How often a timed-out file is requeued before giving up
+    """
+    conversion: Optional[float] = None
+    extraction: Optional[float] = None
+    per_file: Optional[float] = None
+    run: Optional[float] = None
+    retries: int = 1
+
+
+class Deadline:
+    """A point in time (monotonic clock) after which work should be abandoned"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        Initialize the deadline
+
+        Args:
+            seconds: Time from now until the deadline expires (None = never)
+        """
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until expiry, None if the deadline is unlimited"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def budget(self, stage_timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Effective budget for a stage: the smaller of its own timeout and the time left
+
+        Args:
+            stage_timeout: Timeout configured for the stage itself
+
+        Returns:
+            Optional[float]: Seconds available to the stage, None if unlimited
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return stage_timeout
+        if stage_timeout is None:
+            return remaining
+        return min(stage_timeout, remaining)
+
+    def child(self, seconds: Optional[float] = None) -> "Deadline":
+        """Create a deadline that expires after `seconds` but never later than this one"""
+        child = Deadline()
+        budget = self.budget(seconds)
+        if budget is not None:
+            child.expires_at = time.monotonic() + budget
+        return child
+
+    def check(self, stage: str):
+        """Raise StageTimeoutError if the deadline has already passed"""
+        if self.expired():
+            raise StageTimeoutError(stage)
+
+
+def _call_in_child(conn, func: Callable, args: tuple):
+    """Child-process entry point: run func and send back ('ok', result) or ('error', message)"""
+    try:
+        conn.send(("ok", func(*args)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_with_timeout(func: Callable, args: tuple, timeout: Optional[float], stage: str) -> Any:
+    """
+    Run a picklable function in a child process and terminate it when the timeout passes
+
+    Args:
+        func: Module-level function to run
+        args: Positional arguments for func
+        timeout: Seconds to wait for the result (None = wait indefinitely)
+        stage: Stage name used in the timeout error
+
+    Returns:
+        Any: The function's return value
+
+    Raises:
+        StageTimeoutError: If the function did not finish in time
+        RuntimeError: If the function raised inside the child process
+    """
+    if timeout is not None and timeout <= 0:
+        raise StageTimeoutError(stage, timeout)
+
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_call_in_child, args=(child_conn, func, args), daemon=True)
+    process.start()
+    child_conn.close()
+
+    try:
+        # Read before joining so large results cannot block the child on a full pipe
+        if not parent_conn.poll(timeout):
+            logger.warning(f"Terminating {stage} after {timeout:.1f}s")
+            process.terminate()
+            raise StageTimeoutError(stage, timeout)
+        try:
+            status, payload = parent_conn.recv()
+        except EOFError:
+            raise RuntimeError(f"{stage} worker exited without a result (exit code {process.exitcode})")
+    finally:
+        parent_conn.close()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    if status == "error":
+        raise RuntimeError(payload)
+    return payload
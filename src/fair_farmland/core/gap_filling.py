@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Targeted Gap Filling for Incomplete Extractions
+
+Instead of re-running the full extraction when a result lacks the article DOI, the
+temporal coverage of a dataset or the units of its variables, a small follow-up request
+asks for exactly the missing fields. Its schema contains only those fields, and the
+prompt contains only the passages of the paper most likely to state them. The answers
+are merged back into the existing result.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import Field, create_model
+
+from .schema_registry import RegisteredSchema, ResponseModel, derive_schema
+
+GAP_FILL_SCHEMA_NAME = "farmland_gap_fill"
+GAP_FILL_SCHEMA_VERSION = "1"
+
+# Fields that can be filled, by kind
+GAP_KINDS = ("doi", "temporal_coverage", "variable_unit")
+
+_DOI_PATTERNS = [re.compile(r"\bdoi\b", re.IGNORECASE), re.compile(r"\b10\.\d{4,9}/\S+")]
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+_UNIT_PATTERN = re.compile(r"(?:€|EUR|\bha\b|hectare|%|per cent|\bkm\b|m²|USD|DM\b)", re.IGNORECASE)
+_WORD_PATTERN = re.compile(r"[A-Za-zÄÖÜäöüß]{4,}")
+
+
+@dataclass
+class GapFillPolicy:
+    """
+    Configuration for gap filling
+
+    Attributes:
+        kinds: Kinds of missing fields to request (doi, temporal_coverage, variable_unit)
+        max_fields: Upper bound for fields requested per paper
+        max_passages: Upper bound for passages sent per paper
+        passage_chars: Target size of one passage in characters
+        model: Model for the follow-up request (default: the extraction model)
+    """
+    kinds: List[str] = field(default_factory=lambda: list(GAP_KINDS))
+    max_fields: int = 40
+    max_passages: int = 6
+    passage_chars: int = 1200
+    model: Optional[str] = None
+
+
+@dataclass
+class Gap:
+    """A missing field of an extraction result"""
+    key: str
+    kind: str
+    description: str
+    dataset_index: Optional[int] = None
+    variable_index: Optional[int] = None
+    terms: List[str] = field(default_factory=list)
+
+
+def _terms(text: str) -> List[str]:
+    return [word.lower() for word in _WORD_PATTERN.findall(text or "")]
+
+
+def find_gaps(article, policy: GapFillPolicy) -> List[Gap]:
+    """
+    Find the missing fields of an extracted ScholarlyArticle
+
+    Args:
+        article: ScholarlyArticle of an extraction result
+        policy: Gap filling configuration
+
+    Returns:
+        List[Gap]: Missing fields, at most policy.max_fields
+    """
+    gaps = []
+    if "doi" in policy.kinds and not article.doi:
+        gaps.append(Gap(
+            key="doi",
+            kind="doi",
+            description="Digital Object Identifier (DOI) of the article, empty string if not stated"
+        ))
+
+    for d_index, dataset in enumerate(article.dataset):
+        if "temporal_coverage" in policy.kinds and not dataset.temporal_coverage:
+            gaps.append(Gap(
+                key=f"dataset_{d_index}_temporal_coverage",
+                kind="temporal_coverage",
+                description=(f"Temporal coverage of the dataset '{dataset.name}' as ISO 8601 interval "
+                             f"(e.g. 2014/2017), empty string if not stated"),
+                dataset_index=d_index,
+                terms=_terms(dataset.name)
+            ))
+        if "variable_unit" in policy.kinds:
+            for v_index, variable in enumerate(dataset.variable_measured):
+                if not variable.unit_text:
+                    gaps.append(Gap(
+                        key=f"dataset_{d_index}_variable_{v_index}_unit",
+                        kind="variable_unit",
+                        description=(f"Unit of measurement of the variable '{variable.name}' in the dataset "
+                                     f"'{dataset.name}', empty string if not stated"),
+                        dataset_index=d_index,
+                        variable_index=v_index,
+                        terms=_terms(variable.name)
+                    ))
+
+    return gaps[:policy.max_fields]
+
+
+def split_passages(markdown_text: str, passage_chars: int = 1200) -> List[str]:
+    """
+    Split a paper into passages of roughly passage_chars characters along paragraph breaks
+
+    Args:
+        markdown_text: Paper content
+        passage_chars: Target passage size
+
+    Returns:
+        List[str]: Passages in document order
+    """
+    passages = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", markdown_text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > passage_chars:
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(paragraph[:passage_chars])
+            paragraph = paragraph[passage_chars:]
+        if current and len(current) + len(paragraph) + 2 > passage_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _passage_score(passage: str, gap: Gap) -> float:
+    lowered = passage.lower()
+    score = 2.0 * sum(lowered.count(term) for term in set(gap.terms))
+    if gap.kind == "doi":
+        score += sum(len(pattern.findall(passage)) for pattern in _DOI_PATTERNS) * 3.0
+    elif gap.kind == "temporal_coverage":
+        score += min(len(_YEAR_PATTERN.findall(passage)), 10)
+    elif gap.kind == "variable_unit":
+        score += min(len(_UNIT_PATTERN.findall(passage)), 10)
+    return score
+
+
+def select_passages(passages: List[str], gaps: List[Gap], max_passages: int = 6) -> List[Tuple[int, str]]:
+    """
+    Pick the passages most likely to state the missing fields
+
+    Every gap contributes its best passages in turn, so no single gap takes the whole budget.
+
+    Args:
+        passages: Passages of the paper
+        gaps: Missing fields
+        max_passages: Upper bound for selected passages
+
+    Returns:
+        List[Tuple[int, str]]: (passage number, passage) in document order
+    """
+    rankings = []
+    for gap in gaps:
+        scored = []
+        for index, passage in enumerate(passages):
+            score = _passage_score(passage, gap)
+            if score > 0:
+                scored.append((score, index))
+        rankings.append([index for _, index in sorted(scored, key=lambda item: (-item[0], item[1]))])
+
+    selected: List[int] = []
+    rank = 0
+    while len(selected) < max_passages and any(rank < len(ranking) for ranking in rankings):
+        for ranking in rankings:
+            if rank < len(ranking) and ranking[rank] not in selected:
+                selected.append(ranking[rank])
+                if len(selected) >= max_passages:
+                    break
+        rank += 1
+
+    return [(index, passages[index]) for index in sorted(selected)]
+
+
+def build_gap_schema(gaps: List[Gap]) -> RegisteredSchema:
+    """
+    Strict response schema containing exactly the missing fields
+
+    Args:
+        gaps: Missing fields
+
+    Returns:
+        RegisteredSchema: Derived schema (not cached in the registry)
+    """
+    fields = {gap.key: (str, Field(description=gap.description)) for gap in gaps}
+    model = create_model("GapFillResponse", __base__=ResponseModel, **fields)
+    return derive_schema(GAP_FILL_SCHEMA_NAME, model, GAP_FILL_SCHEMA_VERSION)
+
+
+def build_gap_prompt(gaps: List[Gap], passages: List[Tuple[int, str]], source_filename: str = "") -> str:
+    """
+    Prompt asking for the missing fields based on the selected passages only
+
+    Args:
+        gaps: Missing fields
+        passages: Selected (passage number, passage) pairs
+        source_filename: Original filename for reference
+
+    Returns:
+        str: Complete prompt for the follow-up request
+    """
+    field_lines = "\n".join(f"- {gap.key}: {gap.description}" for gap in gaps)
+    passage_lines = "\n\n".join(f"[{index + 1}] {passage}" for index, passage in passages)
+    return f"""A previous extraction of farmland research metadata from a scientific publication left the fields below empty. Fill them using ONLY the passages of the paper given further down.
+
+NEVER HALLUCINATE OR MAKE THINGS UP. IF A VALUE IS NOT STATED IN THE PASSAGES, RETURN AN EMPTY STRING.
+
+Source file: {source_filename}
+
+FIELDS:
+{field_lines}
+
+PASSAGES:
+{passage_lines}
+"""
+
+
+def merge_answers(article_data: Dict[str, Any], gaps: List[Gap], answers: Dict[str, str]) -> List[Gap]:
+    """
+    Write non-empty answers into a ScholarlyArticle dump (by alias)
+
+    Args:
+        article_data: ScholarlyArticle.model_dump(by_alias=True), modified in place
+        gaps: Requested fields
+        answers: Parsed follow-up response
+
+    Returns:
+        List[Gap]: Gaps that were filled
+    """
+    filled = []
+    for gap in gaps:
+        value = (answers.get(gap.key) or "").strip()
+        if not value:
+            continue
+        if gap.kind == "doi":
+            article_data["doi"] = value
+            article_data["identifier"] = article_data.get("identifier") or value
+        elif gap.kind == "temporal_coverage":
+            article_data["dataset"][gap.dataset_index]["temporal_coverage"] = value
+        elif gap.kind == "variable_unit":
+            variable = article_data["dataset"][gap.dataset_index]["variable_measured"][gap.variable_index]
+            variable["unit_text"] = value
+        filled.append(gap)
+    return filled
+
+
+class GapFillStats:
+    """Collects per-file gap filling outcomes and token usage"""
+
+    def __init__(self):
+        self.files: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, gaps: List[Gap], filled: List[Gap], input_tokens: int, output_tokens: int,
+               reference_tokens: Optional[int] = None):
+        """
+        Record the follow-up request made for one file
+
+        Args:
+            gaps: Requested fields
+            filled: Fields that received a value
+            input_tokens: Input tokens of the follow-up request
+            output_tokens: Output tokens of the follow-up request
+            reference_tokens: Total tokens of the original full extraction, if known
+        """
+        with self._lock:
+            self.files.append({
+                "requested": [gap.kind for gap in gaps],
+                "filled": [gap.kind for gap in filled],
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "reference_tokens": reference_tokens
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """Fill rate per kind and token use compared with the full extractions"""
+        with self._lock:
+            files = list(self.files)
+
+        by_kind = {kind: {"requested": 0, "filled": 0} for kind in GAP_KINDS}
+        for entry in files:
+            for kind in entry["requested"]:
+                by_kind[kind]["requested"] += 1
+            for kind in entry["filled"]:
+                by_kind[kind]["filled"] += 1
+
+        requested = sum(len(entry["requested"]) for entry in files)
+        filled = sum(len(entry["filled"]) for entry in files)
+        compared = [entry for entry in files if entry["reference_tokens"]]
+        gap_tokens = sum(entry["input_tokens"] + entry["output_tokens"] for entry in compared)
+        reference_tokens = sum(entry["reference_tokens"] for entry in compared)
+        return {
+            "requests": len(files),
+            "fields_requested": requested,
+            "fields_filled": filled,
+            "fill_rate": filled / requested if requested else 0.0,
+            "by_kind": by_kind,
+            "input_tokens": sum(entry["input_tokens"] for entry in files),
+            "output_tokens": sum(entry["output_tokens"] for entry in files),
+            "token_fraction_of_full_extraction": gap_tokens / reference_tokens if reference_tokens else None
+        }
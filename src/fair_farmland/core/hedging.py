@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Hedged Requests for Tail-Latency Reduction
+
+When an API request runs longer than a configurable percentile of previously observed
+request latencies, a duplicate request is issued and the first valid response wins.
+The number of duplicates is capped as a fraction of all requests so the extra spend
+stays bounded. The losing request is cancelled if it has not started yet; a running one
+cannot be interrupted and is bounded by the request timeout instead.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .instrumentation import StageTimings
+
+logger = logging.getLogger(__name__)
+
+# Stage under which the latency of every primary (non-hedge) request is recorded; requests
+# for a named model use their own stage (see primary_stage)
+PRIMARY_STAGE = "api_call_primary"
+
+
+def primary_stage(model: Optional[str] = None) -> str:
+    """Timing stage of the primary requests to a model ("api_call_primary:gpt-4o")"""
+    return f"{PRIMARY_STAGE}:{model}" if model else PRIMARY_STAGE
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    Configuration for hedged requests
+
+    Attributes:
+        percentile: Latency percentile (0-1) after which a duplicate request is issued
+        max_extra_fraction: Maximum ratio of duplicate requests to primary requests
+        min_samples: Observed latencies required before the percentile is trusted
+        initial_delay: Hedge delay in seconds used until min_samples are available
+            (None = do not hedge before then)
+        max_workers: Threads shared by all primary and duplicate requests in flight
+        request_timeout: Seconds each request may take, including a losing request that
+            keeps running after the winner returned (None = only the overall timeout)
+    """
+    percentile: float = 0.95
+    max_extra_fraction: float = 0.1
+    min_samples: int = 10
+    initial_delay: Optional[float] = None
+    max_workers: int = 4
+    request_timeout: Optional[float] = None
+
+
+class HedgedCaller:
+    """Issues requests with an optional hedge and tracks the extra spend"""
+
+    def __init__(self, policy: HedgingPolicy, timings: StageTimings):
+        """
+        Initialize the caller
+
+        Args:
+            policy: Hedging configuration
+            timings: Stage instrumentation used to learn the latency distribution
+        """
+        self.policy = policy
+        self.timings = timings
+        self._pool = ThreadPoolExecutor(max_workers=policy.max_workers, thread_name_prefix="hedged-request")
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "hedges_issued": 0,
+            "hedges_won": 0,
+            "losers_cancelled": 0,
+            "extra_input_tokens": 0,
+            "extra_output_tokens": 0
+        }
+
+    def hedge_delay(self, model: Optional[str] = None) -> Optional[float]:
+        """
+        Seconds to wait for the primary request before hedging (None = never hedge)
+
+        Args:
+            model: Model being called; only its own latencies are used, so cheap cascade
+                models do not shorten the delay of the top model
+
+        Returns:
+            Optional[float]: The latency percentile, or the initial delay until min_samples
+                latencies of the model have been observed
+        """
+        stage = primary_stage(model)
+        if self.timings.count(stage) < self.policy.min_samples:
+            return self.policy.initial_delay
+        return self.timings.percentile(stage, self.policy.percentile)
+
+    def _may_hedge(self) -> bool:
+        """Check whether another duplicate stays within the extra-spend cap"""
+        with self._lock:
+            return (self.stats["hedges_issued"] + 1) <= self.policy.max_extra_fraction * self.stats["requests"]
+
+    def _request_timeout(self, remaining: Optional[float]) -> Optional[float]:
+        """Timeout of one request: the remaining overall time, capped by the request timeout"""
+        if self.policy.request_timeout is None:
+            return remaining
+        if remaining is None:
+            return self.policy.request_timeout
+        return min(remaining, self.policy.request_timeout)
+
+    def _run(self, func: Callable[[Optional[float]], Any], timeout: Optional[float],
+             is_valid: Callable[[Any], bool], decided: threading.Event, stage: Optional[str]) -> Tuple[Any, bool]:
+        """Issue one request unless another already won; returns (response, valid)"""
+        if decided.is_set():
+            # The winner returned while this request waited for a free worker
+            with self._lock:
+                self.stats["losers_cancelled"] += 1
+            return None, False
+        start = time.perf_counter()
+        try:
+            response = func(timeout)
+        finally:
+            if stage is not None:
+                self.timings.record(stage, time.perf_counter() - start)
+        valid = is_valid(response)
+        if valid:
+            # Set in the worker so a queued duplicate sees it before it starts
+            decided.set()
+        return response, valid
+
+    def _count_extra_spend(self, future):
+        """Attribute the token usage of a losing request to the extra spend"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        usage = getattr(future.result()[0], "usage", None)
+        if usage is None:
+            return
+        with self._lock:
+            self.stats["extra_input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+            self.stats["extra_output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+
+    def call(self, func: Callable[[Optional[float]], Any], timeout: Optional[float] = None,
+             is_valid: Callable[[Any], bool] = lambda response: True, model: Optional[str] = None) -> Any:
+        """
+        Run func(timeout), hedging with a duplicate call if it is slow
+
+        Args:
+            func: Function issuing one request; receives the remaining timeout
+            timeout: Overall timeout in seconds (None = no limit)
+            is_valid: Predicate deciding whether a completed response is usable
+            model: Model being called; its latencies are learned separately
+
+        Returns:
+            Any: The first valid response
+
+        Raises:
+            Exception: The last error if no request produced a valid response
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+
+        start = time.monotonic()
+        decided = threading.Event()
+        primary = self._pool.submit(self._run, func, self._request_timeout(timeout), is_valid, decided,
+                                    primary_stage(model))
+        futures = [primary]
+
+        delay = self.hedge_delay(model)
+        if timeout is not None and delay is not None and delay >= timeout:
+            delay = None
+        if delay is not None:
+            done, _ = wait(futures, timeout=delay)
+            if not done and self._may_hedge():
+                remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+                logger.info(f"Request exceeded {delay:.2f}s hedge delay, issuing duplicate")
+                with self._lock:
+                    self.stats["hedges_issued"] += 1
+                futures.append(self._pool.submit(self._run, func, self._request_timeout(remaining), is_valid,
+                                                 decided, None))
+
+        pending = set(futures)
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                response, valid = future.result()
+                if not valid:
+                    last_error = ValueError("Response failed validation")
+                    continue
+
+                if future is not primary:
+                    with self._lock:
+                        self.stats["hedges_won"] += 1
+                for loser in futures:
+                    if loser is future:
+                        continue
+                    if loser.cancel():
+                        with self._lock:
+                            self.stats["losers_cancelled"] += 1
+                    else:
+                        loser.add_done_callback(self._count_extra_spend)
+                return response
+
+        raise last_error
+
+    def summary(self) -> Dict[str, Any]:
+        """Hedging statistics including the realized extra-spend fraction"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["extra_request_fraction"] = stats["hedges_issued"] / stats["requests"] if stats["requests"] else 0.0
+        stats["policy"] = {
+            "percentile": self.policy.percentile,
+            "max_extra_fraction": self.policy.max_extra_fraction,
+            "min_samples": self.policy.min_samples,
+            "initial_delay": self.policy.initial_delay,
+            "max_workers": self.policy.max_workers,
+            "request_timeout": self.policy.request_timeout
+        }
+        return stats
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Stage Instrumentation for the Extraction Pipeline
+
+Collects wall-clock durations per pipeline stage (conversion, extraction, API calls,
+writing, ...) and summarizes them as latency percentiles for the processing summary.
+"""
+
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any
+
+
+class StageTimings:
+    """Thread-safe recorder of per-stage durations"""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """Record one duration (in seconds) for a stage"""
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Context manager that records the duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def count(self, stage: str) -> int:
+        """Number of samples recorded for a stage"""
+        with self._lock:
+            return len(self._samples.get(stage, []))
+
+    def percentile(self, stage: str, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of a stage's durations
+
+        Args:
+            stage: Stage name
+            q: Percentile as a fraction (e.g. 0.99)
+
+        Returns:
+            Optional[float]: Duration in seconds, None if the stage has no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(stage, []))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Summary statistics (count, total, mean, p50/p95/p99, max) for every stage"""
+        with self._lock:
+            stages = {stage: sorted(samples) for stage, samples in self._samples.items()}
+
+        summary = {}
+        for stage, samples in stages.items():
+            n = len(samples)
+
+            def pct(q):
+                return samples[min(max(1, math.ceil(q * n)), n) - 1]
+
+            summary[stage] = {
+                "count": n,
+                "total_seconds": sum(samples),
+                "mean_seconds": sum(samples) / n,
+                "p50_seconds": pct(0.50),
+                "p95_seconds": pct(0.95),
+                "p99_seconds": pct(0.99),
+                "max_seconds": samples[-1]
+            }
+        return summary
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+LLM Backends for Structured-Output Extraction
+
+The extractor talks to language models through the small LLMBackend interface defined
+here. OpenAIResponsesBackend wraps the OpenAI Responses API; LocalBackend is a
+deterministic, network-free stand-in that returns schema-valid responses with
+configurable latency, error rate and token usage for offline testing and load tests.
+Every backend can also stream a response as text deltas; backends without native
+streaming deliver the complete text as a single delta. Rejected API keys and rate limits
+surface as BackendAuthError and BackendRateLimitError so callers can switch credentials.
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from openai import OpenAI, APITimeoutError, AuthenticationError, PermissionDeniedError, RateLimitError
+
+
+class BackendTimeoutError(TimeoutError):
+    """Raised by a backend when a request exceeded its timeout"""
+
+
+class BackendError(RuntimeError):
+    """Raised by a backend when a request failed"""
+
+
+class BackendAuthError(BackendError):
+    """Raised by a backend when its API key was rejected (invalid, revoked or lacking permission)"""
+
+
+class BackendRateLimitError(BackendError):
+    """Raised by a backend when its API key hit a rate limit or exhausted its quota"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, quota_exhausted: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.quota_exhausted = quota_exhausted
+
+
+@dataclass
+class LLMUsage:
+    """Token usage of one request"""
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+@dataclass
+class LLMResponse:
+    """Backend-independent result of one structured-output request"""
+    text: str
+    model: str
+    usage: LLMUsage = field(default_factory=LLMUsage)
+    latency_seconds: float = 0.0
+    raw: Any = None
+
+
+def deliver_in_chunks(text: str, latency: float, on_delta: Callable[[str], None],
+                      timeout: Optional[float] = None, chunk_chars: int = 64):
+    """
+    Emit a finished text as deltas paced evenly over a simulated latency
+
+    Args:
+        text: Complete response text
+        latency: Total time the delivery should take in seconds
+        on_delta: Callback receiving each delta
+        timeout: Seconds after which delivery stops (None = no limit)
+        chunk_chars: Characters per delta
+
+    Raises:
+        BackendTimeoutError: If the latency exceeds the timeout (after the deltas that fit)
+    """
+    chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+    pause = latency / len(chunks)
+    elapsed = 0.0
+    for chunk in chunks:
+        if timeout is not None and elapsed + pause > timeout:
+            time.sleep(max(0.0, timeout - elapsed))
+            raise BackendTimeoutError(f"Streamed response exceeded timeout of {timeout}s")
+        if pause > 0:
+            time.sleep(pause)
+        elapsed += pause
+        on_delta(chunk)
+
+
+class LLMBackend(ABC):
+    """Interface for issuing structured-output requests to a language model"""
+
+    description = "LLM backend"
+
+    @abstractmethod
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        """
+        Request a JSON document that conforms to a strict JSON schema
+
+        Args:
+            model: Model name
+            input_text: Complete prompt
+            schema: Strict JSON schema for the structured output
+            schema_name: Name of the output format
+            temperature: Sampling temperature
+            max_output_tokens: Upper bound for generated tokens
+            timeout: Seconds before the request is cancelled (None = backend default)
+
+        Returns:
+            LLMResponse: Generated JSON text with usage and latency
+
+        Raises:
+            BackendTimeoutError: If the request exceeded the timeout
+        """
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        """
+        Request a structured response and pass its text to on_delta while it is generated
+
+        Backends without native streaming deliver the complete text as a single delta.
+
+        Args:
+            model: Model name
+            input_text: Complete prompt
+            schema: Strict JSON schema for the structured output
+            schema_name: Name of the output format
+            on_delta: Callback receiving each text delta in order
+            temperature: Sampling temperature
+            max_output_tokens: Upper bound for generated tokens
+            timeout: Seconds before the request is cancelled (None = backend default)
+
+        Returns:
+            LLMResponse: Complete generated text with usage and latency
+
+        Raises:
+            BackendTimeoutError: If the request exceeded the timeout
+        """
+        response = self.create_structured_response(
+            model, input_text, schema, schema_name,
+            temperature=temperature, max_output_tokens=max_output_tokens, timeout=timeout
+        )
+        on_delta(response.text)
+        return response
+
+
+def _translate_api_error(error: Exception) -> Exception:
+    """Map credential-related OpenAI errors to backend errors, leave everything else as is"""
+    if isinstance(error, (AuthenticationError, PermissionDeniedError)):
+        return BackendAuthError(f"OpenAI rejected the API key: {error}")
+    if isinstance(error, RateLimitError):
+        retry_after = None
+        try:
+            retry_after = float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            pass
+        quota_exhausted = getattr(error, "code", None) == "insufficient_quota"
+        return BackendRateLimitError(f"OpenAI rate limit: {error}", retry_after=retry_after,
+                                     quota_exhausted=quota_exhausted)
+    return error
+
+
+class OpenAIResponsesBackend(LLMBackend):
+    """Backend using the OpenAI Responses API with structured outputs"""
+
+    description = "OpenAI Responses API with structured outputs"
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the OpenAI client
+
+        Args:
+            api_key: OpenAI API key (default: OPENAI_API_KEY or openaikey environment variable)
+        """
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY') or os.getenv('openaikey')
+        if not self.api_key:
+            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable.")
+        self.client = OpenAI(api_key=self.api_key)
+
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        client = self.client
+        if timeout is not None:
+            # A bounded call must not be stretched by the client's own retries
+            client = self.client.with_options(timeout=timeout, max_retries=0)
+
+        start = time.perf_counter()
+        try:
+            response = client.responses.create(
+                model=model,
+                input=input_text,
+                text={
+                    "format": {
+                        "type": "json_schema",
+                        "name": schema_name,
+                        "schema": schema
+                    }
+                },
+                temperature=temperature,
+                max_output_tokens=max_output_tokens
+            )
+        except APITimeoutError as e:
+            raise BackendTimeoutError(f"OpenAI request timed out after {timeout}s") from e
+        except (AuthenticationError, PermissionDeniedError, RateLimitError) as e:
+            raise _translate_api_error(e) from e
+
+        usage = getattr(response, "usage", None)
+        return LLMResponse(
+            text=response.output[0].content[0].text,
+            model=model,
+            usage=LLMUsage(
+                input_tokens=getattr(usage, "input_tokens", 0) or 0,
+                output_tokens=getattr(usage, "output_tokens", 0) or 0
+            ),
+            latency_seconds=time.perf_counter() - start,
+            raw=response
+        )
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        client = self.client
+        if timeout is not None:
+            client = self.client.with_options(timeout=timeout, max_retries=0)
+
+        start = time.perf_counter()
+        parts = []
+        completed = None
+        try:
+            stream = client.responses.create(
+                model=model,
+                input=input_text,
+                text={
+                    "format": {
+                        "type": "json_schema",
+                        "name": schema_name,
+                        "schema": schema
+                    }
+                },
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                stream=True
+            )
+            try:
+                for event in stream:
+                    if event.type == "response.output_text.delta":
+                        parts.append(event.delta)
+                        on_delta(event.delta)
+                    elif event.type == "response.completed":
+                        completed = event.response
+                    elif event.type in ("response.failed", "error"):
+                        raise BackendError(f"OpenAI stream failed: {getattr(event, 'message', event.type)}")
+                    # The client timeout bounds each read, the deadline bounds the whole stream
+                    if timeout is not None and time.perf_counter() - start > timeout:
+                        raise BackendTimeoutError(f"OpenAI stream exceeded timeout of {timeout}s")
+            finally:
+                stream.close()
+        except APITimeoutError as e:
+            raise BackendTimeoutError(f"OpenAI request timed out after {timeout}s") from e
+        except (AuthenticationError, PermissionDeniedError, RateLimitError) as e:
+            raise _translate_api_error(e) from e
+
+        usage = getattr(completed, "usage", None)
+        return LLMResponse(
+            text="".join(parts),
+            model=model,
+            usage=LLMUsage(
+                input_tokens=getattr(usage, "input_tokens", 0) or 0,
+                output_tokens=getattr(usage, "output_tokens", 0) or 0
+            ),
+            latency_seconds=time.perf_counter() - start,
+            raw=completed
+        )
+
+
+class LocalBackend(LLMBackend):
+    """
+    Deterministic offline stand-in that fabricates schema-valid responses
+
+    Responses depend only on the seed, the prompt and how often that prompt was sent,
+    so runs are reproducible regardless of scheduling.
+    """
+
+    description = "Local deterministic stand-in backend"
+
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 input_tokens: Optional[int] = None, output_tokens: Optional[int] = None,
+                 max_items: int = 3, seed: int = 0):
+        """
+        Initialize the local backend
+
+        Args:
+            latency: Base latency per request in seconds
+            latency_jitter: Maximum additional random latency in seconds
+            error_rate: Probability (0-1) that a request fails with BackendError
+            input_tokens: Reported input tokens (default: estimated from the prompt length)
+            output_tokens: Reported output tokens (default: estimated from the response length)
+            max_items: Maximum number of generated items per array
+            seed: Seed for all random choices
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.max_items = max_items
+        self.seed = seed
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rng_for(self, model: str, input_text: str) -> random.Random:
+        fingerprint = hashlib.sha256(f"{model}\n{input_text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            call_index = self._calls.get(fingerprint, 0)
+            self._calls[fingerprint] = call_index + 1
+        return random.Random(f"{self.seed}:{fingerprint}:{call_index}")
+
+    def _generate(self, schema: Dict[str, Any], rng: random.Random, name: str = "") -> Any:
+        """Generate a value conforming to a (strict, $ref-free) JSON schema node"""
+        if "anyOf" in schema:
+            options = [option for option in schema["anyOf"] if option.get("type") != "null"] or schema["anyOf"]
+            return self._generate(rng.choice(options), rng, name)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            non_null = [t for t in schema_type if t != "null"]
+            schema_type = rng.choice(non_null) if non_null else "null"
+
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+        if schema_type == "object":
+            return {key: self._generate(sub, rng, key) for key, sub in schema.get("properties", {}).items()}
+        if schema_type == "array":
+            count = rng.randint(0 if name not in ("authors", "datasets_found", "au", "ds") else 1, self.max_items)
+            return [self._generate(schema.get("items", {}), rng, name) for _ in range(count)]
+        if schema_type in ("number", "integer"):
+            low = schema.get("minimum", 0)
+            high = schema.get("maximum", low + 100)
+            if name in ("extraction_confidence", "conf"):
+                low = max(low, 0.5)
+            value = rng.uniform(low, high)
+            return int(value) if schema_type == "integer" else round(value, 2)
+        if schema_type == "boolean":
+            return rng.random() < 0.5
+        if schema_type == "null":
+            return None
+        return self._fake_string(name, rng)
+
+    @staticmethod
+    def _fake_string(name: str, rng: random.Random) -> str:
+        """Plausible placeholder text for a string field"""
+        year = rng.randint(1995, 2024)
+        if "doi" in name:
+            return f"10.{rng.randint(1000, 9999)}/local.{rng.randint(10000, 99999)}"
+        if "year" in name:
+            return str(year)
+        if "date" in name:
+            return f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if name in ("time_period", "temporal_coverage", "t"):
+            return f"{year}/{year + rng.randint(0, 8)}"
+        if name in ("coordinates", "bbox"):
+            lat, lon = rng.uniform(47.0, 54.0), rng.uniform(6.0, 14.5)
+            return f"{lat:.2f} {lon:.2f} {lat + 1:.2f} {lon + 1:.2f}"
+        if name in ("language", "in_language", "lang"):
+            return "en"
+        if name in ("format", "encoding_format", "fmt"):
+            return rng.choice(["CSV", "Excel", "Database", ""])
+        if name in ("location", "spatial_coverage", "loc"):
+            return rng.choice(["Saxony-Anhalt, Germany", "Brandenburg, Germany", "Lower Saxony, Germany"])
+        words = ["farmland", "land", "price", "market", "transaction", "rental", "parcel", "auction", "region"]
+        return " ".join(rng.choice(words) for _ in range(rng.randint(2, 6))).capitalize()
+
+    def _prepare(self, model: str, input_text: str, schema: Dict[str, Any]):
+        """Draw latency, the injected error and the response text for one request"""
+        rng = self._rng_for(model, input_text)
+        latency = self.latency + rng.uniform(0.0, self.latency_jitter)
+        failed = rng.random() < self.error_rate
+        text = json.dumps(self._generate(schema, rng), ensure_ascii=False)
+        return latency, failed, text
+
+    def _response(self, model: str, input_text: str, text: str, latency: float) -> LLMResponse:
+        return LLMResponse(
+            text=text,
+            model=model,
+            usage=LLMUsage(
+                input_tokens=self.input_tokens if self.input_tokens is not None else len(input_text) // 4,
+                output_tokens=self.output_tokens if self.output_tokens is not None else len(text) // 4
+            ),
+            latency_seconds=latency
+        )
+
+    def create_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, temperature: float = 0.1,
+                                   max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        latency, failed, text = self._prepare(model, input_text, schema)
+
+        if timeout is not None and latency > timeout:
+            time.sleep(max(0.0, timeout))
+            raise BackendTimeoutError(f"Local request timed out after {timeout}s")
+        if latency > 0:
+            time.sleep(latency)
+        if failed:
+            raise BackendError("Injected local backend error")
+        return self._response(model, input_text, text, latency)
+
+    def stream_structured_response(self, model: str, input_text: str, schema: Dict[str, Any],
+                                   schema_name: str, on_delta: Callable[[str], None],
+                                   temperature: float = 0.1, max_output_tokens: int = 16000,
+                                   timeout: Optional[float] = None) -> LLMResponse:
+        latency, failed, text = self._prepare(model, input_text, schema)
+        if failed:
+            raise BackendError("Injected local backend error")
+        deliver_in_chunks(text, latency, on_delta, timeout=timeout)
+        return self._response(model, input_text, text, latency)
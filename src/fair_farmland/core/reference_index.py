@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Offline Bibliographic Lookup in a Local Metadata Dump
+
+A local export of bibliographic records (Crossref-style JSONL, one work per line) is
+indexed once into a compact binary file holding two sorted hash tables: normalized DOI
+-> record and normalized title -> candidate records. Every entry stores only a 64-bit
+key hash and the byte range of the record in the dump, so the index stays small for
+multi-GB dumps. Both files are memory-mapped; a lookup is a binary search over the hash
+column plus parsing a single JSON line, and needs neither network nor LLM tokens.
+
+Matched records fill or verify the journal, ISSN, volume, issue, pages, year and authors
+of an extraction.
+
+Usage:
+    python -m fair_farmland.core.reference_index build crossref_dump.jsonl [--index crossref_dump.refidx]
+    python -m fair_farmland.core.reference_index lookup crossref_dump.refidx --doi 10.1016/j.landusepol.2019.104125
+"""
+
+import re
+import json
+import mmap
+import time
+import struct
+import hashlib
+import logging
+import argparse
+import unicodedata
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .bibliographic import BibliographicRecord, LocalField, values_agree
+from .schema_registry import AuthorEntry
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"FFREFIX1"
+INDEX_SUFFIX = ".refidx"
+
+# Response-format fields a reference record can provide
+REFERENCE_FIELDS = (
+    "doi", "article_title", "journal_name", "journal_issn", "publisher", "volume", "issue",
+    "page_start", "page_end", "pagination", "publication_year", "publication_date", "authors"
+)
+
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def normalize_doi(doi: Optional[str]) -> str:
+    """Lower-case DOI without resolver prefix (DOIs are case-insensitive)"""
+    return _DOI_PREFIX.sub("", (doi or "").strip()).strip().lower()
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Title reduced to lower-case ASCII words for matching across typographic variants"""
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _first(value: Any) -> str:
+    if isinstance(value, list):
+        return str(value[0]) if value else ""
+    return str(value) if value is not None else ""
+
+
+@dataclass
+class ReferenceRecord:
+    """Bibliographic record of one work from the local dump"""
+    doi: str = ""
+    article_title: str = ""
+    journal_name: str = ""
+    journal_issn: str = ""
+    publisher: str = ""
+    volume: str = ""
+    issue: str = ""
+    page_start: str = ""
+    page_end: str = ""
+    pagination: str = ""
+    publication_year: str = ""
+    publication_date: str = ""
+    authors: List[AuthorEntry] = field(default_factory=list)
+
+    @classmethod
+    def from_crossref(cls, work: Dict[str, Any]) -> "ReferenceRecord":
+        """
+        Map a Crossref work (as in the REST API "message" or a bulk-export line)
+
+        Args:
+            work: Crossref work dictionary
+
+        Returns:
+            ReferenceRecord: Record with the fields the work provides
+        """
+        issn = ""
+        for entry in work.get("issn-type", []):
+            if entry.get("type") == "print":
+                issn = entry.get("value", "")
+        issn = issn or _first(work.get("ISSN"))
+
+        pages = _first(work.get("page"))
+        page_start, _, page_end = pages.replace("–", "-").partition("-")
+
+        date_parts = []
+        for key in ("published-print", "published", "issued", "published-online"):
+            parts = (work.get(key) or {}).get("date-parts") or []
+            if parts and parts[0] and parts[0][0]:
+                date_parts = parts[0]
+                break
+
+        authors = []
+        for author in work.get("author", []):
+            name = " ".join(part for part in (author.get("given"), author.get("family")) if part) or author.get("name", "")
+            authors.append(AuthorEntry(
+                name=name,
+                affiliation="; ".join(a.get("name", "") for a in author.get("affiliation", []) if a.get("name")),
+                orcid=(author.get("ORCID") or "").rsplit("/", 1)[-1]
+            ))
+
+        return cls(
+            doi=work.get("DOI", ""),
+            article_title=_first(work.get("title")),
+            journal_name=_first(work.get("container-title")),
+            journal_issn=issn,
+            publisher=work.get("publisher", ""),
+            volume=_first(work.get("volume")),
+            issue=_first(work.get("issue")),
+            page_start=page_start.strip(),
+            page_end=page_end.strip(),
+            pagination=f"{page_start.strip()}-{page_end.strip()}" if page_end else page_start.strip(),
+            publication_year=str(date_parts[0]) if date_parts else "",
+            publication_date="-".join(f"{int(part):02d}" for part in date_parts) if len(date_parts) == 3 else "",
+            authors=authors
+        )
+
+
+def _index_keys(line: bytes) -> Tuple[str, str]:
+    """DOI and title key of a dump line (ValueError if it is not a JSON object)"""
+    work = json.loads(line)
+    if not isinstance(work, dict):
+        raise ValueError(f"Expected a JSON object, got {type(work).__name__}")
+    if "message" in work and isinstance(work["message"], dict):
+        work = work["message"]
+    return normalize_doi(work.get("DOI")), normalize_title(_first(work.get("title")))
+
+
+def build_index(dump_path: Union[str, Path], index_path: Optional[Union[str, Path]] = None,
+                progress_every: int = 1000000) -> Dict[str, Any]:
+    """
+    Index a Crossref-style JSONL dump in one streaming pass
+
+    Only key hashes and byte ranges are kept in memory (20 bytes per key), and the
+    sort runs on numpy arrays, so dumps of several GB can be indexed on a laptop.
+
+    Args:
+        dump_path: JSONL file with one work per line
+        index_path: Index file to write (default: the dump path with suffix .refidx)
+        progress_every: Log progress every this many lines
+
+    Returns:
+        Dict: Index statistics (records, keys per table, sizes and build time)
+    """
+    dump_path = Path(dump_path)
+    index_path = Path(index_path) if index_path else dump_path.with_suffix(INDEX_SUFFIX)
+    start = time.perf_counter()
+
+    columns = {table: (array("Q"), array("Q"), array("I")) for table in ("doi", "title")}
+    records = skipped = 0
+    offset = 0
+    with open(dump_path, 'rb') as f:
+        for line in f:
+            length = len(line.rstrip(b"\r\n"))
+            if length:
+                try:
+                    keys = _index_keys(line)
+                except (ValueError, TypeError, AttributeError):
+                    # Invalid JSON, non-object records or fields of unexpected types
+                    skipped += 1
+                    keys = ("", "")
+                for table, key in zip(("doi", "title"), keys):
+                    if key:
+                        hashes, offsets, lengths = columns[table]
+                        hashes.append(_key_hash(key))
+                        offsets.append(offset)
+                        lengths.append(length)
+                records += 1
+                if records % progress_every == 0:
+                    logger.info(f"Indexed {records} records ({offset / 1e9:.2f} GB)")
+            offset += len(line)
+
+    tables = {}
+    for table, (hashes, offsets, lengths) in columns.items():
+        hashes = np.frombuffer(hashes, dtype=np.uint64) if hashes else np.zeros(0, dtype=np.uint64)
+        order = np.argsort(hashes, kind="stable")
+        tables[table] = (
+            hashes[order],
+            (np.frombuffer(offsets, dtype=np.uint64) if offsets else np.zeros(0, dtype=np.uint64))[order],
+            (np.frombuffer(lengths, dtype=np.uint32) if lengths else np.zeros(0, dtype=np.uint32))[order].astype("<u4")
+        )
+
+    stat = dump_path.stat()
+    layout = {}
+    position = 0
+    for table, (hashes, _, _) in tables.items():
+        layout[table] = {"count": int(len(hashes)), "offset": position}
+        position += len(hashes) * 20 + (-len(hashes) * 4) % 8
+    header = json.dumps({
+        "dump": str(dump_path.resolve()),
+        "dump_size": stat.st_size,
+        "dump_mtime_ns": stat.st_mtime_ns,
+        "records": records,
+        "tables": layout,
+        "built_at": datetime.now().isoformat()
+    }).encode("utf-8")
+    header += b" " * ((-(len(INDEX_MAGIC) + 4 + len(header))) % 8)
+
+    with open(index_path, 'wb') as f:
+        f.write(INDEX_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for hashes, offsets, lengths in tables.values():
+            f.write(hashes.astype("<u8").tobytes())
+            f.write(offsets.astype("<u8").tobytes())
+            f.write(lengths.tobytes())
+            f.write(b"\0" * ((-len(lengths) * 4) % 8))
+
+    stats = {
+        "dump": str(dump_path),
+        "index": str(index_path),
+        "records": records,
+        "unparseable_lines": skipped,
+        "doi_keys": layout["doi"]["count"],
+        "title_keys": layout["title"]["count"],
+        "dump_bytes": stat.st_size,
+        "index_bytes": index_path.stat().st_size,
+        "build_seconds": time.perf_counter() - start
+    }
+    logger.info(f"Indexed {records} records of {dump_path} into {index_path}")
+    return stats
+
+
+class ReferenceIndex:
+    """Memory-mapped lookup of reference records by DOI or title"""
+
+    def __init__(self, index_path: Union[str, Path], dump_path: Optional[Union[str, Path]] = None):
+        """
+        Open an index and the dump it was built from
+
+        Args:
+            index_path: Index file written by build_index
+            dump_path: Location of the dump (default: the path recorded in the index)
+
+        Raises:
+            ValueError: If the file is no reference index or the dump changed since indexing
+        """
+        self.index_path = Path(index_path)
+        with open(self.index_path, 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a reference index")
+        header_length = struct.unpack_from("<I", self._index, len(INDEX_MAGIC))[0]
+        data_start = len(INDEX_MAGIC) + 4 + header_length
+        self.header = json.loads(self._index[len(INDEX_MAGIC) + 4:data_start])
+
+        self.dump_path = Path(dump_path or self.header["dump"])
+        stat = self.dump_path.stat()
+        if stat.st_size != self.header["dump_size"] or stat.st_mtime_ns != self.header["dump_mtime_ns"]:
+            raise ValueError(f"{self.dump_path} changed since {self.index_path} was built; rebuild the index")
+        with open(self.dump_path, 'rb') as f:
+            self._dump = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+        self._tables = {}
+        for table, layout in self.header["tables"].items():
+            count, position = layout["count"], data_start + layout["offset"]
+            hashes = np.frombuffer(self._index, dtype="<u8", count=count, offset=position)
+            offsets = np.frombuffer(self._index, dtype="<u8", count=count, offset=position + count * 8)
+            lengths = np.frombuffer(self._index, dtype="<u4", count=count, offset=position + count * 16)
+            self._tables[table] = (hashes, offsets, lengths)
+
+    def __len__(self) -> int:
+        return self.header["records"]
+
+    def _works(self, table: str, key: str) -> List[Dict[str, Any]]:
+        """Dump entries whose key hash matches (callers verify the key itself)"""
+        if not key:
+            return []
+        hashes, offsets, lengths = self._tables[table]
+        key_hash = np.uint64(_key_hash(key))
+        low = int(np.searchsorted(hashes, key_hash, side="left"))
+        high = int(np.searchsorted(hashes, key_hash, side="right"))
+        works = []
+        for position in range(low, high):
+            start = int(offsets[position])
+            work = json.loads(self._dump[start:start + int(lengths[position])])
+            works.append(work["message"] if isinstance(work.get("message"), dict) else work)
+        return works
+
+    def by_doi(self, doi: str) -> Optional[ReferenceRecord]:
+        """Record with exactly this DOI (case-insensitive, resolver prefixes ignored)"""
+        key = normalize_doi(doi)
+        for work in self._works("doi", key):
+            if normalize_doi(work.get("DOI")) == key:
+                return ReferenceRecord.from_crossref(work)
+        return None
+
+    def by_title(self, title: str, year: Optional[str] = None) -> Optional[ReferenceRecord]:
+        """
+        Unique record with this normalized title
+
+        Args:
+            title: Article title
+            year: Publication year used to tell apart works with the same title
+
+        Returns:
+            Optional[ReferenceRecord]: The record, or None if there is no or no unique match
+        """
+        key = normalize_title(title)
+        candidates = [
+            ReferenceRecord.from_crossref(work) for work in self._works("title", key)
+            if normalize_title(_first(work.get("title"))) == key
+        ]
+        if len(candidates) > 1 and year:
+            candidates = [record for record in candidates if record.publication_year == str(year)]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def lookup(self, doi: Optional[str] = None, title: Optional[str] = None,
+               year: Optional[str] = None) -> Tuple[Optional[ReferenceRecord], Optional[str]]:
+        """
+        Find a record by DOI, falling back to the title
+
+        Returns:
+            Tuple: The record (or None) and what it was matched by ("doi" or "title")
+        """
+        if doi:
+            record = self.by_doi(doi)
+            if record is not None:
+                return record, "doi"
+        if title:
+            record = self.by_title(title, year)
+            if record is not None:
+                return record, "title"
+        return None, None
+
+    def close(self):
+        self._tables = {}
+        self._index.close()
+        if isinstance(self._dump, mmap.mmap):
+            self._dump.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def describes_paper(reference: ReferenceRecord, first_page: str) -> bool:
+    """
+    Whether a record matched by DOI is the paper itself: its title appears on the first page
+
+    A DOI found in a paper can belong to a cited work, whose record must not replace the
+    paper's own fields. Records without a title cannot be checked and are accepted.
+
+    Args:
+        reference: Record matched by DOI
+        first_page: Start of the paper text
+
+    Returns:
+        bool: True if the title is found (allowing for a few differing words)
+    """
+    title = normalize_title(reference.article_title)
+    if not title:
+        return True
+    text = normalize_title(first_page)
+    if title in text:
+        return True
+    words, text_words = set(title.split()), set(text.split())
+    return len(words & text_words) >= 0.8 * len(words)
+
+
+def apply_reference(record: BibliographicRecord, reference: ReferenceRecord, matched_by: str,
+                    response: Optional[Any] = None):
+    """
+    Add the fields of a matched reference record to a bibliographic record
+
+    Reference values replace parsed ones. Authors are only fixed when the reference
+    lists an affiliation for every author (the model reports affiliations as well);
+    otherwise they remain a candidate that is checked against the model's authors.
+
+    Args:
+        record: Bibliographic record of the paper (modified in place)
+        reference: Matched reference record
+        matched_by: "doi" or "title"
+        response: Model response, if the lookup happens after the request; the fields
+            then record whether the model's values agreed with the reference
+    """
+    method = f"{matched_by}_match" if response is None else f"{matched_by}_match_after_model"
+    record.reference_matched_by = matched_by
+    for name in REFERENCE_FIELDS:
+        value = getattr(reference, name)
+        if not value:
+            continue
+        confidence = 1.0
+        if name == "authors" and not all(author.affiliation for author in value):
+            confidence = 0.7
+        agreed = values_agree(value, getattr(response, name)) if response is not None else None
+        record.fields[name] = LocalField(value, confidence, method, source="reference_index", model_agreed=agreed)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build or query the offline bibliographic reference index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index a Crossref-style JSONL dump")
+    build.add_argument("dump", type=str, help="JSONL file with one work per line")
+    build.add_argument("--index", type=str, default=None, help="Index file (default: the dump path with suffix .refidx, e.g. refs.jsonl -> refs.refidx)")
+    lookup = commands.add_parser("lookup", help="Look up a work by DOI or title")
+    lookup.add_argument("index", type=str, help="Index file written by build")
+    lookup.add_argument("--doi", type=str, default=None, help="DOI of the work")
+    lookup.add_argument("--title", type=str, default=None, help="Title of the work")
+    lookup.add_argument("--year", type=str, default=None, help="Publication year to disambiguate titles")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    if args.command == "build":
+        stats = build_index(args.dump, args.index)
+        print(f"📚 Indexed {stats['records']} records ({stats['doi_keys']} DOIs, {stats['title_keys']} titles) "
+              f"in {stats['build_seconds']:.1f}s")
+        print(f"📁 Index: {stats['index']} ({stats['index_bytes'] / 1e6:.1f} MB for "
+              f"{stats['dump_bytes'] / 1e6:.1f} MB of records)")
+        return
+
+    with ReferenceIndex(args.index) as index:
+        start = time.perf_counter()
+        reference, matched_by = index.lookup(doi=args.doi, title=args.title, year=args.year)
+        elapsed = time.perf_counter() - start
+    if reference is None:
+        print(f"❌ No match ({elapsed * 1e6:.0f} µs)")
+        return
+    data = reference.__dict__.copy()
+    data["authors"] = [author.model_dump() for author in reference.authors]
+    print(f"✅ Matched by {matched_by} in {elapsed * 1e6:.0f} µs")
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
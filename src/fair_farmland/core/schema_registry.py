@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Schema Registry for Structured-Output Extraction
+
+The response format requested from the model is defined once as Pydantic models
+(ExtractionResponse and its nested entries). The registry derives the strict JSON schema
+required by the OpenAI Responses API from these models a single time, caches it, and
+identifies it with a stable content hash. The hash is stamped into every output and can
+be used as a cache or invalidation key.
+
+The derived schema has the same content as the hand-written schema it replaced, but not
+the same key order: the two are equal when compared as `json.dumps(..., sort_keys=True)`.
+The content hash and the cassette request fingerprints are computed over sorted keys, so
+neither depends on the order.
+
+CompactExtractionResponse is an opt-in alternative format with short keys in which
+absent values are null instead of empty strings. It carries the same information and
+expands losslessly into ExtractionResponse, but needs considerably fewer output tokens.
+
+Subset schemas leave out top-level fields whose values are already known (e.g. parsed
+locally from the paper), so the model does not generate them at all.
+"""
+
+import copy
+import json
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, ClassVar, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+# Name of the default response format
+EXTRACTION_SCHEMA_NAME = "farmland_metadata_extraction"
+
+# Bump when the meaning of the response format changes without changing its JSON schema
+EXTRACTION_SCHEMA_VERSION = "1"
+
+# Name of the compact response format with short keys
+COMPACT_EXTRACTION_SCHEMA_NAME = "farmland_metadata_extraction_compact"
+COMPACT_EXTRACTION_SCHEMA_VERSION = "1"
+
+
+def _drop_model_description(schema: Dict[str, Any], model: Type[BaseModel]):
+    """Keep class docstrings out of the schema; only field descriptions are prompt text"""
+    schema.pop("description", None)
+
+
+class ResponseModel(BaseModel):
+    """Base class of all response-format models"""
+    model_config = ConfigDict(json_schema_extra=_drop_model_description)
+
+
+class AuthorEntry(ResponseModel):
+    """Author as returned by the model"""
+    name: str = Field(description="Full name of the author")
+    affiliation: str = Field(description="Institutional affiliation")
+    orcid: str = Field(description="ORCID identifier if available")
+
+
+class VariableEntry(ResponseModel):
+    """Dataset variable as returned by the model"""
+    name: str = Field(description="Variable name")
+    description: str = Field(description="Variable description")
+    unit: str = Field(description="Unit of measurement")
+
+
+class DatasetEntry(ResponseModel):
+    """Dataset as returned by the model"""
+    name: str = Field(description="Dataset name/title")
+    description: str = Field(description="Detailed dataset description")
+    location: str = Field(description="Geographic location/coverage")
+    coordinates: str = Field(description="Geographic coordinates if available (lat1 lon1 lat2 lon2)")
+    time_period: str = Field(description="Temporal coverage (ISO 8601 interval format)")
+    variables: List[VariableEntry] = Field(description="Detailed list of variables/columns in dataset")
+    is_farmland_related: bool = Field(description="Whether this is farmland transaction/market data")
+    access_info: str = Field(description="Data access information")
+    license: str = Field(description="Data license")
+    format: str = Field(description="Data format (CSV, JSON, etc.)")
+    size: str = Field(description="Dataset size if mentioned")
+    doi: str = Field(description="Dataset DOI if available")
+
+
+class ExtractionResponse(ResponseModel):
+    """Complete structured output requested from the model"""
+    # Array member holding the datasets (streamed item by item)
+    dataset_field: ClassVar[str] = "datasets_found"
+
+    reasoning: str = Field(description="Explanation of the extraction process and decisions made")
+    extraction_confidence: float = Field(ge=0, le=1, description="Confidence score for the extraction (0-1)")
+    # Article metadata
+    article_title: str = Field(description="Title of the scholarly article")
+    authors: List[AuthorEntry] = Field(description="List of authors with affiliations")
+    publication_date: str = Field(description="Publication date in YYYY-MM-DD format")
+    publication_year: str = Field(description="Publication year (YYYY)")
+    # Journal and publication details
+    journal_name: str = Field(description="Name of the journal or periodical")
+    journal_issn: str = Field(description="ISSN of the journal")
+    volume: str = Field(description="Volume number")
+    issue: str = Field(description="Issue number")
+    page_start: str = Field(description="Starting page number")
+    page_end: str = Field(description="Ending page number")
+    pagination: str = Field(description="Complete page range (e.g., '123-145')")
+    # Identifiers
+    doi: str = Field(description="Digital Object Identifier (DOI) of the article")
+    pmid: str = Field(description="PubMed ID if available")
+    url: str = Field(description="URL of the article")
+    # Content metadata
+    abstract: str = Field(description="Abstract or summary of the article")
+    keywords: List[str] = Field(description="Article keywords and key terms")
+    subject_categories: List[str] = Field(description="Subject classifications or categories")
+    language: str = Field(description="Language of the article (ISO code)")
+    # Publisher and access
+    publisher: str = Field(description="Publisher name")
+    license: str = Field(description="License information")
+    is_open_access: bool = Field(description="Whether the article is open access")
+    funding: str = Field(description="Funding information")
+    # Citation
+    citation: str = Field(description="Formatted citation string")
+    # Datasets
+    datasets_found: List[DatasetEntry] = Field(
+        description="List of datasets found in the paper with comprehensive metadata"
+    )
+
+
+def _empty_to_none(value: str) -> Optional[str]:
+    return value or None
+
+
+def _none_to_empty(value: Optional[str]) -> str:
+    return value if value is not None else ""
+
+
+class CompactAuthor(ResponseModel):
+    """Author in the compact response format"""
+    n: str = Field(description="Full name of the author")
+    af: Optional[str] = Field(description="Institutional affiliation (null if not stated)")
+    id: Optional[str] = Field(description="ORCID identifier (null if not stated)")
+
+    def expand(self) -> AuthorEntry:
+        return AuthorEntry.model_construct(name=self.n, affiliation=_none_to_empty(self.af), orcid=_none_to_empty(self.id))
+
+
+class CompactVariable(ResponseModel):
+    """Dataset variable in the compact response format"""
+    n: str = Field(description="Variable name")
+    d: Optional[str] = Field(description="Variable description (null if not stated)")
+    u: Optional[str] = Field(description="Unit of measurement (null if not stated)")
+
+    def expand(self) -> VariableEntry:
+        return VariableEntry.model_construct(name=self.n, description=_none_to_empty(self.d), unit=_none_to_empty(self.u))
+
+
+class CompactDataset(ResponseModel):
+    """Dataset in the compact response format"""
+    n: str = Field(description="Dataset name/title")
+    d: str = Field(description="Detailed dataset description")
+    loc: Optional[str] = Field(description="Geographic location/coverage (null if not stated)")
+    bbox: Optional[str] = Field(description="Geographic coordinates (lat1 lon1 lat2 lon2, null if not stated)")
+    t: Optional[str] = Field(description="Temporal coverage (ISO 8601 interval format, null if not stated)")
+    v: List[CompactVariable] = Field(description="Detailed list of variables/columns in dataset")
+    farm: bool = Field(description="Whether this is farmland transaction/market data")
+    acc: Optional[str] = Field(description="Data access information (null if not stated)")
+    lic: Optional[str] = Field(description="Data license (null if not stated)")
+    fmt: Optional[str] = Field(description="Data format (CSV, JSON, etc., null if not stated)")
+    size: Optional[str] = Field(description="Dataset size (null if not stated)")
+    doi: Optional[str] = Field(description="Dataset DOI (null if not stated)")
+
+    def expand(self) -> DatasetEntry:
+        return DatasetEntry.model_construct(
+            name=self.n,
+            description=self.d,
+            location=_none_to_empty(self.loc),
+            coordinates=_none_to_empty(self.bbox),
+            time_period=_none_to_empty(self.t),
+            variables=[variable.expand() for variable in self.v],
+            is_farmland_related=self.farm,
+            access_info=_none_to_empty(self.acc),
+            license=_none_to_empty(self.lic),
+            format=_none_to_empty(self.fmt),
+            size=_none_to_empty(self.size),
+            doi=_none_to_empty(self.doi)
+        )
+
+
+class CompactExtractionResponse(ResponseModel):
+    """Structured output in the compact format; expand() restores the full format"""
+    dataset_field: ClassVar[str] = "ds"
+
+    why: str = Field(description="Explanation of the extraction process and decisions made")
+    conf: float = Field(ge=0, le=1, description="Confidence score for the extraction (0-1)")
+    title: str = Field(description="Title of the scholarly article")
+    au: List[CompactAuthor] = Field(description="List of authors with affiliations")
+    date: Optional[str] = Field(description="Publication date in YYYY-MM-DD format (null if not stated)")
+    year: Optional[str] = Field(description="Publication year (YYYY, null if not stated)")
+    jn: Optional[str] = Field(description="Name of the journal or periodical (null if not stated)")
+    issn: Optional[str] = Field(description="ISSN of the journal (null if not stated)")
+    vol: Optional[str] = Field(description="Volume number (null if not stated)")
+    iss: Optional[str] = Field(description="Issue number (null if not stated)")
+    p0: Optional[str] = Field(description="Starting page number (null if not stated)")
+    p1: Optional[str] = Field(description="Ending page number (null if not stated)")
+    pages: Optional[str] = Field(description="Complete page range (e.g., '123-145', null if not stated)")
+    doi: Optional[str] = Field(description="Digital Object Identifier (DOI) of the article (null if not stated)")
+    pmid: Optional[str] = Field(description="PubMed ID (null if not stated)")
+    url: Optional[str] = Field(description="URL of the article (null if not stated)")
+    abs: Optional[str] = Field(description="Abstract or summary of the article (null if not stated)")
+    kw: List[str] = Field(description="Article keywords and key terms")
+    subj: List[str] = Field(description="Subject classifications or categories")
+    lang: Optional[str] = Field(description="Language of the article (ISO code, null if not stated)")
+    pub: Optional[str] = Field(description="Publisher name (null if not stated)")
+    lic: Optional[str] = Field(description="License information (null if not stated)")
+    oa: bool = Field(description="Whether the article is open access")
+    fund: Optional[str] = Field(description="Funding information (null if not stated)")
+    cite: Optional[str] = Field(description="Formatted citation string (null if not stated)")
+    ds: List[CompactDataset] = Field(description="List of datasets found in the paper with comprehensive metadata")
+
+    def expand(self) -> ExtractionResponse:
+        """Restore the full response format (absent values become empty strings)"""
+        return ExtractionResponse.model_construct(
+            reasoning=self.why,
+            extraction_confidence=self.conf,
+            article_title=self.title,
+            authors=[author.expand() for author in self.au],
+            publication_date=_none_to_empty(self.date),
+            publication_year=_none_to_empty(self.year),
+            journal_name=_none_to_empty(self.jn),
+            journal_issn=_none_to_empty(self.issn),
+            volume=_none_to_empty(self.vol),
+            issue=_none_to_empty(self.iss),
+            page_start=_none_to_empty(self.p0),
+            page_end=_none_to_empty(self.p1),
+            pagination=_none_to_empty(self.pages),
+            doi=_none_to_empty(self.doi),
+            pmid=_none_to_empty(self.pmid),
+            url=_none_to_empty(self.url),
+            abstract=_none_to_empty(self.abs),
+            keywords=self.kw,
+            subject_categories=self.subj,
+            language=_none_to_empty(self.lang),
+            publisher=_none_to_empty(self.pub),
+            license=_none_to_empty(self.lic),
+            is_open_access=self.oa,
+            funding=_none_to_empty(self.fund),
+            citation=_none_to_empty(self.cite),
+            datasets_found=[dataset.expand() for dataset in self.ds]
+        )
+
+    @classmethod
+    def from_full(cls, response: ExtractionResponse) -> "CompactExtractionResponse":
+        """Compact a full-format response (inverse of expand)"""
+        return cls(
+            why=response.reasoning,
+            conf=response.extraction_confidence,
+            title=response.article_title,
+            au=[
+                CompactAuthor(n=a.name, af=_empty_to_none(a.affiliation), id=_empty_to_none(a.orcid))
+                for a in response.authors
+            ],
+            date=_empty_to_none(response.publication_date),
+            year=_empty_to_none(response.publication_year),
+            jn=_empty_to_none(response.journal_name),
+            issn=_empty_to_none(response.journal_issn),
+            vol=_empty_to_none(response.volume),
+            iss=_empty_to_none(response.issue),
+            p0=_empty_to_none(response.page_start),
+            p1=_empty_to_none(response.page_end),
+            pages=_empty_to_none(response.pagination),
+            doi=_empty_to_none(response.doi),
+            pmid=_empty_to_none(response.pmid),
+            url=_empty_to_none(response.url),
+            abs=_empty_to_none(response.abstract),
+            kw=response.keywords,
+            subj=response.subject_categories,
+            lang=_empty_to_none(response.language),
+            pub=_empty_to_none(response.publisher),
+            lic=_empty_to_none(response.license),
+            oa=response.is_open_access,
+            fund=_empty_to_none(response.funding),
+            cite=_empty_to_none(response.citation),
+            ds=[
+                CompactDataset(
+                    n=d.name,
+                    d=d.description,
+                    loc=_empty_to_none(d.location),
+                    bbox=_empty_to_none(d.coordinates),
+                    t=_empty_to_none(d.time_period),
+                    v=[
+                        CompactVariable(n=v.name, d=_empty_to_none(v.description), u=_empty_to_none(v.unit))
+                        for v in d.variables
+                    ],
+                    farm=d.is_farmland_related,
+                    acc=_empty_to_none(d.access_info),
+                    lic=_empty_to_none(d.license),
+                    fmt=_empty_to_none(d.format),
+                    size=_empty_to_none(d.size),
+                    doi=_empty_to_none(d.doi)
+                )
+                for d in response.datasets_found
+            ]
+        )
+
+
+# Top-level field names of the full format and their compact counterparts
+COMPACT_FIELD_NAMES = {
+    "reasoning": "why",
+    "extraction_confidence": "conf",
+    "article_title": "title",
+    "authors": "au",
+    "publication_date": "date",
+    "publication_year": "year",
+    "journal_name": "jn",
+    "journal_issn": "issn",
+    "volume": "vol",
+    "issue": "iss",
+    "page_start": "p0",
+    "page_end": "p1",
+    "pagination": "pages",
+    "doi": "doi",
+    "pmid": "pmid",
+    "url": "url",
+    "abstract": "abs",
+    "keywords": "kw",
+    "subject_categories": "subj",
+    "language": "lang",
+    "publisher": "pub",
+    "license": "lic",
+    "is_open_access": "oa",
+    "funding": "fund",
+    "citation": "cite",
+    "datasets_found": "ds"
+}
+
+
+class SubsetResponse(ResponseModel):
+    """Base class of response formats that leave out some top-level fields of a base format"""
+    base_model: ClassVar[Type[ResponseModel]]
+    omitted: ClassVar[Tuple[str, ...]] = ()
+
+    def restore(self) -> ResponseModel:
+        """
+        Instance of the base format with empty placeholders for the omitted fields
+
+        The caller supplies the real values of the omitted fields afterwards.
+        """
+        placeholders = {}
+        for name in self.omitted:
+            annotation = self.base_model.model_fields[name].annotation
+            placeholders[name] = [] if get_origin(annotation) is list else None
+        return self.base_model.model_construct(**self.__dict__, **placeholders)
+
+
+def to_strict_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a Pydantic JSON schema into the strict form required by the Responses API
+
+    References are inlined, titles and defaults are dropped, every object gets
+    additionalProperties: false and lists all of its properties as required.
+
+    Args:
+        schema: JSON schema as produced by BaseModel.model_json_schema()
+
+    Returns:
+        Dict: New strict schema (the input is not modified)
+    """
+    definitions = schema.get("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        if "$ref" in node:
+            target = copy.deepcopy(definitions[node["$ref"].split("/")[-1]])
+            siblings = {key: value for key, value in node.items() if key != "$ref"}
+            node = {**target, **siblings}
+
+        fixed = {}
+        for key, value in node.items():
+            if key in ("title", "default", "$defs"):
+                continue
+            if key == "properties":
+                fixed[key] = {name: resolve(sub) for name, sub in value.items()}
+            else:
+                fixed[key] = resolve(value)
+
+        if fixed.get("type") == "object":
+            fixed["additionalProperties"] = False
+            if "properties" in fixed:
+                fixed["required"] = list(fixed["properties"].keys())
+        return fixed
+
+    return resolve(schema)
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable SHA-256 content hash of a JSON schema"""
+    canonical = json.dumps(schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RegisteredSchema:
+    """
+    A derived strict schema with its identity
+
+    The schema dict is shared between all users and must not be modified.
+    """
+    name: str
+    version: str
+    model: Type[BaseModel]
+    schema: Dict[str, Any]
+    hash: str
+
+    @property
+    def short_hash(self) -> str:
+        return self.hash[:12]
+
+    @cached_property
+    def adapter(self) -> TypeAdapter:
+        """Compiled validator parsing raw response JSON straight into the response model"""
+        return TypeAdapter(self.model)
+
+    @cached_property
+    def dataset_adapter(self) -> TypeAdapter:
+        """Compiled validator for a single element of the dataset array (for streaming)"""
+        annotation = self.model.model_fields[self.model.dataset_field].annotation
+        return TypeAdapter(get_args(annotation)[0])
+
+    def cache_key(self, *parts: str) -> str:
+        """Key for caching anything derived with this schema (e.g. per-document results)"""
+        return hashlib.sha256("\x1f".join((self.hash,) + parts).encode("utf-8")).hexdigest()
+
+    def stamp(self) -> Dict[str, str]:
+        """Identity of the schema as stored in output metadata"""
+        return {"name": self.name, "version": self.version, "hash": self.hash}
+
+
+def derive_schema(name: str, model: Type[BaseModel], version: str = "1") -> RegisteredSchema:
+    """
+    Derive the strict schema of a response model without registering it
+
+    Used directly for ad-hoc formats such as per-request subset schemas.
+
+    Args:
+        name: Name of the response format (sent to the API)
+        model: Pydantic model describing the response
+        version: Semantic version of the format
+
+    Returns:
+        RegisteredSchema: Strict schema with its content hash
+    """
+    schema = to_strict_schema(model.model_json_schema())
+    return RegisteredSchema(name=name, version=version, model=model, schema=schema, hash=schema_hash(schema))
+
+
+def derive_subset_schema(base: RegisteredSchema, omit: Iterable[str]) -> RegisteredSchema:
+    """
+    Derive the strict schema of a format without some of its top-level fields
+
+    Args:
+        base: Registered schema of the base format
+        omit: Top-level field names (of the base format) to leave out
+
+    Returns:
+        RegisteredSchema: Schema of a SubsetResponse model named <base name>_partial
+    """
+    omitted = tuple(name for name in base.model.model_fields if name in set(omit))
+    fields = {
+        name: (info.annotation, info)
+        for name, info in base.model.model_fields.items()
+        if name not in omitted
+    }
+    model = create_model(f"Partial{base.model.__name__}", __base__=SubsetResponse, **fields)
+    model.base_model = base.model
+    model.omitted = omitted
+    model.dataset_field = base.model.dataset_field
+    return derive_schema(f"{base.name}_partial", model, base.version)
+
+
+class SchemaRegistry:
+    """Derives and caches strict response schemas from Pydantic models"""
+
+    def __init__(self):
+        self._models: Dict[str, tuple] = {}
+        self._cache: Dict[str, RegisteredSchema] = {}
+        self._subsets: Dict[Tuple[str, FrozenSet[str]], RegisteredSchema] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, model: Type[BaseModel], version: str = "1"):
+        """
+        Register a response model under a format name
+
+        Args:
+            name: Name of the response format (sent to the API)
+            model: Pydantic model describing the response
+            version: Semantic version of the format
+        """
+        with self._lock:
+            self._models[name] = (model, version)
+            self._cache.pop(name, None)
+            for key in [key for key in self._subsets if key[0] == name]:
+                del self._subsets[key]
+
+    def get(self, name: str = EXTRACTION_SCHEMA_NAME) -> RegisteredSchema:
+        """
+        Get the strict schema of a registered format, deriving it on first use
+
+        Args:
+            name: Name of the response format
+
+        Returns:
+            RegisteredSchema: Cached strict schema with its content hash
+        """
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            if name not in self._cache:
+                model, version = self._models[name]
+                self._cache[name] = derive_schema(name, model, version)
+            return self._cache[name]
+
+    def subset(self, name: str, omit: Iterable[str]) -> RegisteredSchema:
+        """
+        Get the strict schema of a registered format without some of its top-level fields
+
+        Subset schemas are cached per set of omitted fields. Without any omitted field the
+        registered schema itself is returned.
+
+        Args:
+            name: Name of the base response format
+            omit: Top-level field names of the base format to leave out
+
+        Returns:
+            RegisteredSchema: Cached strict subset schema
+        """
+        key = (name, frozenset(omit))
+        if not key[1]:
+            return self.get(name)
+        cached = self._subsets.get(key)
+        if cached is not None:
+            return cached
+
+        base = self.get(name)
+        with self._lock:
+            if key not in self._subsets:
+                self._subsets[key] = derive_subset_schema(base, key[1])
+            return self._subsets[key]
+
+
+# Default registry used by the extractor
+registry = SchemaRegistry()
+registry.register(EXTRACTION_SCHEMA_NAME, ExtractionResponse, EXTRACTION_SCHEMA_VERSION)
+registry.register(COMPACT_EXTRACTION_SCHEMA_NAME, CompactExtractionResponse, COMPACT_EXTRACTION_SCHEMA_VERSION)
+
+
+def get_extraction_schema(compact: bool = False) -> RegisteredSchema:
+    """
+    Strict schema of the extraction response format
+
+    Args:
+        compact: Use the compact format with short keys and nullable values
+
+    Returns:
+        RegisteredSchema: Cached strict schema
+    """
+    return registry.get(COMPACT_EXTRACTION_SCHEMA_NAME if compact else EXTRACTION_SCHEMA_NAME)
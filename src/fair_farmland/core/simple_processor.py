@@ -10,37 +10,88 @@ import os
 import json
 import logging
 from pathlib import Path
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 from markitdown import MarkItDown
 from .ai_metadata_extractor import AIMetadataExtractor
+from .cascade import CascadePolicy
+from .credential_pool import CredentialPool
+from .deadlines import Deadline, StageTimeoutError, TimeoutPolicy, run_with_timeout
+from .gap_filling import GapFillPolicy
+from .bibliographic import BibliographicPolicy
+from .reference_index import ReferenceIndex
+from .hedging import HedgingPolicy
+from .instrumentation import StageTimings
+from .llm_backends import LLMBackend
+from .standardization import StandardizationPolicy
+from .streaming import ProgressiveOutput
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _convert_pdf_worker(pdf_path: str) -> str:
+    """Convert a PDF in a child process so the conversion can be terminated on timeout"""
+    return MarkItDown().convert(pdf_path).text_content
+
+
 class SimpleFileProcessor:
     """Simple processor for farmland metadata extraction from PDF/markdown files"""
     
-    def __init__(self, output_directory: Union[str, Path] = None):
+    def __init__(self, output_directory: Union[str, Path] = None,
+                 timeouts: Optional[TimeoutPolicy] = None,
+                 hedging: Optional[HedgingPolicy] = None,
+                 cascade: Optional[CascadePolicy] = None,
+                 backend: Optional[LLMBackend] = None,
+                 compact_schema: bool = False,
+                 streaming: bool = False,
+                 gap_filling: Optional[GapFillPolicy] = None,
+                 bibliographic: Optional[BibliographicPolicy] = None,
+                 reference_index: Optional[ReferenceIndex] = None,
+                 credential_pool: Optional[CredentialPool] = None,
+                 standardization: Optional[StandardizationPolicy] = None):
         """
         Initialize the simple file processor
         
         Args:
             output_directory: Directory to save output files (default: ./output)
+            timeouts: Per-stage, per-file and run deadlines (default: unlimited)
+            hedging: Optional policy for hedging slow API requests (default: disabled)
+            cascade: Optional model cascade, cheapest model first (default: single model)
+            backend: LLM backend for extraction requests (default: OpenAI Responses API)
+            compact_schema: Request the compact response format to save output tokens
+            streaming: Stream responses and write partial results to <name>_progress.jsonl as they arrive
+            gap_filling: Optional policy for re-querying only missing fields (default: disabled)
+            bibliographic: Optional policy for fixing locally parsed bibliographic fields (default: disabled)
+            reference_index: Optional offline index of bibliographic records to fill and verify articles from
+            credential_pool: Optional pool of API keys to spread requests over (default: a single key)
+            standardization: Optional policy for writing standardized dataset categories next to
+                the raw values (default: raw values only)
         """
         self.output_directory = Path(output_directory) if output_directory else Path("output")
+        self.timeouts = timeouts or TimeoutPolicy()
+        self.streaming = streaming
         self.output_directory.mkdir(parents=True, exist_ok=True)
         
         # Initialize components
+        self.timings = StageTimings()
         self.md_converter = MarkItDown()
-        self.ai_extractor = AIMetadataExtractor()
+        self.ai_extractor = AIMetadataExtractor(
+            hedging=hedging, timings=self.timings, cascade=cascade, backend=backend,
+            compact_schema=compact_schema, gap_filling=gap_filling, bibliographic=bibliographic,
+            reference_index=reference_index, credential_pool=credential_pool,
+            standardization=standardization
+        )
         
         # Processing statistics
         self.stats = {
             "files_processed": 0,
             "files_failed": 0,
+            "files_timed_out": 0,
+            "timeouts_requeued": 0,
             "pdfs_converted": 0,
             "markdowns_processed": 0,
             "total_datasets_found": 0,
@@ -56,21 +107,28 @@ class SimpleFileProcessor:
         """Check if file is a markdown file"""
         return file_path.suffix.lower() in ['.md', '.markdown']
     
-    def convert_pdf_to_markdown(self, pdf_path: Path) -> str:
+    def convert_pdf_to_markdown(self, pdf_path: Path, timeout: Optional[float] = None) -> str:
         """
         Convert PDF file to markdown text
         
         Args:
             pdf_path: Path to PDF file
+            timeout: Seconds before the conversion is terminated (None = no limit)
             
         Returns:
             str: Markdown content
         """
         try:
             logger.info(f"Converting PDF to markdown: {pdf_path.name}")
-            result = self.md_converter.convert(str(pdf_path))
+            if timeout is None:
+                text_content = self.md_converter.convert(str(pdf_path)).text_content
+            else:
+                text_content = run_with_timeout(_convert_pdf_worker, (str(pdf_path),), timeout, "conversion")
             self.stats["pdfs_converted"] += 1
-            return result.text_content
+            return text_content
+        except StageTimeoutError:
+            logger.error(f"PDF conversion timed out for {pdf_path.name} after {timeout:.1f}s")
+            raise
         except Exception as e:
             logger.error(f"Failed to convert PDF {pdf_path.name}: {str(e)}")
             raise
@@ -95,46 +153,81 @@ class SimpleFileProcessor:
             logger.error(f"Failed to read markdown {md_path.name}: {str(e)}")
             raise
     
-    def process_single_file(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_streaming(self, markdown_content: str, file_path: Path, timeout: Optional[float] = None):
+        """
+        Extract metadata with a streamed response, writing partial results progressively
+        
+        Args:
+            markdown_content: Paper content
+            file_path: Source file (names the progress file)
+            timeout: Seconds available for the API call (None = no limit)
+            
+        Returns:
+            FarmlandMetadataExtractionResult: Result built from the fully validated response
+        """
+        progress_path = self.output_directory / f"{file_path.stem}_progress.jsonl"
+        with ProgressiveOutput(progress_path, source=file_path.name) as progress:
+            result = self.ai_extractor.extract_metadata_streaming(
+                markdown_content, file_path.name, on_event=progress.write, timeout=timeout
+            )
+        if progress.first_event_seconds is not None:
+            self.timings.record("time_to_first_result", progress.first_event_seconds)
+        return result
+    
+    def process_single_file(self, file_path: Path, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Process a single file (PDF or markdown) and extract metadata
         
         Args:
             file_path: Path to file to process
+            deadline: Deadline of the enclosing run (default: none)
             
         Returns:
-            Dict: Processing result with metadata and status
+            Dict: Processing result with metadata and status ("success", "error" or "timeout")
         """
         file_path = Path(file_path)
+        file_deadline = (deadline or Deadline()).child(self.timeouts.per_file)
         
         try:
             # Get markdown content based on file type
             if self.is_pdf_file(file_path):
-                markdown_content = self.convert_pdf_to_markdown(file_path)
+                file_deadline.check("conversion")
+                with self.timings.time("conversion"):
+                    markdown_content = self.convert_pdf_to_markdown(
+                        file_path, timeout=file_deadline.budget(self.timeouts.conversion)
+                    )
             elif self.is_markdown_file(file_path):
-                markdown_content = self.read_markdown_file(file_path)
+                with self.timings.time("read"):
+                    markdown_content = self.read_markdown_file(file_path)
             else:
                 raise ValueError(f"Unsupported file type: {file_path.suffix}")
             
             # Extract metadata using AI
             logger.info(f"Extracting metadata from: {file_path.name}")
-            extraction_result = self.ai_extractor.extract_metadata(
-                markdown_content, 
-                file_path.name
-            )
+            file_deadline.check("extraction")
+            with self.timings.time("extraction"):
+                if self.streaming:
+                    extraction_result = self._extract_streaming(
+                        markdown_content, file_path, timeout=file_deadline.budget(self.timeouts.extraction)
+                    )
+                else:
+                    extraction_result = self.ai_extractor.extract_metadata(
+                        markdown_content, 
+                        file_path.name,
+                        timeout=file_deadline.budget(self.timeouts.extraction)
+                    )
             
-            # Generate JSON-LD output
-            jsonld_data = self.ai_extractor.extract_to_jsonld(
-                markdown_content,
-                file_path.name
-            )
+            # Generate JSON-LD output from the same extraction result
+            with self.timings.time("jsonld_rendering"):
+                jsonld_bytes = self.ai_extractor.result_to_jsonld_bytes(extraction_result)
             
             # Save Schema.org JSON-LD file
             output_filename = f"{file_path.stem}_schema.json"
             output_path = self.output_directory / output_filename
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(jsonld_data, f, indent=2, ensure_ascii=False)
+            with self.timings.time("writing"):
+                with open(output_path, 'wb') as f:
+                    f.write(jsonld_bytes)
             
             # Update statistics
             self.stats["files_processed"] += 1
@@ -158,6 +251,16 @@ class SimpleFileProcessor:
             
             return result
             
+        except StageTimeoutError as e:
+            logger.warning(f"⏱️  Timed out: {file_path.name} - {str(e)}")
+            return {
+                "status": "timeout",
+                "input_file": str(file_path),
+                "stage": e.stage,
+                "error": str(e),
+                "processing_time": datetime.now().isoformat()
+            }
+            
         except Exception as e:
             self.stats["files_failed"] += 1
             error_result = {
@@ -170,6 +273,21 @@ class SimpleFileProcessor:
             logger.error(f"❌ Failed to process: {file_path.name} - {str(e)}")
             return error_result
     
+    def discover_files(self, input_directory: Union[str, Path]) -> Tuple[List[Path], List[Path]]:
+        """
+        Find all PDF and markdown files in a directory
+        
+        Args:
+            input_directory: Directory to search (not recursive)
+            
+        Returns:
+            Tuple[List[Path], List[Path]]: PDF files and markdown files
+        """
+        input_directory = Path(input_directory)
+        pdf_files = list(input_directory.glob("*.pdf"))
+        md_files = list(input_directory.glob("*.md")) + list(input_directory.glob("*.markdown"))
+        return pdf_files, md_files
+    
     def process_directory(self, input_directory: Union[str, Path]) -> Dict[str, Any]:
         """
         Process all PDF and markdown files in a directory
@@ -186,8 +304,7 @@ class SimpleFileProcessor:
             raise ValueError(f"Input directory does not exist: {input_directory}")
         
         # Find all PDF and markdown files
-        pdf_files = list(input_directory.glob("*.pdf"))
-        md_files = list(input_directory.glob("*.md")) + list(input_directory.glob("*.markdown"))
+        pdf_files, md_files = self.discover_files(input_directory)
         all_files = pdf_files + md_files
         
         if not all_files:
@@ -200,42 +317,101 @@ class SimpleFileProcessor:
         
         # Initialize processing
         self.stats["processing_start_time"] = datetime.now()
+        run_deadline = Deadline(self.timeouts.run)
         results = []
         
-        # Process each file
-        for file_path in all_files:
-            result = self.process_single_file(file_path)
+        # Process each file; timed-out files go back to the end of the queue
+        queue = deque((file_path, 1) for file_path in all_files)
+        while queue:
+            file_path, attempt = queue.popleft()
+            
+            if run_deadline.expired():
+                self.stats["files_timed_out"] += 1
+                results.append({
+                    "status": "timeout",
+                    "input_file": str(file_path),
+                    "stage": "run",
+                    "error": "Run deadline exceeded before the file was processed",
+                    "attempts": attempt - 1,
+                    "processing_time": datetime.now().isoformat()
+                })
+                continue
+            
+            result = self.process_single_file(file_path, deadline=run_deadline)
+            
+            if result["status"] == "timeout":
+                result["attempts"] = attempt
+                if attempt <= self.timeouts.retries and not run_deadline.expired():
+                    logger.info(f"Requeuing {file_path.name} (attempt {attempt + 1} of {self.timeouts.retries + 1})")
+                    self.stats["timeouts_requeued"] += 1
+                    queue.append((file_path, attempt + 1))
+                    continue
+                self.stats["files_timed_out"] += 1
+            
             results.append(result)
         
         # Finalize processing
         self.stats["processing_end_time"] = datetime.now()
+        summary = self.build_summary(results, len(all_files))
+        
+        # Save processing summary
+        summary_file = self.output_directory / "processing_summary.json"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+        
+        return summary
+    
+    def build_summary(self, results: List[Dict[str, Any]], total_files: int) -> Dict[str, Any]:
+        """
+        Build the processing summary from per-file results
+        
+        Args:
+            results: Per-file results returned by process_single_file
+            total_files: Number of files discovered in the input directory
+            
+        Returns:
+            Dict: Summary of processing results
+        """
         processing_duration = (self.stats["processing_end_time"] - self.stats["processing_start_time"]).total_seconds()
         
         # Generate summary
         successful_results = [r for r in results if r["status"] == "success"]
         failed_results = [r for r in results if r["status"] == "error"]
+        timed_out_results = [r for r in results if r["status"] == "timeout"]
         
         summary = {
             "processing_summary": {
-                "total_files": len(all_files),
+                "total_files": total_files,
                 "successful_files": len(successful_results),
                 "failed_files": len(failed_results),
+                "timed_out_files": len(timed_out_results),
+                "timeouts_requeued": self.stats["timeouts_requeued"],
                 "pdfs_converted": self.stats["pdfs_converted"],
                 "markdowns_processed": self.stats["markdowns_processed"],
                 "total_datasets_found": self.stats["total_datasets_found"],
                 "processing_duration_seconds": processing_duration,
                 "average_confidence": sum(r.get("extraction_confidence", 0) for r in successful_results) / len(successful_results) if successful_results else 0,
-                "output_directory": str(self.output_directory)
+                "output_directory": str(self.output_directory),
+                "response_schema": self.ai_extractor.schema.stamp()
             },
             "successful_extractions": successful_results,
             "failed_extractions": failed_results,
+            "timed_out_extractions": timed_out_results,
+            "stage_timings": self.timings.summary(),
             "detailed_stats": self.stats
         }
-        
-        # Save processing summary
-        summary_file = self.output_directory / "processing_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+        if self.ai_extractor.hedger is not None:
+            summary["hedging"] = self.ai_extractor.hedger.summary()
+        if self.ai_extractor.cascade_stats is not None:
+            summary["cascade"] = self.ai_extractor.cascade_stats.summary()
+        if self.ai_extractor.gap_fill_stats is not None:
+            summary["gap_filling"] = self.ai_extractor.gap_fill_stats.summary()
+        if self.ai_extractor.bibliographic_stats is not None:
+            summary["bibliographic_prefill"] = self.ai_extractor.bibliographic_stats.summary()
+        if self.ai_extractor.standardization_stats is not None:
+            summary["standardization"] = self.ai_extractor.standardization_stats.summary()
+        if self.ai_extractor.credential_pool is not None:
+            summary["credentials"] = self.ai_extractor.credential_pool.summary()
         
         return summary
     
@@ -252,6 +428,7 @@ class SimpleFileProcessor:
         print(f"   Total files: {proc_summary['total_files']}")
         print(f"   ✅ Successful: {proc_summary['successful_files']}")
         print(f"   ❌ Failed: {proc_summary['failed_files']}")
+        print(f"   ⏱️  Timed out: {proc_summary['timed_out_files']}")
         print(f"   📄 PDFs converted: {proc_summary['pdfs_converted']}")
         print(f"   📝 Markdowns processed: {proc_summary['markdowns_processed']}")
         
@@ -260,6 +437,53 @@ class SimpleFileProcessor:
         print(f"   🎯 Average confidence: {proc_summary['average_confidence']:.2f}")
         print(f"   ⏱️  Processing time: {proc_summary['processing_duration_seconds']:.1f} seconds")
         
+        api_timings = summary.get("stage_timings", {}).get("api_call")
+        if api_timings:
+            print(f"   📡 API latency p50/p99: {api_timings['p50_seconds']:.1f}s / {api_timings['p99_seconds']:.1f}s")
+        
+        hedging = summary.get("hedging")
+        if hedging:
+            print(f"   🔀 Hedged requests: {hedging['hedges_issued']} of {hedging['requests']} "
+                  f"({hedging['hedges_won']} won, {hedging['extra_output_tokens']} extra output tokens)")
+        
+        credentials = summary.get("credentials")
+        if credentials:
+            per_key = ", ".join(f"{name} {entry['requests']}" for name, entry in credentials["per_key"].items())
+            print(f"   🔑 API keys: {credentials['available_keys']} of {credentials['keys']} available, "
+                  f"requests per key: {per_key} ({credentials['failovers']} switched keys)")
+        
+        cascade = summary.get("cascade")
+        if cascade:
+            print(f"   🪜 Escalated to a larger model: {cascade['escalated_files']} of {cascade['files']} "
+                  f"({cascade['escalation_fraction']:.0%})")
+            if cascade["cost_saved_usd"] is not None:
+                print(f"   💰 Cost: ${cascade['cost_usd']:.4f} "
+                      f"(saved ${cascade['cost_saved_usd']:.4f} vs. always {cascade['models'][-1]})")
+            print(f"   ⏱️  API latency saved: {cascade['latency_saved_seconds']:.1f} seconds (estimate)")
+        
+        prefill = summary.get("bibliographic_prefill")
+        if prefill and prefill["files"]:
+            print(f"   📚 Bibliographic fields fixed without the model: {prefill['fields_fixed']} "
+                  f"in {prefill['files']} files (~{prefill['estimated_output_tokens_saved']} output tokens saved)")
+            matches = prefill["reference_matches"]
+            if matches["doi"] or matches["title"]:
+                print(f"   🔎 Found in the reference index: {matches['doi'] + matches['title']} of {prefill['files']} "
+                      f"({prefill['model_values_corrected_by_reference']} model values corrected)")
+        
+        standardization = summary.get("standardization")
+        if standardization and standardization["datasets"]:
+            fractions = ", ".join(f"{name} {entry['standardized_fraction']:.0%}"
+                                  for name, entry in standardization["fields"].items())
+            print(f"   🏷️  Standardized categories for {standardization['datasets']} datasets ({fractions})")
+        
+        gap_filling = summary.get("gap_filling")
+        if gap_filling and gap_filling["requests"]:
+            print(f"   🧩 Gaps filled: {gap_filling['fields_filled']} of {gap_filling['fields_requested']} missing fields "
+                  f"in {gap_filling['requests']} follow-up requests")
+            if gap_filling["token_fraction_of_full_extraction"] is not None:
+                print(f"   🪙 Follow-up tokens: {gap_filling['token_fraction_of_full_extraction']:.0%} "
+                      f"of the full extractions")
+        
         print(f"\n📁 Output:")
         print(f"   Directory: {proc_summary['output_directory']}")
         print(f"   Schema.org JSON files: {proc_summary['successful_files']}")
@@ -272,6 +496,11 @@ class SimpleFileProcessor:
         if proc_summary['failed_files'] > 0:
             print(f"\n⚠️  {proc_summary['failed_files']} files failed processing.")
             print(f"   Check processing_summary.json for error details")
+        
+        if proc_summary['timed_out_files'] > 0:
+            print(f"\n⏱️  {proc_summary['timed_out_files']} files timed out "
+                  f"({proc_summary['timeouts_requeued']} retries attempted).")
+            print(f"   See timed_out_extractions in processing_summary.json")
 
 
 def main():
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Inline Standardization of Extracted Datasets
+
+Every downstream consumer used to re-normalize the access conditions, formats and
+places the model returned. With a StandardizationPolicy, the extractor standardizes
+each dataset once, as its result is built (and as datasets are streamed), and stores
+the raw and the standardized value side by side in the Dataset JSON-LD under
+`standardized`, e.g.
+
+    "standardized": {
+        "accessibility": {"raw": "available on request", "value": "Restricted", "method": "fuzzy", "confidence": 0.71},
+        "data_format": {"raw": "xlsx", "value": "Excel", "method": "exact", "confidence": 1.0},
+        "country": {"raw": "Germany", "value": "Germany", "method": "unmapped", "confidence": 0.0}
+    }
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from ..utils.data_standardization import NORMALIZED_MAPPINGS, dataset_to_source, match_category
+
+# Dataset fields that can be standardized, by mapping kind
+STANDARDIZED_FIELDS = ("accessibility", "data_format", "country")
+
+# Methods reported per field; "missing" marks an empty raw value
+STANDARDIZATION_METHODS = ("exact", "normalized", "fuzzy", "unmapped", "missing")
+
+
+@dataclass
+class StandardizationPolicy:
+    """
+    Configuration for inline standardization
+
+    Attributes:
+        fuzzy: Resolve values without a mapping entry with the token-based fuzzy matcher
+        min_confidence: Lowest fuzzy confidence accepted as a match
+        fields: Fields to standardize (accessibility, data_format, country)
+    """
+    fuzzy: bool = False
+    min_confidence: float = 0.6
+    fields: List[str] = field(default_factory=lambda: list(STANDARDIZED_FIELDS))
+
+
+def standardize_dataset(dataset: Dict[str, Any], policy: StandardizationPolicy) -> Dict[str, Dict[str, Any]]:
+    """
+    Standardize the access conditions, format and country of one dataset
+
+    Args:
+        dataset: Dataset JSON-LD
+        policy: Standardization configuration
+
+    Returns:
+        Dict: Field -> raw value, standardized value, method and confidence
+    """
+    source = dataset_to_source(dataset)
+    standardized = {}
+    for name in policy.fields:
+        raw = source.get(name)
+        if raw is None or not str(raw).strip():
+            standardized[name] = {
+                "raw": raw,
+                "value": NORMALIZED_MAPPINGS[name][1],
+                "method": "missing",
+                "confidence": 0.0
+            }
+            continue
+        value, confidence, method = match_category(str(raw), name, policy.fuzzy, policy.min_confidence)
+        standardized[name] = {"raw": raw, "value": value, "method": method, "confidence": confidence}
+    return standardized
+
+
+class StandardizationStats:
+    """Counts standardization methods per field and collects unmapped values"""
+
+    def __init__(self, max_unmapped: int = 20):
+        self.datasets = 0
+        self.methods = {name: {method: 0 for method in STANDARDIZATION_METHODS} for name in STANDARDIZED_FIELDS}
+        self.unmapped: Dict[str, Dict[str, int]] = {name: {} for name in STANDARDIZED_FIELDS}
+        self.max_unmapped = max_unmapped
+        self._lock = threading.Lock()
+
+    def record(self, standardized: Dict[str, Dict[str, Any]]):
+        """
+        Record the standardization of one dataset
+
+        Args:
+            standardized: Output of standardize_dataset
+        """
+        with self._lock:
+            self.datasets += 1
+            for name, entry in standardized.items():
+                self.methods[name][entry["method"]] += 1
+                if entry["method"] == "unmapped":
+                    counts = self.unmapped[name]
+                    counts[entry["value"]] = counts.get(entry["value"], 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Methods per field and the most frequent unmapped values"""
+        with self._lock:
+            return {
+                "datasets": self.datasets,
+                "fields": {
+                    name: {
+                        **self.methods[name],
+                        "standardized_fraction": (
+                            sum(self.methods[name][method] for method in ("exact", "normalized", "fuzzy"))
+                            / self.datasets if self.datasets else 0.0
+                        ),
+                        "top_unmapped": dict(sorted(self.unmapped[name].items(),
+                                                    key=lambda item: -item[1])[:self.max_unmapped])
+                    }
+                    for name in STANDARDIZED_FIELDS
+                }
+            }
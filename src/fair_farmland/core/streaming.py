@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Incremental Parsing of Streamed Structured Output
+
+Structured outputs arrive as a stream of text deltas forming one JSON object. The
+IncrementalJSONParser scans the deltas as they arrive and reports every completed
+top-level member and every completed element of selected array members (the datasets),
+so results can be emitted long before the whole document is available. Only the text of
+the member or element being received is kept, so a long stream is scanned in linear time.
+ProgressiveOutput appends these partial results to a JSONL file as they are produced.
+"""
+
+import json
+import time
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+@dataclass
+class ParseEvent:
+    """
+    Something that became available while parsing
+
+    kind is "member" for a completed top-level member (key and value), "array_start" when
+    a selected array member begins and "item" for a completed element of it (key, index
+    and value).
+    """
+    kind: str
+    key: str
+    value: Any = None
+    index: Optional[int] = None
+
+
+class IncrementalJSONParser:
+    """Scanner for one streamed JSON object that reports members and array items as they complete"""
+
+    def __init__(self, array_keys: Iterable[str] = ()):
+        """
+        Initialize the parser
+
+        Args:
+            array_keys: Top-level keys whose array elements are reported individually
+        """
+        self.array_keys = set(array_keys)
+        self.complete = False
+        # Unconsumed tail of the stream; the *_start positions are offsets into it
+        self._buffer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._expect_value = False
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._expect_item = False
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self._items: Optional[List[Any]] = None
+
+    def feed(self, chunk: str) -> List[ParseEvent]:
+        """
+        Consume the next text delta
+
+        Args:
+            chunk: Text delta of the streamed response
+
+        Returns:
+            List[ParseEvent]: Members and items completed by this delta
+        """
+        events = []
+        start = len(self._buffer)
+        text = self._buffer = self._buffer + chunk
+
+        for pos in range(start, len(text)):
+            if self.complete:
+                break
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start:pos + 1])
+                        self._key_start = None
+                continue
+            if char in " \t\r\n":
+                continue
+
+            # Remember where the current member value or array element begins
+            if self._depth == 1 and self._expect_value:
+                self._value_start = pos
+                self._expect_value = False
+            elif self._depth == 2 and self._in_array and self._expect_item and char != "]":
+                self._item_start = pos
+                self._expect_item = False
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start is None:
+                    self._key_start = pos
+            elif char in "{[":
+                if self._depth == 1 and char == "[" and self._key in self.array_keys and pos == self._value_start:
+                    self._in_array = True
+                    self._expect_item = True
+                    self._item_index = 0
+                    self._items = []
+                    events.append(ParseEvent("array_start", self._key))
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 2 and self._in_array:
+                    self._finish_item(pos, events)
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member(pos, events)
+                    self.complete = True
+            elif char == ":" and self._depth == 1:
+                self._expect_value = True
+            elif char == ",":
+                if self._depth == 1:
+                    self._finish_member(pos, events)
+                elif self._depth == 2 and self._in_array:
+                    self._finish_item(pos, events)
+                    self._expect_item = True
+
+        self._trim()
+        return events
+
+    def _trim(self):
+        """Drop the scanned text that no pending member, key or element still needs"""
+        # A selected array member is assembled from its elements, not re-parsed from text
+        value_start = None if self._items is not None else self._value_start
+        starts = [start for start in (self._key_start, value_start, self._item_start) if start is not None]
+        keep = min(starts) if starts else len(self._buffer)
+        if not keep:
+            return
+        self._buffer = self._buffer[keep:]
+        if self._key_start is not None:
+            self._key_start -= keep
+        if self._value_start is not None:
+            self._value_start -= keep
+        if self._item_start is not None:
+            self._item_start -= keep
+
+    def _finish_member(self, end: int, events: List[ParseEvent]):
+        if self._key is not None and self._value_start is not None:
+            value = self._items if self._items is not None else json.loads(self._buffer[self._value_start:end])
+            events.append(ParseEvent("member", self._key, value))
+        self._key = None
+        self._value_start = None
+        self._items = None
+
+    def _finish_item(self, end: int, events: List[ParseEvent]):
+        if self._item_start is not None:
+            value = json.loads(self._buffer[self._item_start:end])
+            self._items.append(value)
+            events.append(ParseEvent("item", self._key, value, self._item_index))
+            self._item_index += 1
+        self._item_start = None
+
+
+class ProgressiveOutput:
+    """Appends partial extraction results to a JSONL file as soon as they are available"""
+
+    def __init__(self, path: Union[str, Path], source: str = ""):
+        """
+        Open the progressive output file (an existing file is replaced)
+
+        Args:
+            path: JSONL file to write
+            source: Source filename recorded with every event
+        """
+        self.path = Path(path)
+        self.source = source
+        self.events_written = 0
+        self.first_event_seconds: Optional[float] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, event: str, data: Dict[str, Any]):
+        """
+        Append one event and flush it to disk
+
+        Args:
+            event: Event name (article, dataset, complete or failed)
+            data: Event payload
+        """
+        elapsed = time.perf_counter() - self._start
+        line = json.dumps({
+            "event": event,
+            "source": self.source,
+            "at": datetime.now().isoformat(),
+            "elapsed_seconds": round(elapsed, 4),
+            "data": data
+        }, ensure_ascii=False)
+        with self._lock:
+            if self.first_event_seconds is None:
+                self.first_event_seconds = elapsed
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.events_written += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,3 @@
+"""Query indexes over extraction outputs."""
+
+__all__ = ["search_index", "spatial_index", "temporal_index"]
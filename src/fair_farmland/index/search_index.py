@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Full-Text and Faceted Search over Extraction Outputs
+
+An embedded SQLite FTS5 index of the JSON-LD outputs:
+
+    articles_fts   title, abstract and keywords of every article
+    datasets_fts   name, description, keywords, variable names, variable units and place
+                   of every dataset
+
+Datasets carry facet columns (standardized accessibility, format and spatial resolution,
+first and last year of temporal coverage) and articles their publication year, so a
+search such as "BVVG auction prices, plot level, covering 2007-2015" is one indexed
+query instead of a grep over JSON files. Updates are incremental: only new or changed
+documents are (re)indexed.
+
+Usage:
+    python -m fair_farmland.index.search_index build output/ --index farmland_search.db
+    python -m fair_farmland.index.search_index query "BVVG auction price" --resolution "Plot Level" --years 2007-2015
+"""
+
+import re
+import json
+import math
+import time
+import sqlite3
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..core.consolidator import article_key, discover_documents, file_hash
+from ..utils.data_standardization import NORMALIZED_MAPPINGS, dataset_to_source, match_category
+from ..utils.temporal_coverage import days_to_years, parse_temporal_coverage
+
+logger = logging.getLogger(__name__)
+
+# Version 2: temporal coverage parsed like the temporal index (NULL for open ends)
+SCHEMA_VERSION = 2
+
+# Porter stemming finds "auctions" for "auction"; diacritics are folded ("Grundstückswerte")
+TOKENIZER = "porter unicode61 remove_diacritics 2"
+
+FACETS = ("accessibility", "data_format", "spatial_resolution", "year")
+
+# Category of values that were present but matched no mapping entry
+OTHER_CATEGORY = "Other"
+
+_TABLES = ("files", "articles", "datasets", "articles_fts", "datasets_fts")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha1 TEXT);
+CREATE TABLE IF NOT EXISTS articles (
+    article_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    article_key TEXT,
+    name TEXT,
+    doi TEXT,
+    journal TEXT,
+    year INTEGER
+);
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_id INTEGER PRIMARY KEY,
+    article_id INTEGER NOT NULL,
+    position INTEGER,
+    name TEXT,
+    place TEXT,
+    accessibility TEXT,
+    data_format TEXT,
+    spatial_resolution TEXT,
+    year_start INTEGER,
+    year_end INTEGER
+);
+CREATE INDEX IF NOT EXISTS articles_path ON articles (path);
+CREATE INDEX IF NOT EXISTS articles_year ON articles (year);
+CREATE INDEX IF NOT EXISTS datasets_article ON datasets (article_id);
+CREATE INDEX IF NOT EXISTS datasets_accessibility ON datasets (accessibility);
+CREATE INDEX IF NOT EXISTS datasets_format ON datasets (data_format);
+CREATE INDEX IF NOT EXISTS datasets_resolution ON datasets (spatial_resolution);
+CREATE INDEX IF NOT EXISTS datasets_years ON datasets (year_start, year_end);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    name, abstract, keywords, tokenize = '{TOKENIZER}'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts USING fts5(
+    name, description, keywords, variables, units, place, tokenize = '{TOKENIZER}'
+);
+"""
+
+_YEAR = re.compile(r"(?<!\d)((?:1[5-9]|20)\d{2})(?!\d)")
+
+
+def first_year(text: Optional[str]) -> Optional[int]:
+    """First year mentioned in a string (publication year or date)"""
+    years = [int(year) for year in _YEAR.findall(text or "")]
+    return min(years) if years else None
+
+
+def coverage_years(temporal_coverage: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    First and last covered year of a temporal coverage string
+
+    "2007-04/2010-03" -> (2007, 2010), "since 2005" -> (2005, None), "1990s" -> (1990, 1999).
+
+    Args:
+        temporal_coverage: Temporal coverage as extracted
+
+    Returns:
+        Tuple: (first year, last year); None for an open end, (None, None) if the coverage
+            is missing or cannot be parsed
+    """
+    first, last, _ = parse_temporal_coverage(temporal_coverage)
+    years = days_to_years([first, last])
+    return tuple(None if math.isnan(year) else int(year) for year in years)
+
+
+def spatial_resolution(dataset: Dict[str, Any], fuzzy: bool = False) -> str:
+    """
+    Spatial resolution of a dataset: its spatial_resolution value or a resolution phrase
+    in its name or description
+
+    Args:
+        dataset: Dataset JSON-LD
+        fuzzy: Also resolve values without a mapping entry by token similarity
+
+    Returns:
+        str: Resolution category, "Multi-Level" if several are mentioned, OTHER_CATEGORY for
+            values without a mapping, else "Not Specified"
+    """
+    raw = dataset_to_source(dataset).get("spatial_resolution")
+    if raw is None or not str(raw).strip():
+        return NORMALIZED_MAPPINGS["spatial_resolution"][1]
+    value, _, method = match_category(str(raw), "spatial_resolution", fuzzy)
+    return OTHER_CATEGORY if method == "unmapped" else value
+
+
+def facet_category(dataset: Dict[str, Any], name: str, fuzzy: bool = False) -> str:
+    """
+    Standardized accessibility or format of a dataset for faceting
+
+    Uses the precomputed `standardized` block if the document has one, otherwise the
+    category mappings; values without a match fall into OTHER_CATEGORY.
+
+    Args:
+        dataset: Dataset JSON-LD
+        name: accessibility or data_format
+        fuzzy: Also resolve values without a mapping entry by token similarity
+
+    Returns:
+        str: Category
+    """
+    missing_value = NORMALIZED_MAPPINGS[name][1]
+    entry = (dataset.get("standardized") or {}).get(name)
+    if entry is None:
+        raw = dataset_to_source(dataset).get(name)
+        if raw is None or not str(raw).strip():
+            return missing_value
+        value, _, method = match_category(str(raw), name, fuzzy)
+    else:
+        value, method = entry.get("value"), entry.get("method")
+    if method == "missing":
+        return missing_value
+    return OTHER_CATEGORY if method == "unmapped" else value
+
+
+def quote_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches documents containing every term
+
+    Terms are quoted, so punctuation ("EUR/ha", "plot-level") becomes a phrase instead of
+    a syntax error. A trailing "*" keeps prefix matching ("auction*").
+    """
+    terms = []
+    for term in text.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _join(values: Iterable[Any]) -> str:
+    return " ".join(str(value) for value in values if value)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of articles and datasets with facet columns"""
+
+    def __init__(self, path: Union[str, Path], fuzzy: Optional[bool] = None):
+        """
+        Open (or create) an index
+
+        Args:
+            path: SQLite database file
+            fuzzy: Match facet values without a mapping entry by token similarity; the
+                index is rebuilt if it was built with the other setting (None = keep the
+                setting of the index, off for a new one)
+        """
+        self.path = Path(path)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            version = self.connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if version is not None and int(version[0]) > SCHEMA_VERSION:
+                raise ValueError(f"Unsupported search index version {version[0]} in {self.path}")
+            if version is not None and int(version[0]) < SCHEMA_VERSION:
+                logger.info(f"Rebuilding search index {self.path} (version {version[0]} -> {SCHEMA_VERSION})")
+                self._reset()
+            stored = self.connection.execute("SELECT value FROM meta WHERE key = 'fuzzy'").fetchone()
+            indexed_fuzzy = stored is not None and stored[0] == "1"
+            self.fuzzy = indexed_fuzzy if fuzzy is None else fuzzy
+            if self.fuzzy != indexed_fuzzy and len(self):
+                logger.info(f"Rebuilding search index {self.path} (fuzzy facets {'on' if self.fuzzy else 'off'})")
+                self._reset()
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('fuzzy', ?)", ("1" if self.fuzzy else "0",))
+
+    def _reset(self):
+        """Empty the index; the next update indexes every document again"""
+        for table in _TABLES:
+            self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+
+    # ------------------------------------------------------------------ updates
+
+    def _remove(self, paths: Sequence[str]):
+        for path in paths:
+            article_ids = [row[0] for row in self.connection.execute(
+                "SELECT article_id FROM articles WHERE path = ?", (path,))]
+            for article_id in article_ids:
+                dataset_ids = [(row[0],) for row in self.connection.execute(
+                    "SELECT dataset_id FROM datasets WHERE article_id = ?", (article_id,))]
+                self.connection.executemany("DELETE FROM datasets_fts WHERE rowid = ?", dataset_ids)
+                self.connection.execute("DELETE FROM datasets WHERE article_id = ?", (article_id,))
+                self.connection.execute("DELETE FROM articles_fts WHERE rowid = ?", (article_id,))
+            self.connection.execute("DELETE FROM articles WHERE path = ?", (path,))
+            self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _add(self, path: str, document: Dict[str, Any]):
+        journal = document.get("is_part_of") or {}
+        year = first_year(str(document.get("publication_year") or document.get("date_published") or ""))
+        cursor = self.connection.execute(
+            "INSERT INTO articles (path, article_key, name, doi, journal, year) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, article_key(document), document.get("name"), document.get("doi"), journal.get("name"), year)
+        )
+        article_id = cursor.lastrowid
+        self.connection.execute(
+            "INSERT INTO articles_fts (rowid, name, abstract, keywords) VALUES (?, ?, ?, ?)",
+            (article_id, document.get("name"), document.get("abstract"), _join(document.get("keywords") or []))
+        )
+        for position, dataset in enumerate(document.get("dataset") or []):
+            place = (dataset.get("spatial_coverage") or {}).get("name")
+            year_start, year_end = coverage_years(dataset.get("temporal_coverage"))
+            cursor = self.connection.execute(
+                "INSERT INTO datasets (article_id, position, name, place, accessibility, data_format, "
+                "spatial_resolution, year_start, year_end) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (article_id, position, dataset.get("name"), place,
+                 facet_category(dataset, "accessibility", self.fuzzy), facet_category(dataset, "data_format", self.fuzzy),
+                 spatial_resolution(dataset, self.fuzzy), year_start, year_end)
+            )
+            variables = dataset.get("variable_measured") or []
+            self.connection.execute(
+                "INSERT INTO datasets_fts (rowid, name, description, keywords, variables, units, place) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cursor.lastrowid, dataset.get("name"), dataset.get("description"),
+                 _join(dataset.get("keywords") or []),
+                 _join(f"{variable.get('name') or ''} {variable.get('description') or ''}" for variable in variables),
+                 _join(variable.get("unit_text") for variable in variables), place)
+            )
+
+    def update(self, inputs: Iterable[Union[str, Path]], prune: bool = False) -> Dict[str, int]:
+        """
+        Index new and changed documents
+
+        Size and modification time short-cut the check for unchanged documents, the content
+        hash decides. Each document is replaced in its own transaction, so readers never see
+        a half-indexed document and an interrupted update resumes where it stopped. The
+        full-text segments are merged afterwards if anything changed.
+
+        Args:
+            inputs: Output directories and individual documents
+            prune: Also remove documents that are no longer among the inputs
+
+        Returns:
+            Dict: Documents added, replaced, unchanged, pruned and failed
+        """
+        counts = {"added": 0, "replaced": 0, "unchanged": 0, "pruned": 0, "failed": 0}
+        known = {row[0]: row[1:] for row in self.connection.execute("SELECT path, size, mtime_ns, sha1 FROM files")}
+        documents = discover_documents(inputs)
+
+        for document_path in documents:
+            path = str(document_path)
+            stat = document_path.stat()
+            entry = known.get(path)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                counts["unchanged"] += 1
+                continue
+            content_hash = file_hash(document_path)
+            if entry and entry[2] == content_hash:
+                with self.connection:
+                    self.connection.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, path))
+                counts["unchanged"] += 1
+                continue
+            try:
+                with open(document_path, 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping {document_path.name}: {e}")
+                counts["failed"] += 1
+                continue
+            with self.connection:
+                if entry:
+                    self._remove([path])
+                self._add(path, document)
+                self.connection.execute("INSERT INTO files VALUES (?, ?, ?, ?)",
+                                        (path, stat.st_size, stat.st_mtime_ns, content_hash))
+            counts["replaced" if entry else "added"] += 1
+
+        if prune:
+            stale = sorted(set(known) - {str(path) for path in documents})
+            with self.connection:
+                self._remove(stale)
+            counts["pruned"] = len(stale)
+        if counts["added"] or counts["replaced"] or counts["pruned"]:
+            self.optimize()
+        return counts
+
+    def optimize(self):
+        """Merge the full-text segments written by many small transactions into one (faster ranking)"""
+        with self.connection:
+            self.connection.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+            self.connection.execute("INSERT INTO datasets_fts (datasets_fts) VALUES ('optimize')")
+
+    # ------------------------------------------------------------------ queries
+
+    @staticmethod
+    def _filters(accessibility: Optional[Sequence[str]] = None, data_format: Optional[Sequence[str]] = None,
+                 resolution: Optional[Sequence[str]] = None,
+                 years: Optional[Tuple[int, int]] = None) -> Tuple[List[str], List[Any]]:
+        """SQL conditions on the datasets table (alias d) and their parameters"""
+        conditions, parameters = [], []
+        for column, values in (("accessibility", accessibility), ("data_format", data_format),
+                               ("spatial_resolution", resolution)):
+            if values:
+                conditions.append(f"d.{column} IN ({', '.join('?' for _ in values)})")
+                parameters.extend(values)
+        if years:
+            # NULL is an open end; datasets without any coverage have neither year
+            conditions.append("COALESCE(d.year_start, d.year_end) IS NOT NULL "
+                              "AND (d.year_start IS NULL OR d.year_start <= ?) "
+                              "AND (d.year_end IS NULL OR d.year_end >= ?)")
+            parameters.extend([years[1], years[0]])
+        return conditions, parameters
+
+    def _dataset_query(self, columns: str, query: Optional[str], published: Optional[Tuple[int, int]],
+                       filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        conditions, parameters = self._filters(**filters)
+        sql = f"SELECT {columns} FROM datasets d JOIN articles a ON a.article_id = d.article_id"
+        if query:
+            sql = (f"SELECT {columns} FROM datasets_fts JOIN datasets d ON d.dataset_id = datasets_fts.rowid "
+                   f"JOIN articles a ON a.article_id = d.article_id")
+            conditions.insert(0, "datasets_fts MATCH ?")
+            parameters.insert(0, query)
+        if published:
+            conditions.append("a.year BETWEEN ? AND ?")
+            parameters.extend(published)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql, parameters
+
+    def search(self, query: Optional[str] = None, raw: bool = False, limit: int = 20,
+               published: Optional[Tuple[int, int]] = None, **filters) -> List[Dict[str, Any]]:
+        """
+        Datasets matching a full-text query and facet filters, best matches first
+
+        Args:
+            query: Free text (every term must match) or, with raw, an FTS5 query such as
+                'units:eur AND (bvvg OR auction*)'; None lists datasets by facets only
+            raw: Pass the query to FTS5 unchanged
+            limit: Maximum number of hits
+            published: Publication years (first, last) of the article
+            **filters: accessibility, data_format, resolution (lists of categories) and
+                years (first, last) that the temporal coverage must overlap
+
+        Returns:
+            List[Dict]: Hits with dataset and article fields, BM25 score and a text snippet
+        """
+        match = query if raw or not query else quote_query(query)
+        columns = ("d.dataset_id, d.name, d.place, d.accessibility, d.data_format, d.spatial_resolution, "
+                   "d.year_start, d.year_end, a.name, a.doi, a.journal, a.year, a.path")
+        if match:
+            columns += ", bm25(datasets_fts, 10.0, 5.0, 5.0, 3.0, 3.0, 2.0), " \
+                       "snippet(datasets_fts, -1, '[', ']', '…', 12)"
+        else:
+            columns += ", 0.0, NULL"
+        sql, parameters = self._dataset_query(columns, match, published, filters)
+        sql += (" ORDER BY 14" if match else " ORDER BY a.year DESC, d.dataset_id") + " LIMIT ?"
+        keys = ("dataset_id", "name", "place", "accessibility", "data_format", "spatial_resolution", "year_start",
+                "year_end", "article", "doi", "journal", "publication_year", "source_file", "score", "snippet")
+        return [dict(zip(keys, row)) for row in self.connection.execute(sql, parameters + [limit])]
+
+    def search_articles(self, query: str, raw: bool = False, limit: int = 20,
+                        published: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Articles whose title, abstract or keywords match a full-text query
+
+        Args:
+            query: Free text or, with raw, an FTS5 query
+            raw: Pass the query to FTS5 unchanged
+            limit: Maximum number of hits
+            published: Publication years (first, last)
+
+        Returns:
+            List[Dict]: Hits with article fields, BM25 score and a text snippet
+        """
+        sql = ("SELECT a.article_id, a.name, a.doi, a.journal, a.year, a.path, "
+               "bm25(articles_fts, 10.0, 3.0, 5.0), snippet(articles_fts, -1, '[', ']', '…', 12) "
+               "FROM articles_fts JOIN articles a ON a.article_id = articles_fts.rowid WHERE articles_fts MATCH ?")
+        parameters: List[Any] = [query if raw else quote_query(query)]
+        if published:
+            sql += " AND a.year BETWEEN ? AND ?"
+            parameters.extend(published)
+        keys = ("article_id", "name", "doi", "journal", "publication_year", "source_file", "score", "snippet")
+        return [dict(zip(keys, row)) for row in self.connection.execute(sql + " ORDER BY 7 LIMIT ?", parameters + [limit])]
+
+    def facet_counts(self, query: Optional[str] = None, raw: bool = False,
+                     published: Optional[Tuple[int, int]] = None, **filters) -> Dict[str, Dict[str, int]]:
+        """
+        Number of matching datasets per facet value (same arguments as search)
+
+        Returns:
+            Dict: Facet (accessibility, data_format, spatial_resolution, year) -> value -> datasets;
+                year counts by publication year of the article
+        """
+        match = query if raw or not query else quote_query(query)
+        counts = {}
+        for facet in FACETS:
+            column = "a.year" if facet == "year" else f"d.{facet}"
+            sql, parameters = self._dataset_query(f"{column}, COUNT(*)", match, published, filters)
+            rows = self.connection.execute(f"{sql} GROUP BY 1 ORDER BY 2 DESC", parameters)
+            counts[facet] = {str(value): count for value, count in rows}
+        return counts
+
+    def statistics(self) -> Dict[str, int]:
+        """Indexed documents, articles and datasets"""
+        return {
+            "documents": self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            "articles": self.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+            "datasets": len(self)
+        }
+
+
+def _year_range(text: str) -> Tuple[int, int]:
+    """'2007-2015' or '2010' -> (first, last)"""
+    years = [int(year) for year in re.split(r"\s*[-–/:]\s*", text.strip()) if year]
+    if not 1 <= len(years) <= 2:
+        raise argparse.ArgumentTypeError(f"Expected YEAR or FIRST-LAST, got {text!r}")
+    return min(years), max(years)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build or query the full-text search index of extraction outputs")
+    parser.add_argument("--index", type=str, default="farmland_search.db",
+                        help="Index database (default: farmland_search.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index new and changed outputs")
+    build.add_argument("inputs", nargs="+", help="Output directories or *_schema.json documents")
+    build.add_argument("--prune", action="store_true", help="Remove documents that are no longer among the inputs")
+    build.add_argument("--fuzzy", action="store_true",
+                       help="Match facet values without a mapping entry by token similarity (rebuilds on change)")
+    query = commands.add_parser("query", help="Search datasets (or articles)")
+    query.add_argument("text", nargs="?", default=None, help="Free-text query; omit to filter by facets only")
+    query.add_argument("--raw", action="store_true", help="Pass the query to FTS5 unchanged (column filters, OR, NEAR)")
+    query.add_argument("--articles", action="store_true", help="Search article titles, abstracts and keywords")
+    query.add_argument("--accessibility", action="append", help="Accessibility category (repeatable)")
+    query.add_argument("--format", dest="data_format", action="append", help="Format category (repeatable)")
+    query.add_argument("--resolution", action="append", help="Spatial resolution category (repeatable)")
+    query.add_argument("--years", type=_year_range, default=None,
+                       help="Years the temporal coverage must overlap, e.g. 2007-2015")
+    query.add_argument("--published", type=_year_range, default=None, help="Publication years, e.g. 2018-2024")
+    query.add_argument("--limit", type=int, default=20, help="Maximum hits (default: 20)")
+    query.add_argument("--facets", action="store_true", help="Also print facet counts of the matching datasets")
+    query.add_argument("--json", action="store_true", help="Print hits as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    with SearchIndex(args.index, fuzzy=args.fuzzy if args.command == "build" else None) as index:
+        if args.command == "build":
+            start = time.perf_counter()
+            counts = index.update(args.inputs, prune=args.prune)
+            stats = index.statistics()
+            print(f"🔎 Indexed in {time.perf_counter() - start:.1f}s: ➕ {counts['added']} added, "
+                  f"🔁 {counts['replaced']} replaced, ⏭️  {counts['unchanged']} unchanged, "
+                  f"🗑️  {counts['pruned']} pruned, ❌ {counts['failed']} failed")
+            print(f"📁 Index: {Path(args.index).absolute()} ({stats['articles']} articles, {stats['datasets']} datasets)")
+            return
+
+        if args.articles and not args.text:
+            parser.error("--articles needs a query text")
+        filters = dict(accessibility=args.accessibility, data_format=args.data_format,
+                       resolution=args.resolution, years=args.years)
+        start = time.perf_counter()
+        try:
+            if args.articles:
+                hits = index.search_articles(args.text, raw=args.raw, limit=args.limit, published=args.published)
+            else:
+                hits = index.search(args.text, raw=args.raw, limit=args.limit, published=args.published, **filters)
+        except sqlite3.OperationalError as e:
+            parser.error(f"Invalid query: {e}")
+        elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+    else:
+        for hit in hits:
+            if args.articles:
+                print(f"📄 {hit['name']} ({hit['journal']}, {hit['publication_year']})")
+            else:
+                coverage = (f"{hit['year_start'] or '..'}–{hit['year_end'] or '..'}"
+                            if hit["year_start"] or hit["year_end"] else "no coverage")
+                print(f"🗂️  {hit['name']} [{hit['accessibility']} · {hit['data_format']} · "
+                      f"{hit['spatial_resolution']} · {coverage}]")
+                print(f"    📄 {hit['article']} ({hit['journal']}, {hit['publication_year']})")
+            if hit["snippet"]:
+                print(f"    {hit['snippet']}")
+        print(f"{len(hits)} hits in {elapsed * 1000:.1f} ms")
+
+    if args.facets and not args.articles:
+        with SearchIndex(args.index) as index:
+            counts = index.facet_counts(args.text, raw=args.raw, published=args.published, **filters)
+        for facet, values in counts.items():
+            print(f"   {facet}: " + ", ".join(f"{value} ({count})" for value, count in values.items()))
+
+
+if __name__ == "__main__":
+    main()
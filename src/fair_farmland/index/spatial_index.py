@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Spatial Index over Dataset Bounding Boxes
+
+Schema.org `GeoShape.box` values are free text ("lat1 lon1 lat2 lon2", sometimes a
+single "lat lon" point, sometimes with swapped coordinates). This module parses them
+once into a float array of (south, west, north, east) boxes in WGS84 degrees and
+indexes the boxes of all datasets of a consolidated store in a uniform grid, so
+intersection, containment and point queries touch only the boxes of the grid cells the
+query overlaps.
+
+Datasets whose place has no box, or only a point, are located with a small gazetteer of
+Germany and its states ("Lower Saxony, Germany", "Sachsen-Anhalt", "Eastern Germany").
+
+Usage:
+    python -m fair_farmland.index.spatial_index farmland_store --region "Saxony-Anhalt"
+    python -m fair_farmland.index.spatial_index farmland_store --point 52.13 11.62
+"""
+
+import re
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core.consolidator import load_table
+from ..core.reference_index import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Parse status per box, stored as an index into this tuple
+BOX_STATUSES = ("valid", "point", "swapped", "gazetteer", "missing", "invalid")
+VALID, POINT, SWAPPED, GAZETTEER, MISSING, INVALID = range(len(BOX_STATUSES))
+
+QUERY_MODES = ("intersects", "contains", "within")
+
+# Approximate bounding boxes (south, west, north, east) with alternative names
+GERMAN_REGIONS = {
+    "Germany": ((47.27, 5.87, 55.06, 15.04), ("Deutschland", "Federal Republic of Germany")),
+    "Eastern Germany": ((50.17, 9.88, 54.68, 15.04), ("East Germany", "New Länder", "Neue Bundesländer")),
+    "Western Germany": ((47.27, 5.87, 55.06, 13.84), ("West Germany", "Old Länder", "Alte Bundesländer")),
+    "Baden-Württemberg": ((47.53, 7.51, 49.79, 10.50), ()),
+    "Bavaria": ((47.27, 8.98, 50.56, 13.84), ("Bayern",)),
+    "Berlin": ((52.34, 13.09, 52.68, 13.76), ()),
+    "Brandenburg": ((51.36, 11.27, 53.56, 14.77), ()),
+    "Bremen": ((53.01, 8.48, 53.61, 8.99), ()),
+    "Hamburg": ((53.40, 8.42, 53.96, 10.33), ()),
+    "Hesse": ((49.39, 7.77, 51.66, 10.24), ("Hessen",)),
+    "Lower Saxony": ((51.29, 6.65, 53.89, 11.60), ("Niedersachsen",)),
+    "Mecklenburg-Western Pomerania": ((53.11, 10.59, 54.68, 14.41), ("Mecklenburg-Vorpommern",)),
+    "North Rhine-Westphalia": ((50.32, 5.87, 52.53, 9.46), ("Nordrhein-Westfalen", "NRW")),
+    "Rhineland-Palatinate": ((48.97, 6.11, 50.94, 8.51), ("Rheinland-Pfalz",)),
+    "Saarland": ((49.11, 6.36, 49.64, 7.40), ()),
+    "Saxony": ((50.17, 11.87, 51.68, 15.04), ("Sachsen", "Free State of Saxony")),
+    "Saxony-Anhalt": ((50.94, 10.56, 53.04, 13.19), ("Sachsen-Anhalt",)),
+    "Schleswig-Holstein": ((53.36, 7.87, 55.06, 11.31), ()),
+    "Thuringia": ((50.20, 9.88, 51.65, 12.65), ("Thüringen",))
+}
+
+_GAZETTEER_KEYS = {
+    normalize_title(alias): box
+    for name, (box, aliases) in GERMAN_REGIONS.items()
+    for alias in (name,) + aliases
+}
+
+
+def parse_boxes(boxes: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse GeoShape box strings into normalized WGS84 boxes
+
+    Accepts "lat1 lon1 lat2 lon2" (corners in any order) and "lat lon" points, separated
+    by spaces or commas. Longitudes are wrapped into [-180, 180); a box whose latitudes
+    are out of range but whose longitudes are not is read with swapped coordinates.
+
+    Args:
+        boxes: Box strings (None for missing)
+
+    Returns:
+        Tuple: (float array of shape (n, 4) with south, west, north, east, NaN where
+            missing or invalid; int8 array of BOX_STATUSES indexes)
+    """
+    # Boxes repeat (one per dataset of a place): parse the distinct strings only
+    codes, distinct = pd.factorize(pd.Series(boxes, dtype=object).astype("string").str.strip().replace("", None))
+    parsed, status = _parse_distinct_boxes(pd.Series(np.asarray(distinct, dtype=object), dtype="string"))
+    parsed = np.vstack([parsed, np.full((1, 4), np.nan)])[codes]
+    status = np.append(status, np.int8(MISSING))[codes]
+    return parsed, status
+
+
+def _parse_distinct_boxes(text: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    parts = text.str.split(r"[\s,;]+", regex=True, expand=True)
+    token_counts = parts.notna().sum(axis=1).to_numpy() if parts.shape[1] else np.zeros(len(text), dtype=np.int64)
+    numbers = parts.reindex(columns=range(4)).apply(pd.to_numeric, errors="coerce")
+    values = numbers.to_numpy(dtype=float, na_value=np.nan, copy=True)
+    numeric = (~np.isnan(values)).sum(axis=1)
+
+    status = np.full(len(values), INVALID, dtype=np.int8)
+    point = (token_counts == 2) & (numeric == 2)
+    full = (token_counts == 4) & (numeric == 4)
+    values[point, 2:] = values[point, :2]
+
+    latitudes, longitudes = values[:, 0::2].copy(), values[:, 1::2].copy()
+    swapped = (full | point) & (np.abs(latitudes) > 90).any(axis=1) & (np.abs(longitudes) <= 90).all(axis=1)
+    latitudes[swapped], longitudes[swapped] = values[swapped][:, 1::2], values[swapped][:, 0::2]
+    in_range = (np.abs(latitudes) <= 90).all(axis=1) & (np.abs(longitudes) <= 360).all(axis=1)
+    longitudes = (longitudes + 180.0) % 360.0 - 180.0
+
+    parsed = np.column_stack([latitudes.min(axis=1), longitudes.min(axis=1),
+                              latitudes.max(axis=1), longitudes.max(axis=1)])
+    status[full & in_range] = VALID
+    status[point & in_range] = POINT
+    status[swapped & in_range] = SWAPPED
+    parsed[status >= MISSING] = np.nan
+    return parsed, status
+
+
+def gazetteer_box(place: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Bounding box of a place name from the gazetteer
+
+    Comma-separated parts are tried from the most specific ("Saxony-Anhalt, Germany"
+    -> Saxony-Anhalt); a part naming several regions ("Lower Saxony and Saxony-Anhalt")
+    gives the box around all of them.
+
+    Args:
+        place: Place name
+
+    Returns:
+        Tuple or None: (south, west, north, east)
+    """
+    for part in (place or "").split(","):
+        names = re.split(r"\s+(?:and|und|&)\s+|/", part.strip())
+        found = [_GAZETTEER_KEYS.get(normalize_title(name)) for name in names if name.strip()]
+        if found and all(found):
+            found = np.array(found)
+            return (float(found[:, 0].min()), float(found[:, 1].min()),
+                    float(found[:, 2].max()), float(found[:, 3].max()))
+    return None
+
+
+def place_boxes(places: pd.Series, boxes: pd.Series, use_gazetteer: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parsed boxes of places, located by name where the box is missing or only a point
+
+    Args:
+        places: Place names
+        boxes: GeoShape box strings of the same places
+        use_gazetteer: Locate places without a box (or with a point only) by name
+
+    Returns:
+        Tuple: (boxes, status) as returned by parse_boxes; located places get status gazetteer
+    """
+    boxes, status = parse_boxes(boxes.tolist())
+    if use_gazetteer:
+        # A single point is where the model put the place, not its extent
+        missing = np.flatnonzero((status == MISSING) | (status == POINT))
+        names = places.iloc[missing]
+        located = {place: gazetteer_box(place) for place in names.dropna().unique()}
+        for row, place in zip(missing, names):
+            box = located.get(place)
+            if box is not None:
+                boxes[row], status[row] = box, GAZETTEER
+    return boxes, status
+
+
+class SpatialIndex:
+    """Uniform-grid index over dataset bounding boxes"""
+
+    def __init__(self, datasets: pd.DataFrame, boxes: np.ndarray, cell_degrees: float = 1.0,
+                 max_cells_per_box: int = 4096):
+        """
+        Index boxes
+
+        Args:
+            datasets: One row per box (returned with the query results)
+            boxes: Float array (n, 4) of south, west, north, east; rows with NaN are not indexed
+            cell_degrees: Grid cell size in degrees
+            max_cells_per_box: Boxes spanning more cells are kept in a list that every query checks
+        """
+        self.datasets = datasets.reset_index(drop=True)
+        self.boxes = np.asarray(boxes, dtype=float)
+        self.cell_degrees = cell_degrees
+        self.columns = int(np.ceil(360.0 / cell_degrees))
+
+        indexed = np.flatnonzero(~np.isnan(self.boxes).any(axis=1))
+        first_row, first_column, last_row, last_column = self._cell_ranges(self.boxes[indexed])
+        heights, widths = last_row - first_row + 1, last_column - first_column + 1
+        spans = heights * widths
+        large = spans > max_cells_per_box
+        self.large_boxes = indexed[large]
+
+        small = ~large
+        ids, counts = indexed[small], spans[small]
+        owner = np.repeat(np.arange(len(ids)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = first_row[small][owner] + offsets // widths[small][owner]
+        columns = first_column[small][owner] + offsets % widths[small][owner]
+        cells = rows * self.columns + columns
+        order = np.argsort(cells, kind="stable")
+        self.cells = cells[order]
+        self.cell_boxes = ids[owner][order]
+
+    def __len__(self) -> int:
+        return int((~np.isnan(self.boxes).any(axis=1)).sum())
+
+    @classmethod
+    def from_store(cls, store: Union[str, Path], use_gazetteer: bool = True, **kwargs) -> "SpatialIndex":
+        """
+        Index the datasets of a consolidated store
+
+        Args:
+            store: Store directory written by fair_farmland.core.consolidator
+            use_gazetteer: Locate places without a box (or with a point only) by name
+            **kwargs: cell_degrees, max_cells_per_box
+
+        Returns:
+            SpatialIndex: Index whose datasets frame has dataset_key, article_key, name, place,
+                box, box_status and the parsed south, west, north, east
+        """
+        datasets = load_table(store, "datasets", columns=["dataset_key", "article_key", "name", "place_key"])
+        places = load_table(store, "places", columns=["place_key", "name", "box"]).rename(columns={"name": "place"})
+        datasets = datasets.merge(places, on="place_key", how="left")
+        boxes, status = place_boxes(datasets["place"], datasets["box"], use_gazetteer)
+        datasets["box_status"] = pd.Categorical.from_codes(status, categories=BOX_STATUSES)
+        datasets[["south", "west", "north", "east"]] = boxes
+        return cls(datasets.drop(columns=["place_key"]), boxes, **kwargs)
+
+    def _cell_ranges(self, boxes: np.ndarray) -> Tuple[np.ndarray, ...]:
+        rows = np.floor((np.clip(boxes[:, [0, 2]], -90, 90) + 90.0) / self.cell_degrees).astype(np.int64)
+        columns = np.floor((boxes[:, [1, 3]] + 180.0) / self.cell_degrees).astype(np.int64)
+        columns = np.clip(columns, 0, self.columns - 1)
+        return rows[:, 0], columns[:, 0], rows[:, 1], columns[:, 1]
+
+    def candidates(self, box: Sequence[float]) -> np.ndarray:
+        """Indexes of the boxes sharing a grid cell with a query box (a superset of the hits)"""
+        first_row, first_column, last_row, last_column = (
+            int(value[0]) for value in self._cell_ranges(np.asarray([box], dtype=float))
+        )
+        rows = np.arange(first_row, last_row + 1)
+        columns = np.arange(first_column, last_column + 1)
+        query_cells = (rows[:, None] * self.columns + columns[None, :]).ravel()
+        starts = np.searchsorted(self.cells, query_cells, side="left")
+        ends = np.searchsorted(self.cells, query_cells, side="right")
+        counts = ends - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        # A box spanning several query cells appears once per cell
+        selected = np.zeros(len(self.boxes), dtype=bool)
+        selected[self.cell_boxes[positions]] = True
+        selected[self.large_boxes] = True
+        return np.flatnonzero(selected)
+
+    def query(self, box: Sequence[float], mode: str = "intersects") -> pd.DataFrame:
+        """
+        Datasets whose box intersects, contains or lies within a query box
+
+        Args:
+            box: (south, west, north, east) in degrees
+            mode: intersects, contains (the dataset covers the whole query box) or within
+
+        Returns:
+            pd.DataFrame: Matching datasets with `coverage`, the fraction of the query box
+                they cover, largest first
+        """
+        if mode not in QUERY_MODES:
+            raise ValueError(f"Unknown query mode: {mode} (expected one of {', '.join(QUERY_MODES)})")
+        south, west, north, east = (float(value) for value in box)
+        ids = self.candidates((south, west, north, east))
+        s, w, n, e = self.boxes[ids].T
+        if mode == "intersects":
+            hit = (s <= north) & (n >= south) & (w <= east) & (e >= west)
+        elif mode == "contains":
+            hit = (s <= south) & (n >= north) & (w <= west) & (e >= east)
+        else:
+            hit = (s >= south) & (n <= north) & (w >= west) & (e <= east)
+        ids, s, w, n, e = ids[hit], s[hit], w[hit], n[hit], e[hit]
+
+        area = (north - south) * (east - west)
+        overlap = (np.clip(np.minimum(n, north) - np.maximum(s, south), 0, None)
+                   * np.clip(np.minimum(e, east) - np.maximum(w, west), 0, None))
+        result = self.datasets.iloc[ids].copy()
+        result["coverage"] = overlap / area if area > 0 else (overlap == 0).astype(float)
+        return result.sort_values("coverage", ascending=False, kind="stable")
+
+    def query_point(self, latitude: float, longitude: float) -> pd.DataFrame:
+        """Datasets whose box covers a point"""
+        return self.query((latitude, longitude, latitude, longitude), mode="contains")
+
+    def query_region(self, name: str, mode: str = "intersects") -> pd.DataFrame:
+        """
+        Datasets covering a gazetteer region, e.g. "Saxony-Anhalt"
+
+        Args:
+            name: Region name or alias (see GERMAN_REGIONS)
+            mode: intersects, contains or within
+
+        Returns:
+            pd.DataFrame: See query
+        """
+        box = gazetteer_box(name)
+        if box is None:
+            raise ValueError(f"Unknown region: {name}")
+        return self.query(box, mode)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Spatial queries over the datasets of a consolidated store")
+    parser.add_argument("store", type=str, help="Store directory written by fair-farmland-consolidate")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--region", type=str, help="Gazetteer region, e.g. 'Saxony-Anhalt'")
+    target.add_argument("--bbox", type=float, nargs=4, metavar=("SOUTH", "WEST", "NORTH", "EAST"), help="Query box")
+    target.add_argument("--point", type=float, nargs=2, metavar=("LAT", "LON"), help="Datasets covering a point")
+    parser.add_argument("--mode", choices=QUERY_MODES, default="intersects", help="Box relation (default: intersects)")
+    parser.add_argument("--cell-degrees", type=float, default=1.0, help="Grid cell size (default: 1.0)")
+    parser.add_argument("--no-gazetteer", action="store_true", help="Do not locate places without a box by name")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum hits printed (default: 20)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    start = time.perf_counter()
+    index = SpatialIndex.from_store(args.store, use_gazetteer=not args.no_gazetteer, cell_degrees=args.cell_degrees)
+    built = time.perf_counter() - start
+    statuses = index.datasets["box_status"].value_counts()
+    print(f"🗺️  Indexed {len(index)} of {len(index.datasets)} datasets in {built * 1000:.0f} ms "
+          f"({', '.join(f'{status} {count}' for status, count in statuses.items() if count)})")
+
+    start = time.perf_counter()
+    try:
+        if args.region:
+            hits = index.query_region(args.region, args.mode)
+        elif args.bbox:
+            hits = index.query(args.bbox, args.mode)
+        else:
+            hits = index.query_point(*args.point)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    for hit in hits.head(args.limit).itertuples():
+        print(f"📍 {hit.name} — {hit.place} [{hit.south:g} {hit.west:g} {hit.north:g} {hit.east:g}, "
+              f"{hit.box_status}] covers {hit.coverage:.0%}")
+    print(f"{len(hits)} hits in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
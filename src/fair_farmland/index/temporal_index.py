@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Temporal Coverage Index
+
+Parses the temporal coverage of every dataset of a consolidated store once (see
+`fair_farmland.utils.temporal_coverage`) and keeps the first and last covered days
+sorted. Period queries are then binary searches over the sorted endpoints:
+
+    overlaps   datasets covering any part of the period      start <= last and end >= first
+    contains   datasets covering the whole period             start <= first and end >= last
+    within     datasets covered entirely by the period        start >= first and end <= last
+
+Only the shorter side of the two sorted arrays is scanned, and counts (including whole
+coverage timelines) need no scan at all:
+
+    covering(period) = #(start <= last) - #(end < first)
+
+Usage:
+    python -m fair_farmland.index.temporal_index farmland_store --overlaps 2010-2012
+    python -m fair_farmland.index.temporal_index farmland_store --timeline --granularity month --period 2005/2015
+"""
+
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..core.consolidator import load_table
+from ..utils.temporal_coverage import (
+    TEMPORAL_STATUSES, day_to_date, parse_temporal_coverage, parse_temporal_coverages
+)
+
+logger = logging.getLogger(__name__)
+
+QUERY_MODES = ("overlaps", "contains", "within")
+GRANULARITIES = ("year", "month")
+
+
+def period_bounds(period: str) -> Tuple[float, float]:
+    """
+    Day bounds of a query period in any form the coverage parser accepts
+
+    Args:
+        period: e.g. "2010", "2010-2012", "2010/2012", "2007-04/2010-03"
+
+    Returns:
+        Tuple: (first day, last day)
+    """
+    first, last, status = parse_temporal_coverage(period)
+    if status in ("missing", "invalid"):
+        raise ValueError(f"Cannot parse period: {period!r}")
+    return first, last
+
+
+class TemporalIndex:
+    """Sorted-endpoint index over dataset coverage intervals"""
+
+    def __init__(self, datasets: pd.DataFrame, starts: np.ndarray, ends: np.ndarray):
+        """
+        Index coverage intervals
+
+        Args:
+            datasets: One row per interval (returned with the query results)
+            starts: First covered day per row (-inf for open starts, NaN if unknown)
+            ends: Last covered day per row (inf for open ends, NaN if unknown)
+        """
+        self.datasets = datasets.reset_index(drop=True)
+        self.starts = np.asarray(starts, dtype=float)
+        self.ends = np.asarray(ends, dtype=float)
+        known = np.flatnonzero(~(np.isnan(self.starts) | np.isnan(self.ends)))
+        self.by_start = known[np.argsort(self.starts[known], kind="stable")]
+        self.by_end = known[np.argsort(self.ends[known], kind="stable")]
+        self.sorted_starts = self.starts[self.by_start]
+        self.sorted_ends = self.ends[self.by_end]
+
+    def __len__(self) -> int:
+        return len(self.by_start)
+
+    @classmethod
+    def from_store(cls, store: Union[str, Path]) -> "TemporalIndex":
+        """
+        Index the datasets of a consolidated store
+
+        Args:
+            store: Store directory written by fair_farmland.core.consolidator
+
+        Returns:
+            TemporalIndex: Index whose datasets frame has dataset_key, article_key, name,
+                temporal_coverage, coverage_status and the parsed start and end dates
+        """
+        datasets = load_table(store, "datasets", columns=["dataset_key", "article_key", "name", "temporal_coverage"])
+        starts, ends, status = parse_temporal_coverages(datasets["temporal_coverage"].tolist())
+        datasets["coverage_status"] = pd.Categorical.from_codes(status, categories=TEMPORAL_STATUSES)
+        datasets["start"] = [day_to_date(day) for day in starts]
+        datasets["end"] = [day_to_date(day) for day in ends]
+        return cls(datasets, starts, ends)
+
+    def _select(self, first: float, last: float, mode: str) -> np.ndarray:
+        """Row indexes of the intervals in a relation to [first, last]"""
+        if mode == "overlaps":
+            # start <= last (prefix of by_start) and end >= first (suffix of by_end)
+            prefix = np.searchsorted(self.sorted_starts, last, side="right")
+            suffix = np.searchsorted(self.sorted_ends, first, side="left")
+            if prefix <= len(self.by_end) - suffix:
+                rows = self.by_start[:prefix]
+                return rows[self.ends[rows] >= first]
+            rows = self.by_end[suffix:]
+            return rows[self.starts[rows] <= last]
+        if mode == "contains":
+            prefix = np.searchsorted(self.sorted_starts, first, side="right")
+            suffix = np.searchsorted(self.sorted_ends, last, side="left")
+            if prefix <= len(self.by_end) - suffix:
+                rows = self.by_start[:prefix]
+                return rows[self.ends[rows] >= last]
+            rows = self.by_end[suffix:]
+            return rows[self.starts[rows] <= first]
+        if mode == "within":
+            suffix = np.searchsorted(self.sorted_starts, first, side="left")
+            prefix = np.searchsorted(self.sorted_ends, last, side="right")
+            if len(self.by_start) - suffix <= prefix:
+                rows = self.by_start[suffix:]
+                return rows[self.ends[rows] <= last]
+            rows = self.by_end[:prefix]
+            return rows[self.starts[rows] >= first]
+        raise ValueError(f"Unknown query mode: {mode} (expected one of {', '.join(QUERY_MODES)})")
+
+    def query(self, period: str, mode: str = "overlaps") -> pd.DataFrame:
+        """
+        Datasets whose coverage overlaps, contains or lies within a period
+
+        Args:
+            period: Query period, e.g. "2010-2012" or "2007-04/2010-03"
+            mode: overlaps, contains or within
+
+        Returns:
+            pd.DataFrame: Matching datasets, earliest coverage start first
+        """
+        rows = self._select(*period_bounds(period), mode)
+        rows = rows[np.argsort(self.starts[rows], kind="stable")]
+        return self.datasets.iloc[rows]
+
+    def count(self, period: str) -> int:
+        """Number of datasets covering any part of a period (two binary searches)"""
+        first, last = period_bounds(period)
+        return int(np.searchsorted(self.sorted_starts, last, side="right")
+                   - np.searchsorted(self.sorted_ends, first, side="left"))
+
+    def timeline(self, granularity: str = "year", period: str = None) -> pd.Series:
+        """
+        Number of datasets covering each year or month
+
+        Args:
+            granularity: year or month
+            period: Range of the timeline (default: from the earliest known start to the
+                latest known end; open ends of the period and of the coverage stop there)
+
+        Returns:
+            pd.Series: Datasets per period label ("2010" or "2010-03")
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity} (expected year or month)")
+        first, last = period_bounds(period) if period is not None else (-np.inf, np.inf)
+        if not (np.isfinite(first) and np.isfinite(last)):
+            # Open ends of the period stop at the known coverage
+            finite_starts = self.sorted_starts[np.isfinite(self.sorted_starts)]
+            finite_ends = self.sorted_ends[np.isfinite(self.sorted_ends)]
+            if not len(finite_starts) and not len(finite_ends):
+                return pd.Series(dtype=np.int64)
+            if not np.isfinite(first):
+                first = min(finite_starts[:1].tolist() + finite_ends[:1].tolist())
+            if not np.isfinite(last):
+                last = max(finite_starts[-1:].tolist() + finite_ends[-1:].tolist())
+            if first > last:
+                return pd.Series(dtype=np.int64)
+
+        unit = "datetime64[Y]" if granularity == "year" else "datetime64[M]"
+        epoch = np.datetime64("1970-01-01", "D")
+        first_bin = (epoch + np.timedelta64(int(first), "D")).astype(unit)
+        last_bin = (epoch + np.timedelta64(int(last), "D")).astype(unit)
+        bins = np.arange(first_bin, last_bin + 1)
+        bin_firsts = (bins.astype("datetime64[D]") - epoch).astype(np.int64).astype(float)
+        bin_lasts = ((bins + 1).astype("datetime64[D]") - epoch).astype(np.int64).astype(float) - 1
+        counts = (np.searchsorted(self.sorted_starts, bin_lasts, side="right")
+                  - np.searchsorted(self.sorted_ends, bin_firsts, side="left"))
+        return pd.Series(counts, index=[str(label) for label in bins], name="datasets")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Temporal coverage queries over the datasets of a consolidated store")
+    parser.add_argument("store", type=str, help="Store directory written by fair-farmland-consolidate")
+    target = parser.add_mutually_exclusive_group(required=True)
+    for mode in QUERY_MODES:
+        target.add_argument(f"--{mode}", type=str, metavar="PERIOD",
+                            help=f"Datasets whose coverage {mode} the period (e.g. 2010-2012)")
+    target.add_argument("--timeline", action="store_true", help="Datasets covering each year or month")
+    target.add_argument("--statuses", action="store_true", help="How the coverage strings were parsed")
+    parser.add_argument("--granularity", choices=GRANULARITIES, default="year", help="Timeline bins (default: year)")
+    parser.add_argument("--period", type=str, default=None, help="Timeline range (default: all known coverage)")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum hits printed (default: 20)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    start = time.perf_counter()
+    index = TemporalIndex.from_store(args.store)
+    print(f"📅 Indexed {len(index)} of {len(index.datasets)} datasets in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    try:
+        if args.statuses:
+            for status, count in index.datasets["coverage_status"].value_counts().items():
+                if count:
+                    print(f"   {status}: {count}")
+            return
+        if args.timeline:
+            timeline = index.timeline(args.granularity, args.period)
+            width = max(timeline.max(), 1) if len(timeline) else 1
+            for label, count in timeline.items():
+                print(f"   {label} {'█' * int(round(40 * count / width)):<40} {count}")
+            return
+        mode = next(mode for mode in QUERY_MODES if getattr(args, mode))
+        start = time.perf_counter()
+        hits = index.query(getattr(args, mode), mode)
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        parser.error(str(e))
+
+    for hit in hits.head(args.limit).itertuples():
+        print(f"🗂️  {hit.name} — {hit.start or '..'} to {hit.end or '..'} ({hit.temporal_coverage})")
+    print(f"{len(hits)} hits in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
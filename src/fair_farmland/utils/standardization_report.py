@@ -0,0 +1,365 @@
+"""
+Streaming Standardization Report
+
+Builds the standardization report of a whole output corpus in a single pass without
+loading it: `*_schema.json` documents and JSONL bundles (one JSON-LD document, dataset
+or data source per line) are read lazily, every dataset is standardized (or its
+precomputed `standardized` block is reused) and counted into Counters. Values without
+a mapping entry are counted with a few example datasets each. Memory depends on the
+number of distinct values, not on the number of datasets.
+
+Work is split into tasks (batches of schema files, byte ranges of JSONL bundles) that
+can run in parallel processes; their partial reports are merged.
+
+Usage:
+    python -m fair_farmland.utils.standardization_report output/ bundle.jsonl --workers 8 --output report.json
+"""
+
+import os
+import json
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .data_standardization import NORMALIZED_MAPPINGS, dataset_to_source, match_category
+
+logger = logging.getLogger(__name__)
+
+# Fields of the report, by mapping kind
+REPORT_FIELDS = ("accessibility", "data_format", "country", "spatial_resolution")
+
+# Keys of the distributions in the report (compatible with get_standardization_report)
+DISTRIBUTION_KEYS = {
+    "accessibility": "accessibility_distribution",
+    "data_format": "format_distribution",
+    "country": "country_distribution",
+    "spatial_resolution": "spatial_resolution_distribution"
+}
+
+# Distribution entry collecting unmapped values beyond max_unmapped_values
+UNTRACKED_VALUE = "(other unmapped values)"
+
+# Task sizes for parallel runs
+FILES_PER_TASK = 256
+BYTES_PER_TASK = 32 * 1024 * 1024
+
+# A task is (path, start, end): a whole file for end None, otherwise a byte range of a JSONL bundle
+Task = Tuple[str, int, Optional[int]]
+
+
+class StandardizationReport:
+    """Single-pass, mergeable counts of standardized and unmapped values"""
+
+    def __init__(self, fuzzy: bool = False, min_confidence: float = 0.6, max_examples: int = 3,
+                 max_unmapped_values: int = 10000):
+        """
+        Initialize an empty report
+
+        Args:
+            fuzzy: Resolve values without a mapping entry with the token-based fuzzy matcher
+            min_confidence: Lowest fuzzy confidence accepted as a match
+            max_examples: Example datasets kept per unmapped value
+            max_unmapped_values: Distinct unmapped values tracked per field; further ones
+                are only counted in unmapped_other, which keeps memory bounded
+        """
+        self.fuzzy = fuzzy
+        self.min_confidence = min_confidence
+        self.max_examples = max_examples
+        self.max_unmapped_values = max_unmapped_values
+        self.documents = 0
+        self.sources = 0
+        self.values = {name: Counter() for name in REPORT_FIELDS}
+        self.methods = {name: Counter() for name in REPORT_FIELDS}
+        self.unmapped = {name: Counter() for name in REPORT_FIELDS}
+        self.unmapped_other = Counter()
+        self.examples: Dict[str, Dict[str, List[str]]] = {name: {} for name in REPORT_FIELDS}
+
+    def add(self, source: Dict[str, Any], origin: str = "",
+            precomputed: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Count one data source
+
+        Args:
+            source: Raw accessibility, data_format, country and spatial_resolution values
+            origin: Where the source comes from (kept as example for unmapped values)
+            precomputed: `standardized` block of the dataset, reused instead of a new lookup
+        """
+        self.sources += 1
+        for name in REPORT_FIELDS:
+            if precomputed and name in precomputed:
+                value, method = precomputed[name]["value"], precomputed[name]["method"]
+            elif name in source:
+                raw = source[name]
+                if raw is None or not str(raw).strip():
+                    value, method = NORMALIZED_MAPPINGS[name][1], "missing"
+                else:
+                    value, _, method = match_category(str(raw), name, self.fuzzy, self.min_confidence)
+            else:
+                continue
+
+            self.methods[name][method] += 1
+            if method == "unmapped" and not self._count_unmapped(name, value, origin):
+                value = UNTRACKED_VALUE
+            if value:
+                self.values[name][value] += 1
+
+    def _count_unmapped(self, name: str, value: str, origin: str) -> bool:
+        """Count an unmapped value; False once too many distinct values are tracked"""
+        unmapped = self.unmapped[name]
+        if value not in unmapped and len(unmapped) >= self.max_unmapped_values:
+            self.unmapped_other[name] += 1
+            return False
+        unmapped[value] += 1
+        examples = self.examples[name].setdefault(value, [])
+        if origin and len(examples) < self.max_examples:
+            examples.append(origin)
+        return True
+
+    def add_record(self, record: Dict[str, Any], origin: str = ""):
+        """
+        Count a JSON-LD document, a Dataset or a data source dict (other records are ignored)
+
+        Args:
+            record: Parsed JSON object
+            origin: File (and line) the record was read from
+        """
+        if isinstance(record.get("dataset"), list):
+            self.documents += 1
+            for index, dataset in enumerate(record["dataset"]):
+                self.add_dataset(dataset, f"{origin}#dataset{index}")
+        elif any(key in record for key in ("encoding_format", "conditions_of_access", "spatial_coverage")):
+            self.add_dataset(record, origin)
+        elif any(name in record for name in REPORT_FIELDS):
+            self.add(record, origin)
+        # Anything else (e.g. a streaming progress event) is not a data source
+
+    def add_dataset(self, dataset: Dict[str, Any], origin: str = ""):
+        """Count one Dataset JSON-LD, reusing its `standardized` block if present"""
+        name = dataset.get("name")
+        self.add(dataset_to_source(dataset), f"{origin} ({name})" if name else origin,
+                 precomputed=dataset.get("standardized"))
+
+    def merge(self, other: "StandardizationReport") -> "StandardizationReport":
+        """
+        Add the counts of another report (e.g. of a parallel task)
+
+        Args:
+            other: Report to merge into this one
+
+        Returns:
+            StandardizationReport: This report
+        """
+        self.documents += other.documents
+        self.sources += other.sources
+        self.unmapped_other.update(other.unmapped_other)
+        for name in REPORT_FIELDS:
+            self.values[name].update(other.values[name])
+            self.methods[name].update(other.methods[name])
+            for value, count in other.unmapped[name].items():
+                if value not in self.unmapped[name] and len(self.unmapped[name]) >= self.max_unmapped_values:
+                    self.unmapped_other[name] += count
+                    self.values[name][value] -= count
+                    self.values[name][UNTRACKED_VALUE] += count
+                    if self.values[name][value] <= 0:
+                        del self.values[name][value]
+                    continue
+                self.unmapped[name][value] += count
+                examples = self.examples[name].setdefault(value, [])
+                room = self.max_examples - len(examples)
+                if room > 0:
+                    examples.extend(other.examples[name].get(value, [])[:room])
+        return self
+
+    def to_dict(self, top_unmapped: int = 100) -> Dict[str, Any]:
+        """
+        Render the report
+
+        Args:
+            top_unmapped: Most frequent unmapped values listed per field
+
+        Returns:
+            Dict: Distributions (as in get_standardization_report), methods and unmapped values
+        """
+        report: Dict[str, Any] = {"total_documents": self.documents, "total_sources": self.sources}
+        for name in REPORT_FIELDS:
+            report[DISTRIBUTION_KEYS[name]] = dict(self.values[name].most_common())
+        report["unique_accessibility_values"] = len(self.values["accessibility"])
+        report["unique_format_values"] = len(self.values["data_format"])
+        report["unique_country_values"] = len(self.values["country"])
+        report["unique_spatial_resolution_values"] = len(self.values["spatial_resolution"])
+        report["methods"] = {name: dict(self.methods[name]) for name in REPORT_FIELDS}
+        report["unmapped"] = {
+            name: {
+                value: {"count": count, "examples": self.examples[name].get(value, [])}
+                for value, count in self.unmapped[name].most_common(top_unmapped)
+            }
+            for name in REPORT_FIELDS
+        }
+        report["unmapped_distinct"] = {name: len(self.unmapped[name]) for name in REPORT_FIELDS}
+        report["unmapped_untracked"] = dict(self.unmapped_other)
+        return report
+
+
+def iter_records(task: Task) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """
+    Lazily read the JSON records of one task
+
+    Args:
+        task: (path, start, end); JSONL bundles may be split into byte ranges, a range
+            owns every line that starts inside it
+
+    Yields:
+        Tuple[Dict, str]: Parsed record and its origin (file name, with line number for JSONL)
+    """
+    path, start, end = task
+    name = os.path.basename(path)
+    if not path.endswith(".jsonl"):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield json.load(f), name
+        return
+
+    decode = json.JSONDecoder().decode
+    with open(path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            # A line starting exactly at `start` belongs to this range; otherwise skip the partial line
+            if f.read(1) != b"\n":
+                f.readline()
+        position = f.tell()
+        while end is None or position < end:
+            line = f.readline()
+            if not line:
+                break
+            offset = position
+            position += len(line)
+            if line.strip():
+                try:
+                    yield decode(line.decode('utf-8')), f"{name}@{offset}"
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.warning(f"Skipping invalid JSON at byte {offset} of {name}: {e}")
+
+
+def plan_tasks(inputs: Iterable[Union[str, Path]], files_per_task: int = FILES_PER_TASK,
+               bytes_per_task: int = BYTES_PER_TASK) -> List[List[Task]]:
+    """
+    Split the inputs into independent tasks
+
+    Args:
+        inputs: Directories (their *_schema.json documents and JSONL bundles, except the
+            streaming *_progress.jsonl files), *_schema.json files and JSONL bundles
+        files_per_task: Schema documents per task
+        bytes_per_task: Size of the byte ranges JSONL bundles are split into
+
+    Returns:
+        List[List[Task]]: Tasks, each a list of (path, start, end) parts
+    """
+    tasks: List[List[Task]] = []
+    batch: List[Task] = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            # <stem>_progress.jsonl files hold streaming events, not documents
+            paths = sorted(item.glob("*_schema.json")) + sorted(
+                path for path in item.glob("*.jsonl") if not path.name.endswith("_progress.jsonl")
+            )
+        else:
+            paths = [item]
+        for path in paths:
+            if path.suffix == ".jsonl":
+                size = path.stat().st_size
+                for start in range(0, max(size, 1), bytes_per_task):
+                    tasks.append([(str(path), start, min(start + bytes_per_task, size))])
+                continue
+            batch.append((str(path), 0, None))
+            if len(batch) >= files_per_task:
+                tasks.append(batch)
+                batch = []
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+
+def _run_task(parts: List[Task], options: Dict[str, Any]) -> StandardizationReport:
+    report = StandardizationReport(**options)
+    for part in parts:
+        try:
+            for record, origin in iter_records(part):
+                if isinstance(record, dict):
+                    report.add_record(record, origin)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping {part[0]}: {e}")
+    return report
+
+
+def build_report(inputs: Iterable[Union[str, Path]], workers: int = 1, fuzzy: bool = False,
+                 min_confidence: float = 0.6, max_examples: int = 3) -> StandardizationReport:
+    """
+    Build the standardization report of an output corpus in a single streaming pass
+
+    Args:
+        inputs: Directories with *_schema.json documents, single documents and JSONL bundles
+        workers: Parallel processes (1 = in this process)
+        fuzzy: Resolve values without a mapping entry with the fuzzy matcher
+        min_confidence: Lowest fuzzy confidence accepted as a match
+        max_examples: Example datasets kept per unmapped value
+
+    Returns:
+        StandardizationReport: Merged report (render with to_dict())
+    """
+    options = {"fuzzy": fuzzy, "min_confidence": min_confidence, "max_examples": max_examples}
+    tasks = plan_tasks(inputs)
+    report = StandardizationReport(**options)
+    if workers <= 1 or len(tasks) <= 1:
+        for parts in tasks:
+            report.merge(_run_task(parts, options))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_run_task, tasks, [options] * len(tasks)):
+            report.merge(partial)
+    return report
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Single-pass standardization report over an output corpus")
+    parser.add_argument("inputs", nargs="+", help="Output directories, *_schema.json files or JSONL bundles")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parallel processes (default: number of CPUs)")
+    parser.add_argument("--fuzzy", action="store_true", help="Resolve unmapped values by token similarity")
+    parser.add_argument("--min-confidence", type=float, default=0.6,
+                        help="Lowest fuzzy confidence accepted (default: 0.6)")
+    parser.add_argument("--examples", type=int, default=3, help="Examples per unmapped value (default: 3)")
+    parser.add_argument("--top", type=int, default=100, help="Unmapped values listed per field (default: 100)")
+    parser.add_argument("--output", type=str, default=None, help="Store the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    report = build_report(args.inputs, workers=args.workers, fuzzy=args.fuzzy,
+                          min_confidence=args.min_confidence, max_examples=args.examples).to_dict(args.top)
+
+    print(f"📊 {report['total_sources']} datasets in {report['total_documents']} documents")
+    for name in REPORT_FIELDS:
+        distribution = report[DISTRIBUTION_KEYS[name]]
+        if not distribution:
+            continue
+        top = ", ".join(f"{value} {count}" for value, count in list(distribution.items())[:5])
+        print(f"   {name}: {len(distribution)} values ({top})")
+        unmapped = report["unmapped"][name]
+        if unmapped:
+            value, entry = next(iter(unmapped.items()))
+            print(f"   ⚠️  {report['unmapped_distinct'][name]} unmapped, most frequent: "
+                  f"'{value}' ({entry['count']}x, e.g. {entry['examples'][0] if entry['examples'] else '-'})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📁 Report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Temporal Coverage Parsing
+
+`Dataset.temporal_coverage` should be an ISO 8601 interval ("2005/2019"), but extracted
+values come in many forms: single years and dates, year-month intervals, ranges with
+dashes or words ("2005-2019", "from 2005 to 2019"), open intervals ("2005/..",
+"since 2005", "2005-present"), ISO durations ("2005/P5Y") and decades ("1990s").
+
+This module turns all of them into numeric day bounds (days since 1970-01-01, the
+first and last covered day; -inf/inf for open ends) so that coverage can be compared,
+indexed and counted with NumPy, and back into normalized ISO 8601 interval strings.
+"""
+
+import re
+import math
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Parse status, stored as an index into this tuple by the array functions
+TEMPORAL_STATUSES = ("interval", "single", "decade", "duration", "open_start", "open_end",
+                     "extracted", "missing", "invalid")
+_STATUS_CODES = {status: code for code, status in enumerate(TEMPORAL_STATUSES)}
+
+_DATE = r"(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?"
+_DATE_PATTERN = re.compile(_DATE)
+_OPEN_WORDS = ("", "..", "present", "now", "today", "ongoing", "open", "current")
+_RANGE_PATTERN = re.compile(
+    rf"(?:from|between)?\s*{_DATE}\s*(?:-|–|—|to|until|till|through|and)\s*(?:{_DATE}|(present|now|today|ongoing|current))",
+    re.IGNORECASE
+)
+_OPEN_END_PATTERN = re.compile(rf"(?:(?:since|from|after)\s+{_DATE}(?:\s+onwards?)?|{_DATE}\s*(?:onwards?|-|–|\+))",
+                               re.IGNORECASE)
+_OPEN_START_PATTERN = re.compile(rf"(?:until|till|before|up to|through)\s+{_DATE}", re.IGNORECASE)
+_DECADE_PATTERN = re.compile(r"(\d{3})0'?s")
+_DURATION_PATTERN = re.compile(r"P(?:(\d+)Y)?(?:(\d+)M)?(?:(\d+)D)?", re.IGNORECASE)
+_YEAR_PATTERN = re.compile(r"(?<!\d)((?:1[5-9]|20|21)\d{2})(?!\d)")
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _day(value: np.datetime64) -> float:
+    return float((value.astype("datetime64[D]") - _EPOCH).astype(np.int64))
+
+
+def _bounds(year: str, month: Optional[str] = None, day: Optional[str] = None) -> Tuple[float, float]:
+    """First and last day of a year, month or date (ValueError if it does not exist)"""
+    if day:
+        date = np.datetime64(f"{int(year):04d}-{int(month):02d}-{int(day):02d}", "D")
+        return _day(date), _day(date)
+    if month:
+        if not 1 <= int(month) <= 12:
+            raise ValueError(f"Invalid month: {month}")
+        first = np.datetime64(f"{int(year):04d}-{int(month):02d}", "M")
+        return _day(first), _day(first + 1) - 1
+    first = np.datetime64(f"{int(year):04d}", "Y")
+    return _day(first), _day(first + 1) - 1
+
+
+def _span(left: Tuple[float, float], right: Tuple[float, float]) -> Tuple[float, float]:
+    """Period from the earlier to the later of two periods (accepts reversed intervals)"""
+    return min(left[0], right[0]), max(left[1], right[1])
+
+
+def _add_duration(day: float, match: "re.Match", sign: int) -> float:
+    """Day shifted by an ISO duration (years and months as calendar months)"""
+    years, months, days = (int(value or 0) for value in match.groups())
+    date = _EPOCH + np.timedelta64(int(day), "D")
+    shifted_month = date.astype("datetime64[M]") + sign * (12 * years + months)
+    day_of_month = date - date.astype("datetime64[M]").astype("datetime64[D]")
+    shifted = shifted_month.astype("datetime64[D]") + day_of_month
+    return _day(shifted) + sign * days
+
+
+@lru_cache(maxsize=65536)
+def parse_temporal_coverage(value: Optional[str]) -> Tuple[float, float, str]:
+    """
+    Parse a temporal coverage string into day bounds
+
+    Args:
+        value (str): Temporal coverage as extracted (ISO 8601 interval or free text)
+
+    Returns:
+        tuple: (first day, last day, status); days count from 1970-01-01, open ends are
+            -inf/inf, missing or unparseable values give NaN bounds. The status is one of
+            TEMPORAL_STATUSES; "extracted" means the bounds are the first and last year
+            mentioned in otherwise unparseable text.
+    """
+    text = (value or "").strip().rstrip(".")
+    if not text:
+        return math.nan, math.nan, "missing"
+    try:
+        match = _DATE_PATTERN.fullmatch(text)
+        if match:
+            return (*_bounds(*match.groups()), "single")
+        match = _DECADE_PATTERN.fullmatch(text)
+        if match:
+            return _bounds(f"{match.group(1)}0")[0], _bounds(f"{match.group(1)}9")[1], "decade"
+        if "/" in text:
+            return _parse_iso_interval(*(side.strip() for side in text.split("/", 1)))
+        match = _RANGE_PATTERN.fullmatch(text)
+        if match:
+            if match.group(7):
+                return _bounds(*match.groups()[:3])[0], math.inf, "open_end"
+            return (*_span(_bounds(*match.groups()[:3]), _bounds(*match.groups()[3:6])), "interval")
+        match = _OPEN_END_PATTERN.fullmatch(text)
+        if match:
+            groups = match.groups()
+            return _bounds(*(groups[:3] if groups[0] else groups[3:]))[0], math.inf, "open_end"
+        match = _OPEN_START_PATTERN.fullmatch(text)
+        if match:
+            return -math.inf, _bounds(*match.groups())[1], "open_start"
+    except ValueError:
+        return math.nan, math.nan, "invalid"
+    years = _YEAR_PATTERN.findall(text)
+    if years:
+        return _bounds(min(years))[0], _bounds(max(years))[1], "extracted"
+    return math.nan, math.nan, "invalid"
+
+
+def _parse_iso_interval(left: str, right: str) -> Tuple[float, float, str]:
+    left_date, right_date = _DATE_PATTERN.fullmatch(left), _DATE_PATTERN.fullmatch(right)
+    if left_date and right_date:
+        return (*_span(_bounds(*left_date.groups()), _bounds(*right_date.groups())), "interval")
+    if left_date and right.lower() in _OPEN_WORDS:
+        return _bounds(*left_date.groups())[0], math.inf, "open_end"
+    if right_date and left.lower() in _OPEN_WORDS:
+        return -math.inf, _bounds(*right_date.groups())[1], "open_start"
+    left_duration, right_duration = _DURATION_PATTERN.fullmatch(left), _DURATION_PATTERN.fullmatch(right)
+    if left_date and right_duration and any(right_duration.groups()):
+        first = _bounds(*left_date.groups())[0]
+        return first, _add_duration(first, right_duration, 1) - 1, "duration"
+    if right_date and left_duration and any(left_duration.groups()):
+        last = _bounds(*right_date.groups())[1]
+        return _add_duration(last + 1, left_duration, -1), last, "duration"
+    raise ValueError(f"Unsupported interval: {left}/{right}")
+
+
+def parse_temporal_coverages(values: Iterable[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a column of temporal coverage strings (each distinct string once)
+
+    Args:
+        values (iterable): Temporal coverage strings (None for missing)
+
+    Returns:
+        tuple: (first days, last days, status codes into TEMPORAL_STATUSES) as arrays
+    """
+    codes, distinct = pd.factorize(pd.Series(list(values), dtype=object))
+    parsed = [parse_temporal_coverage(value) for value in distinct] + [(math.nan, math.nan, "missing")]
+    starts = np.array([entry[0] for entry in parsed], dtype=float)[codes]
+    ends = np.array([entry[1] for entry in parsed], dtype=float)[codes]
+    status = np.array([_STATUS_CODES[entry[2]] for entry in parsed], dtype=np.int8)[codes]
+    return starts, ends, status
+
+
+def day_to_date(day: float) -> Optional[str]:
+    """ISO date of a day number (None for open or missing bounds)"""
+    if not math.isfinite(day):
+        return None
+    return str(_EPOCH + np.timedelta64(int(day), "D"))
+
+
+def days_to_years(days: np.ndarray) -> np.ndarray:
+    """
+    Calendar years of day numbers
+
+    Args:
+        days (np.ndarray): Day numbers
+
+    Returns:
+        np.ndarray: Float years (NaN for open or missing bounds)
+    """
+    days = np.asarray(days, dtype=float)
+    finite = np.isfinite(days)
+    years = np.full(days.shape, np.nan)
+    dates = (_EPOCH + days[finite].astype(np.int64).astype("timedelta64[D]")).astype("datetime64[Y]")
+    years[finite] = dates.astype(np.int64) + 1970
+    return years
+
+
+def normalize_temporal_coverage(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a temporal coverage string to an ISO 8601 interval
+
+    "2005" -> "2005/2005", "2010-12" -> "2010-12/2010-12", "2005-2019" -> "2005/2019",
+    "since 2005" -> "2005/..", "1990s" -> "1990/1999", "2005/P5Y" -> "2005/2009".
+
+    Args:
+        value (str): Temporal coverage as extracted
+
+    Returns:
+        str: ISO 8601 interval, or None if the value is missing or not fully understood
+    """
+    first, last, status = parse_temporal_coverage(value)
+    if status in ("missing", "invalid", "extracted"):
+        return None
+
+    def side(day: float, other_end: bool) -> str:
+        if not math.isfinite(day):
+            return ".."
+        # Years and months are written as such when the bound falls on their first/last day
+        date = day_to_date(day)
+        year_first, year_last = _bounds(date[:4])
+        month_first, month_last = _bounds(date[:4], date[5:7])
+        if day == (year_last if other_end else year_first):
+            return date[:4]
+        if day == (month_last if other_end else month_first):
+            return date[:7]
+        return date
+
+    if status == "single":
+        # A single year, month or date keeps its precision on both sides ("2010-12/2010-12")
+        width = max(len(side(first, False)), len(side(last, True)))
+        return f"{day_to_date(first)[:width]}/{day_to_date(last)[:width]}"
+    return f"{side(first, False)}/{side(last, True)}"